@@ -0,0 +1,92 @@
+import asyncio
+import unittest
+from barramento import Barramento
+from jogo import Jogo
+from jogador import Jogador
+
+
+class Coletor:
+    def __init__(self, atraso=0.0):
+        self.atraso = atraso
+        self.mensagens = []
+
+    async def atualizar(self, mensagem):
+        await asyncio.sleep(self.atraso)
+        self.mensagens.append(mensagem)
+
+
+class ColetorDeLotes(Coletor):
+    def __init__(self):
+        super().__init__()
+        self.lotes = []
+
+    def atualizar_lote(self, mensagens):
+        self.lotes.append(mensagens)
+
+
+class TestBarramento(unittest.TestCase):
+    def test_sem_loop_entrega_na_hora(self):
+        jogo = Jogo(Barramento())
+        coletor = Coletor()
+        coletor.atualizar = coletor.mensagens.append
+        jogo.adicionar_observador(coletor)
+        jogo.iniciar_rodada()
+        self.assertEqual(len(coletor.mensagens), 1)
+
+    def test_observador_lento_nao_trava_o_jogo(self):
+        async def cenario():
+            jogo = Jogo(Barramento())
+            rapido, lento = Coletor(), Coletor(atraso=0.05)
+            jogo.adicionar_observador(rapido)
+            jogo.adicionar_observador(lento)
+            jogo.adicionar_jogador(Jogador("Edson", "Vermelho"))
+            jogo.remover_observador(jogo.jogadores[0])
+            for _ in range(3):
+                jogo.iniciar_rodada()
+            await asyncio.sleep(0.01)
+            self.assertEqual(len(rapido.mensagens), 3)
+            self.assertEqual(lento.mensagens, [])
+            await jogo.barramento.parar()
+            self.assertEqual(len(lento.mensagens), 3)
+        asyncio.run(cenario())
+
+    def test_descartar_antigo(self):
+        async def cenario():
+            barramento = Barramento(tamanho_fila=2)
+            coletor = Coletor()
+            barramento.inscrever(coletor)
+            for i in range(5):
+                barramento.publicar(i)
+            await barramento.parar()
+            self.assertEqual(coletor.mensagens, [3, 4])
+            self.assertEqual(barramento.inscricoes[id(coletor)].descartadas, 3)
+        asyncio.run(cenario())
+
+    def test_bloquear_preserva_todas_em_ordem(self):
+        async def cenario():
+            barramento = Barramento(tamanho_fila=2, politica="bloquear")
+            coletor = Coletor()
+            barramento.inscrever(coletor)
+            for i in range(5):
+                barramento.publicar(i)
+            await barramento.publicar_async(5)
+            await barramento.parar()
+            self.assertEqual(coletor.mensagens, list(range(6)))
+        asyncio.run(cenario())
+
+    def test_agrupar_e_coalescer(self):
+        async def cenario():
+            barramento = Barramento()
+            lotes, coalescido = ColetorDeLotes(), Coletor()
+            barramento.inscrever(lotes, agrupar=True)
+            barramento.inscrever(coalescido, coalescer=True)
+            for i in range(4):
+                barramento.publicar(i)
+            await barramento.parar()
+            self.assertEqual(lotes.lotes, [[0, 1, 2, 3]])
+            self.assertEqual(coalescido.mensagens, [3])
+        asyncio.run(cenario())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,190 @@
+# barramento.py
+# Barramento de eventos para os observadores do Jogo. publicar() só coloca a mensagem na fila
+# limitada de cada inscrito e volta; um despachante (tarefa asyncio) entrega depois. Observadores
+# com atualizar assíncrono (corrotina) ganham uma tarefa própria enquanto têm mensagens, então
+# um observador lento não atrasa o jogo nem os outros observadores.
+# Políticas quando a fila enche: "descartar_antigo" (descarta a mensagem mais antiga) ou
+# "bloquear" (publicar_async espera espaço; publicar agenda a entrega e não espera).
+# agrupar: entrega várias mensagens de uma vez (atualizar_lote, se o observador tiver);
+# coalescer: de cada grupo acumulado, entrega só a mensagem mais recente.
+import asyncio
+import inspect
+from collections import deque
+
+POLITICAS = ("descartar_antigo", "bloquear")
+
+
+class Inscricao:
+    def __init__(self, observador, tamanho: int, politica: str, agrupar: bool, coalescer: bool, lote_max: int):
+        if politica not in POLITICAS:
+            raise ValueError(f"Política inválida: {politica}")
+        self.observador = observador
+        self.tamanho = tamanho
+        self.politica = politica
+        self.agrupar = agrupar or coalescer
+        self.coalescer = coalescer
+        self.lote_max = lote_max
+        self.fila = deque()
+        self.tarefa = None     # tarefa própria enquanto um atualizar assíncrono está em andamento
+        self.pronta = False    # já está na fila do despachante
+        self.descartadas = 0
+        self.entregues = 0
+        self._bloqueadas = 0
+        self._espaco = asyncio.Event()
+
+    # Devolve False se a mensagem precisa esperar espaço (política "bloquear"); nesse caso
+    # ela já conta como bloqueada, e as seguintes esperam atrás dela
+    def colocar(self, mensagem) -> bool:
+        if self._bloqueadas or len(self.fila) >= self.tamanho:
+            if self.politica == "bloquear":
+                self._bloqueadas += 1
+                return False
+            self.fila.popleft()
+            self.descartadas += 1
+        self.fila.append(mensagem)
+        return True
+
+    # Espera espaço na fila; as mensagens bloqueadas entram na ordem em que chegaram
+    async def esperar_espaco(self, mensagem):
+        try:
+            while len(self.fila) >= self.tamanho:
+                self._espaco.clear()
+                await self._espaco.wait()
+            self.fila.append(mensagem)
+        finally:
+            self._bloqueadas -= 1
+
+    def retirar(self) -> list:
+        quantidade = min(len(self.fila), self.lote_max) if self.agrupar else 1
+        mensagens = [self.fila.popleft() for _ in range(quantidade)]
+        self._espaco.set()
+        return mensagens[-1:] if self.coalescer else mensagens
+
+    # Chama o observador; devolve o que ainda precisa ser aguardado (atualizar assíncrono)
+    def chamar(self, mensagens: list) -> list:
+        self.entregues += len(mensagens)
+        if self.agrupar and hasattr(self.observador, "atualizar_lote"):
+            resultados = [self.observador.atualizar_lote(mensagens)]
+        else:
+            resultados = [self.observador.atualizar(m) for m in mensagens]
+        return [r for r in resultados if inspect.isawaitable(r)]
+
+
+class Barramento:
+    def __init__(self, tamanho_fila: int = 1000, politica: str = "descartar_antigo", agrupar: bool = False, coalescer: bool = False, lote_max: int = 100):
+        self.padrao = dict(tamanho=tamanho_fila, politica=politica, agrupar=agrupar, coalescer=coalescer, lote_max=lote_max)
+        self.inscricoes = {}
+        self._prontas = deque()
+        self._acordar = asyncio.Event()
+        self._despachante = None
+        self._pendentes = set()
+
+    # As opções padrão do barramento podem ser trocadas por inscrito
+    def inscrever(self, observador, **opcoes):
+        self.inscricoes[id(observador)] = Inscricao(observador, **{**self.padrao, **opcoes})
+
+    def cancelar(self, observador):
+        inscricao = self.inscricoes.pop(id(observador))
+        if inscricao.tarefa is not None:
+            inscricao.tarefa.cancel()
+
+    # Não espera nenhum observador. Sem loop asyncio rodando, entrega na hora (como antes)
+    def publicar(self, mensagem):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            for inscricao in list(self.inscricoes.values()):
+                inscricao.observador.atualizar(mensagem)
+            return
+        self._iniciar()
+        for inscricao in list(self.inscricoes.values()):
+            if inscricao.colocar(mensagem):
+                self._agendar(inscricao)
+            else:
+                espera = loop.create_task(self._colocar_quando_houver_espaco(inscricao, mensagem))
+                self._pendentes.add(espera)
+                espera.add_done_callback(self._pendentes.discard)
+
+    # Com a política "bloquear", espera espaço na fila de cada inscrito antes de retornar
+    async def publicar_async(self, mensagem):
+        self._iniciar()
+        for inscricao in list(self.inscricoes.values()):
+            if inscricao.colocar(mensagem):
+                self._agendar(inscricao)
+            else:
+                await self._colocar_quando_houver_espaco(inscricao, mensagem)
+
+    # Espera todas as mensagens publicadas até aqui serem entregues
+    async def drenar(self):
+        while True:
+            if self._pendentes:
+                await asyncio.gather(*list(self._pendentes))
+                continue
+            tarefas = [i.tarefa for i in self.inscricoes.values() if i.tarefa is not None]
+            if tarefas:
+                await asyncio.gather(*tarefas, return_exceptions=True)
+                continue
+            if self._prontas:
+                await asyncio.sleep(0)
+                continue
+            return
+
+    async def parar(self):
+        await self.drenar()
+        if self._despachante is not None:
+            self._despachante.cancel()
+            self._despachante = None
+
+    def _iniciar(self):
+        if self._despachante is None or self._despachante.done():
+            # O Event se prende ao loop em que foi usado; um loop novo precisa de outro
+            self._acordar = asyncio.Event()
+            self._despachante = asyncio.get_running_loop().create_task(self._despachar())
+
+    async def _colocar_quando_houver_espaco(self, inscricao: Inscricao, mensagem):
+        await inscricao.esperar_espaco(mensagem)
+        self._agendar(inscricao)
+
+    def _agendar(self, inscricao: Inscricao):
+        if inscricao.tarefa is None and not inscricao.pronta:
+            inscricao.pronta = True
+            self._prontas.append(inscricao)
+            self._acordar.set()
+
+    # Entrega direto aos observadores síncronos; os assíncronos seguem na própria tarefa
+    async def _despachar(self):
+        while True:
+            if not self._prontas:
+                self._acordar.clear()
+                await self._acordar.wait()
+            inscricao = self._prontas.popleft()
+            inscricao.pronta = False
+            if self.inscricoes.get(id(inscricao.observador)) is not inscricao:
+                continue
+            while inscricao.fila:
+                try:
+                    esperas = inscricao.chamar(inscricao.retirar())
+                except Exception as erro:
+                    print(f"Erro ao notificar {inscricao.observador}: {erro}")
+                    continue
+                if esperas:
+                    inscricao.tarefa = asyncio.get_running_loop().create_task(self._continuar(inscricao, esperas))
+                    break
+
+    async def _continuar(self, inscricao: Inscricao, esperas: list):
+        try:
+            while True:
+                for espera in esperas:
+                    try:
+                        await espera
+                    except Exception as erro:
+                        print(f"Erro ao notificar {inscricao.observador}: {erro}")
+                if not inscricao.fila:
+                    return
+                try:
+                    esperas = inscricao.chamar(inscricao.retirar())
+                except Exception as erro:
+                    print(f"Erro ao notificar {inscricao.observador}: {erro}")
+                    esperas = []
+        finally:
+            inscricao.tarefa = None
@@ -0,0 +1,77 @@
+# Latência de um passo do jogo (iniciar_rodada) com 1, 100 e 10 mil observadores, um deles
+# lento (10 ms por mensagem): notificação síncrona antiga x Barramento (filas por observador).
+# No modo síncrono o observador lento dorme com time.sleep; no barramento, com asyncio.sleep.
+# Uso (nesta pasta): python bench_barramento.py
+import asyncio
+import time
+from barramento import Barramento
+from jogo import Jogo
+
+ATRASO = 0.01
+
+
+class Contador:
+    def __init__(self):
+        self.recebidas = 0
+
+    def atualizar(self, mensagem):
+        self.recebidas += 1
+
+
+class LentoSincrono:
+    def atualizar(self, mensagem):
+        time.sleep(ATRASO)
+
+
+class LentoAssincrono:
+    async def atualizar(self, mensagem):
+        await asyncio.sleep(ATRASO)
+
+
+def mediana(valores: list) -> float:
+    return sorted(valores)[len(valores) // 2]
+
+
+def sincrono(observadores: int, passos: int) -> dict:
+    jogo = Jogo()
+    for _ in range(observadores - 1):
+        jogo.adicionar_observador(Contador())
+    jogo.adicionar_observador(LentoSincrono())
+    latencias = []
+    inicio = time.perf_counter()
+    for _ in range(passos):
+        passo = time.perf_counter()
+        jogo.iniciar_rodada()
+        latencias.append(time.perf_counter() - passo)
+    return {"passo_ms": mediana(latencias) * 1e3, "entrega_ms": (time.perf_counter() - inicio) * 1e3}
+
+
+async def com_barramento(observadores: int, passos: int, **opcoes) -> dict:
+    jogo = Jogo(Barramento(**opcoes))
+    for _ in range(observadores - 1):
+        jogo.adicionar_observador(Contador())
+    jogo.adicionar_observador(LentoAssincrono())
+    latencias = []
+    inicio = time.perf_counter()
+    for _ in range(passos):
+        passo = time.perf_counter()
+        jogo.iniciar_rodada()
+        latencias.append(time.perf_counter() - passo)
+        await asyncio.sleep(0)  # o jogo cede o loop entre passos, como numa rota async
+    await jogo.barramento.parar()
+    return {"passo_ms": mediana(latencias) * 1e3, "entrega_ms": (time.perf_counter() - inicio) * 1e3}
+
+
+def executar(tamanhos=(1, 100, 10_000), passos: int = 20) -> dict:
+    resultados = {}
+    for observadores in tamanhos:
+        resultados[f"sincrono/{observadores}"] = sincrono(observadores, passos)
+        resultados[f"barramento/{observadores}"] = asyncio.run(com_barramento(observadores, passos))
+        resultados[f"agrupado/{observadores}"] = asyncio.run(com_barramento(observadores, passos, agrupar=True))
+    return resultados
+
+
+if __name__ == "__main__":
+    print(f"{'modo/observadores':>20} {'passo p50 (ms)':>15} {'entrega total (ms)':>19}")
+    for chave, r in executar().items():
+        print(f"{chave:>20} {r['passo_ms']:>15.3f} {r['entrega_ms']:>19.1f}")
@@ -21,7 +21,11 @@ class Jogador:
         if origem in self.territorios and destino in self.territorios and self.exercitos >= quantidade:
             self.exercitos -= quantidade
 
-    def verificar_objetivo(self):
+    # acompanhamento: objetivos.Acompanhamento do jogo, com os contadores já atualizados;
+    # sem ele, a verificação antiga pelos nomes dos territórios
+    def verificar_objetivo(self, acompanhamento=None):
+        if acompanhamento is not None:
+            return acompanhamento.cumpriu(self.nome)
         if self.objetivo:
             continentes_conquistados = set()
             for territorio in self.territorios:
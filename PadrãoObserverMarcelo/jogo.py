@@ -1,9 +1,13 @@
 # jogo.py
 import random
 from jogador import Jogador
+from objetivos import Acompanhamento
 
 class Jogo:
-    def __init__(self):
+    # barramento: Barramento opcional; com ele, as notificações são entregues de forma
+    # assíncrona por fila de cada observador e um observador lento não trava o jogo
+    def __init__(self, barramento=None):
+        self.barramento = barramento
         self.jogadores = []
         self.territorios = ["Território 1", "Território 2", "Território 3", "Território 4", "Território 5", "Território 6"]
         self.objetivos = [
@@ -19,19 +23,29 @@ class Jogo:
         self.cartas = ["Infantaria", "Cavalaria", "Artilharia"]
         self.ordem_jogadores = []
         self.observadores = []  # Lista de jogadores observadores
+        # Contadores dos objetivos, atualizados a cada troca de dono de território
+        self.acompanhamento = Acompanhamento(total=len(self.territorios))
+        self.dono = {}
 
     def adicionar_jogador(self, jogador):
         self.jogadores.append(jogador)
         self.adicionar_observador(jogador)
 
     # Funções do padrão Observer
-    def adicionar_observador(self, jogador):
+    def adicionar_observador(self, jogador, **opcoes):
         self.observadores.append(jogador)
+        if self.barramento is not None:
+            self.barramento.inscrever(jogador, **opcoes)
 
     def remover_observador(self, jogador):
         self.observadores.remove(jogador)
+        if self.barramento is not None:
+            self.barramento.cancelar(jogador)
 
     def notificar_observadores(self, mensagem):
+        if self.barramento is not None:
+            self.barramento.publicar(mensagem)
+            return
         for observador in self.observadores:
             observador.atualizar(mensagem)
 
@@ -44,11 +58,15 @@ class Jogo:
         random.shuffle(self.territorios)
         for i, jogador in enumerate(self.jogadores):
             jogador.receber_territorios(self.territorios[i::len(self.jogadores)])
+            for territorio in jogador.territorios:
+                self.acompanhamento.atribuir(territorio, jogador.nome, self.dono.get(territorio))
+                self.dono[territorio] = jogador.nome
         self.notificar_observadores("Os territórios foram distribuídos.")
 
     def distribuir_objetivos(self):
         for jogador in self.jogadores:
             jogador.receber_objetivo(random.choice(self.objetivos))
+            self.acompanhamento.definir_objetivo(jogador.nome, jogador.objetivo)
         self.notificar_observadores("Os objetivos foram distribuídos.")
 
     def iniciar_rodada(self):
@@ -63,5 +81,5 @@ class Jogo:
 
     def verificar_objetivos_concluidos(self):
         for jogador in self.jogadores:
-            if jogador.verificar_objetivo():
+            if jogador.verificar_objetivo(self.acompanhamento):
                 self.notificar_observadores(f"{jogador.nome} conquistou seu objetivo!")
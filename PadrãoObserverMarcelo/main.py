@@ -1,11 +1,13 @@
-from fastapi import FastAPI, HTTPException # type: ignore
+from fastapi import FastAPI, HTTPException, Request, Response # type: ignore
 from pydantic import BaseModel # type: ignore
-from typing import List
+from typing import Dict, List
+import mmap
 import random
-import json
 import os
+import uuid
+from serializacao import RespostaJSON, dumps, loads
 
-app = FastAPI()
+app = FastAPI(default_response_class=RespostaJSON)
 
 # Modelos de dados
 class Jogador(BaseModel):
@@ -22,31 +24,42 @@ ARQUIVO_JSON = 'dadosOb.json'
 # Simulando alguns dados se necessário
 cores_disponiveis = ["Vermelho", "Azul", "Verde", "Amarelo"]
 
-jogadores = []
+# Índice nome -> jogador; a ordem de inserção do dict é a ordem dos turnos
+jogadores: Dict[str, Jogador] = {}
 
-# Carregar dados do arquivo JSON
+# JSON dos jogadores já codificado, refeito a cada salvar_dados (toda rota que altera o
+# jogo salva); a versão sobe junto e vira o ETag de /gerar-json/
+VERSAO_ETAG = uuid.uuid4().hex[:8]
+versao = 0
+jogadores_json = None
+
+# Carregar dados do arquivo JSON (mapeado em memória, sem cópia para uma string);
+# sem o arquivo, ou com ele vazio, o jogo começa sem jogadores
 def carregar_dados():
-    global jogadores
-    if os.path.exists(ARQUIVO_JSON):
-        with open(ARQUIVO_JSON, 'r', encoding='utf-8') as f:
-            dados = json.load(f)
-            jogadores = [Jogador(**j) for j in dados['jogadores']]
-    else:
-        raise HTTPException(status_code=404, detail="Arquivo de dados não encontrado")
+    global jogadores, versao, jogadores_json
+    jogadores = {}
+    if os.path.exists(ARQUIVO_JSON) and os.path.getsize(ARQUIVO_JSON) > 0:
+        with open(ARQUIVO_JSON, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+            dados = loads(memoryview(mapa))
+        jogadores = {j['nome']: Jogador(**j) for j in dados['jogadores']}
+    versao, jogadores_json = versao + 1, None
 
 # Salvar dados no arquivo JSON
 def salvar_dados():
+    global versao, jogadores_json
     dados = {
-        "jogadores": [j.dict() for j in jogadores]
+        "jogadores": [j.dict() for j in jogadores.values()]
     }
-    with open(ARQUIVO_JSON, 'w', encoding='utf-8') as f:
-        json.dump(dados, f, indent=4, ensure_ascii=False)
+    corpo = dumps(dados)
+    with open(ARQUIVO_JSON, 'wb') as f:
+        f.write(corpo)
+    versao, jogadores_json = versao + 1, corpo
 
 # Encontrar jogador
 def encontrar_jogador(nome: str) -> Jogador:
-    for j in jogadores:
-        if j.nome == nome:
-            return j
+    jogador = jogadores.get(nome)
+    if jogador is not None:
+        return jogador
     raise HTTPException(status_code=404, detail="Jogador não encontrado")
 
 # Função auxiliar para rolar dados
@@ -60,10 +73,10 @@ async def startup_event():
 # Preparação
 @app.post("/jogadores/adicionar/")
 def adicionar_jogador(nome: str):
-    if any(j.nome == nome for j in jogadores):
+    if nome in jogadores:
         raise HTTPException(status_code=400, detail="Jogador já existe")
     jogador = Jogador(nome=nome)
-    jogadores.append(jogador)
+    jogadores[nome] = jogador
     salvar_dados()
     return {"message": f"Jogador {jogador.nome} adicionado com sucesso"}
 
@@ -96,8 +109,10 @@ def receber_objetivo(jogador: str):
 
 @app.post("/preparacao/definir-ordem/")
 def definir_ordem():
-    random.shuffle(jogadores)
-    ordem = [j.nome for j in jogadores]
+    global jogadores
+    ordem = list(jogadores)
+    random.shuffle(ordem)
+    jogadores = {nome: jogadores[nome] for nome in ordem}
     salvar_dados()
     return {"ordem": ordem}
 
@@ -108,10 +123,10 @@ def distribuir_territorios():
         "Território 4", "Território 5"
     ]
     random.shuffle(territorios_iniciais)
-    for i, jogador in enumerate(jogadores):
+    for i, jogador in enumerate(jogadores.values()):
         jogador.territorios.append(territorios_iniciais[i % len(jogadores)])
     salvar_dados()
-    return {j.nome: j.territorios for j in jogadores}
+    return {j.nome: j.territorios for j in jogadores.values()}
 
 @app.post("/preparacao/distribuir-exercitos/")
 def distribuir_exercitos(jogador: str, exercitos: int):
@@ -123,18 +138,18 @@ def distribuir_exercitos(jogador: str, exercitos: int):
 @app.post("/preparacao/distribuir-cartas/")
 def distribuir_cartas():
     cartas = ["Infantaria", "Cavalaria", "Artilharia"]
-    for jogador in jogadores:
+    for jogador in jogadores.values():
         jogador.cartas = random.sample(cartas, k=3)  # Distribui 3 cartas para cada jogador
     salvar_dados()
-    return {j.nome: j.cartas for j in jogadores}
+    return {j.nome: j.cartas for j in jogadores.values()}
 
 # Rodada
 @app.post("/rodada/iniciar/")
 def iniciar_rodada():
-    for j in jogadores:
+    for j in jogadores.values():
         j.exercitos += 5  # 5 exércitos por rodada
     salvar_dados()
-    return {j.nome: j.exercitos for j in jogadores}
+    return {j.nome: j.exercitos for j in jogadores.values()}
 
 @app.post("/rodada/ataque/")
 def iniciar_ataque(jogador_atacante: str, territorio_atacante: str, jogador_defensor: str, territorio_defensor: str):
@@ -158,8 +173,18 @@ def iniciar_ataque(jogador_atacante: str, territorio_atacante: str, jogador_defe
         salvar_dados()
         return {"message": f"{jogador_defensor} defendeu com sucesso o território {territorio_defensor}"}
 
-# Gerar JSON
+# Gerar JSON: os jogadores em memória, do cache enquanto nada mudar; If-None-Match com o
+# ETag atual responde 304
 @app.get("/gerar-json/")
-def gerar_json():
-    carregar_dados()
-    return json.dumps({"jogadores": [j.dict() for j in jogadores]}, indent=4, ensure_ascii=False)
+def gerar_json(request: Request, indentar: bool = False):
+    global jogadores_json
+    etag = f'"{VERSAO_ETAG}-{versao}{"-i" if indentar else ""}"'
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers={"ETag": etag})
+    if indentar:
+        corpo = dumps({"jogadores": [j.dict() for j in jogadores.values()]}, indentar=True)
+    else:
+        if jogadores_json is None:
+            jogadores_json = dumps({"jogadores": [j.dict() for j in jogadores.values()]})
+        corpo = jogadores_json
+    return Response(content=corpo, media_type="application/json", headers={"ETag": etag})
@@ -0,0 +1,395 @@
+# acoes.py
+# Ações do jogo sobre uma Partida, sem HTTP: usadas pelas rotas e pelo lote de ações.
+# Cada ação altera o estado em memória e registra só o que mudou em partida.registrar*.
+# As ações seguram as travas da partida que precisam (travas.py): as de um ou dois
+# jogadores só a trava deles; as que mexem na partida inteira, a exclusiva.
+import functools
+import inspect
+import itertools
+import random
+import typing
+from typing import List
+from cartas import INDICE, bonus, contar, troca_valida
+from modelos import Jogador
+from partida import OBJETIVOS, Partida
+
+
+class ErroDeJogo(Exception):
+    status = 400
+
+
+# Jogada recusada pelas regras (as rotas respondem {"error": ...})
+class AcaoInvalida(ErroDeJogo):
+    pass
+
+
+class JogadorNaoEncontrado(ErroDeJogo):
+    status = 404
+
+    def __init__(self):
+        super().__init__("Jogador não encontrado")
+
+
+class JogadorJaExiste(ErroDeJogo):
+    def __init__(self):
+        super().__init__("Jogador já existe")
+
+
+# Envolve a ação: segura as travas, e com a partida gravando o diário (diario.py) registra
+# a chamada enquanto as travas ainda estão seguras. Só entram ações concluídas; com
+# registrar_falha também as que falharam (o lote desfeito já consumiu sorteios)
+def _acao(funcao, travas, leitura: bool = False, registrar_falha: bool = False):
+    assinatura = inspect.signature(funcao)
+
+    @functools.wraps(funcao)
+    def executada(partida: Partida, *args, **kwargs):
+        if args:
+            kwargs = assinatura.bind(partida, *args, **kwargs).arguments
+            del kwargs["partida"]
+        with travas(partida, kwargs):
+            diario = None if leitura else partida.diario
+            if diario is None or not diario.entrar():
+                return funcao(partida, **kwargs)
+            try:
+                resultado = funcao(partida, **kwargs)
+            except ErroDeJogo as erro:
+                if registrar_falha:
+                    diario.registrar(funcao.__name__, kwargs, erro=str(erro))
+                raise
+            finally:
+                diario.sair()
+            diario.registrar(funcao.__name__, kwargs)
+            return resultado
+    return executada
+
+
+# A ação segura as travas dos jogadores passados nos parâmetros indicados
+def com_jogadores(*parametros: str, leitura: bool = False):
+    def decorar(funcao):
+        return _acao(funcao, lambda partida, kwargs: partida.travas.jogadores(*(kwargs[p] for p in parametros)), leitura)
+    return decorar
+
+
+def exclusiva(funcao=None, registrar_falha: bool = False):
+    if funcao is None:
+        return functools.partial(exclusiva, registrar_falha=registrar_falha)
+    return _acao(funcao, lambda partida, kwargs: partida.travas.exclusiva(), registrar_falha=registrar_falha)
+
+
+# Encontrar jogador
+def encontrar_jogador(partida: Partida, nome: str) -> Jogador:
+    jogador = partida.jogadores.obter(nome)
+    if jogador is None:
+        raise JogadorNaoEncontrado()
+    return jogador
+
+
+# Salvar dados: registra no log só os campos alterados do jogador
+def salvar_dados(partida: Partida, jogador: Jogador, *campos: str):
+    partida.registrar("set", nome=jogador.nome, campos={c: getattr(jogador, c) for c in campos})
+
+
+# Função auxiliar para rolar dados (rng: o fluxo de sorteios de quem rola)
+FACES = range(1, 7)
+# Lançamentos de 1 a 3 dados já em ordem decrescente: um único random() escolhe um dos 6**n
+# lançamentos (todos com a mesma chance), no lugar de um sorteio e uma ordenação por ataque
+LANCES = [[sorted(lance, reverse=True) for lance in itertools.product(FACES, repeat=n)] for n in range(4)]
+
+
+def rolar_dados(quantidade: int, rng=random) -> List[int]:
+    if quantidade <= 0:
+        return []
+    if quantidade >= len(LANCES):
+        return sorted(rng.choices(FACES, k=quantidade), reverse=True)
+    lances = LANCES[quantidade]
+    return list(lances[int(rng.random() * len(lances))])
+
+
+# Preparação
+@exclusiva
+def adicionar_jogador(partida: Partida, nome: str) -> dict:
+    if nome in partida.jogadores:
+        raise JogadorJaExiste()
+    jogador = Jogador(nome=nome)
+    partida.adicionar_jogador(jogador)
+    partida.registrar("novo", jogador=jogador.dict())
+    partida.notificar("jogador_adicionado", jogador=nome)
+    return {"message": f"Jogador {jogador.nome} adicionado com sucesso"}
+
+
+@exclusiva
+def remover_jogador(partida: Partida, nome: str) -> dict:
+    encontrar_jogador(partida, nome)
+    partida.remover_jogador(nome)
+    partida.registrar("rem", nome=nome)
+    partida.notificar("jogador_removido", jogador=nome)
+    return {"message": f"Jogador {nome} removido com sucesso"}
+
+
+# Exclusiva: trocar de cor libera a anterior, que outro jogador pode pegar; o diário
+# precisa de uma ordem única para essas escolhas
+@exclusiva
+def escolher_cor(partida: Partida, jogador: str, cor: str) -> dict:
+    jogador_obj = encontrar_jogador(partida, jogador)
+    if not partida.reservar_cor(cor):
+        raise AcaoInvalida("Cor não disponível")
+    anterior, jogador_obj.cor_exercito = jogador_obj.cor_exercito, cor
+    if anterior:
+        partida.liberar_cor(anterior)
+    salvar_dados(partida, jogador_obj, "cor_exercito")
+    partida.notificar("cor_escolhida", jogador=jogador, cor=cor)
+    return {"message": f"O jogador {jogador} escolheu a cor {cor}."}
+
+
+@com_jogadores("jogador")
+def receber_objetivo(partida: Partida, jogador: str) -> dict:
+    jogador_obj = encontrar_jogador(partida, jogador)
+    objetivo = partida.fluxos.de(jogador).choice(OBJETIVOS)
+    jogador_obj.objetivo = objetivo
+    partida.objetivos.definir_objetivo(jogador, objetivo)
+    salvar_dados(partida, jogador_obj, "objetivo")
+    partida.notificar("objetivo_recebido", jogador=jogador)  # o objetivo é secreto
+    return {"message": f"Objetivo do jogador {jogador}: {objetivo}"}
+
+
+@exclusiva
+def definir_ordem(partida: Partida) -> dict:
+    ordem = partida.jogadores.embaralhar(partida.fluxos.de())
+    partida.registrar("ordem", nomes=ordem)
+    partida.notificar("ordem_definida", ordem=ordem)
+    return {"ordem": ordem}
+
+
+@exclusiva
+def distribuir_territorios(partida: Partida) -> dict:
+    jogadores = partida.jogadores
+    partida.fluxos.de().shuffle(partida.territorios_iniciais)
+    registros = []
+    # Todos os territórios do mapa, um a um, na ordem dos jogadores
+    ordem = list(jogadores)
+    for i, territorio in enumerate(partida.territorios_iniciais if ordem else ()):
+        jogador = ordem[i % len(ordem)]
+        anterior = partida.atribuir(territorio, jogador.nome)
+        if anterior == jogador.nome:
+            continue
+        if anterior is not None:
+            registros.append({"op": "del", "nome": anterior, "campo": "territorios", "valor": territorio})
+        registros.append({"op": "add", "nome": jogador.nome, "campo": "territorios", "valor": territorio})
+    partida.registrar_lote(registros)
+    distribuicao = {j.nome: sorted(j.territorios) for j in jogadores}
+    partida.notificar("territorios_distribuidos", territorios=distribuicao)
+    return distribuicao
+
+
+@com_jogadores("jogador")
+def distribuir_exercitos(partida: Partida, jogador: str, exercitos: int) -> dict:
+    jogador_obj = encontrar_jogador(partida, jogador)
+    jogador_obj.exercitos += exercitos
+    salvar_dados(partida, jogador_obj, "exercitos")
+    partida.notificar("exercitos_distribuidos", jogador=jogador, exercitos=exercitos, total=jogador_obj.exercitos)
+    return {"message": f"{exercitos} exércitos distribuídos para o jogador {jogador}"}
+
+
+# Rodada
+@exclusiva
+def iniciar_rodada(partida: Partida) -> dict:
+    for j in partida.jogadores:
+        j.exercitos += 5  #  5 exércitos por rodada
+    partida.registrar_lote([{"op": "set", "nome": j.nome, "campos": {"exercitos": j.exercitos}} for j in partida.jogadores])
+    exercitos = {j.nome: j.exercitos for j in partida.jogadores}
+    partida.notificar("rodada_iniciada", exercitos=exercitos)
+    return exercitos
+
+
+@com_jogadores("jogador_atacante", "jogador_defensor")
+def atacar(partida: Partida, jogador_atacante: str, territorio_atacante: str, jogador_defensor: str, territorio_defensor: str) -> dict:
+    atacante = encontrar_jogador(partida, jogador_atacante)
+    defensor = encontrar_jogador(partida, jogador_defensor)
+    tabuleiro = partida.tabuleiro
+
+    if not tabuleiro.pertence(territorio_atacante, atacante.nome) or not tabuleiro.pertence(territorio_defensor, defensor.nome):
+        raise AcaoInvalida("Territórios inválidos para ataque")
+    if not tabuleiro.fazem_fronteira(territorio_atacante, territorio_defensor):
+        raise AcaoInvalida("Os territórios não fazem fronteira")
+
+    # Rolar dados para atacante e defensor (os dois dados saem do fluxo do atacante)
+    rng = partida.fluxos.de(atacante.nome)
+    dados_atacante = rolar_dados(min(3, atacante.exercitos - 1), rng)  # Ataque com até 3 exércitos
+    dados_defensor = rolar_dados(min(2, defensor.exercitos), rng)      # Defesa com até 2 exércitos
+
+    perdas_atacante = 0
+    perdas_defensor = 0
+
+    # Verifica os dados para determinar perdas
+    for dado_atacante, dado_defensor in zip(dados_atacante, dados_defensor):
+        if dado_atacante > dado_defensor:
+            perdas_defensor += 1
+        else:
+            perdas_atacante += 1
+
+    atacante.exercitos -= perdas_atacante
+    defensor.exercitos -= perdas_defensor
+    registros = [
+        {"op": "set", "nome": atacante.nome, "campos": {"exercitos": atacante.exercitos}},
+        {"op": "set", "nome": defensor.nome, "campos": {"exercitos": defensor.exercitos}},
+    ]
+
+    # Se o defensor perde todos os exércitos, atacante conquista o território
+    if defensor.exercitos <= 0:
+        partida.atribuir(territorio_defensor, atacante.nome, conquista=True)
+        registros.append({"op": "del", "nome": defensor.nome, "campo": "territorios", "valor": territorio_defensor})
+        registros.append({"op": "add", "nome": atacante.nome, "campo": "territorios", "valor": territorio_defensor})
+        # O último território do defensor: a eliminação vale para o objetivo e é gravada
+        if atacante.nome in partida.objetivos.eliminou and not atacante.eliminou:
+            atacante.eliminou = True
+            registros.append({"op": "set", "nome": atacante.nome, "campos": {"eliminou": True}})
+
+    partida.registrar_lote(registros)
+    resultado = {
+        "resultados_dados": {
+            "atacante": dados_atacante,
+            "defensor": dados_defensor
+        },
+        "resultado_batalha": {
+            "atacante": {"nome": atacante.nome, "perdas": perdas_atacante, "exercitos_restantes": atacante.exercitos},
+            "defensor": {"nome": defensor.nome, "perdas": perdas_defensor, "exercitos_restantes": defensor.exercitos},
+        },
+        "conquista": f"{atacante.nome} conquistou {territorio_defensor}" if defensor.exercitos <= 0 else "Território não conquistado"
+    }
+    partida.notificar("ataque", territorio_atacante=territorio_atacante, territorio_defensor=territorio_defensor, **resultado)
+    if defensor.exercitos <= 0:
+        partida.notificar("conquista", jogador=atacante.nome, territorio=territorio_defensor, anterior=defensor.nome)
+        # Só quem conquistou pode ter completado o objetivo: verificação O(1) pelos contadores
+        if partida.objetivos.cumpriu(atacante.nome):
+            resultado["objetivo_concluido"] = True
+            partida.notificar("objetivo_concluido", jogador=atacante.nome, objetivo=atacante.objetivo)
+    return resultado
+
+
+# Exclusiva: o baralho e o descarte são da partida inteira (cartas.py); o diário precisa
+# de uma ordem única para as compras e trocas
+@exclusiva
+def receber_cartas(partida: Partida, jogador: str) -> dict:
+    jogador_obj = encontrar_jogador(partida, jogador)
+    carta = partida.baralho.comprar(jogador, partida.fluxos.de())
+    if carta is None:
+        raise AcaoInvalida("Não há cartas no baralho")
+    jogador_obj.cartas.append(carta)
+    partida.registrar("add", nome=jogador_obj.nome, campo="cartas", valor=carta)
+    partida.notificar("carta_recebida", jogador=jogador, cartas=len(jogador_obj.cartas))  # a carta é secreta
+    return {"message": f"O jogador {jogador} recebeu a carta {carta}", "troca_disponivel": partida.baralho.maos[jogador].tem_troca()}
+
+
+@com_jogadores("jogador")
+def mover_exercitos(partida: Partida, jogador: str, origem: str, destino: str, quantidade: int) -> dict:
+    jogador_obj = encontrar_jogador(partida, jogador)
+    if not partida.tabuleiro.pertence(origem, jogador_obj.nome) or not partida.tabuleiro.pertence(destino, jogador_obj.nome):
+        raise AcaoInvalida("Movimento inválido entre territórios não controlados")
+    # Caminho só pelos territórios do jogador: teste de bit nos componentes mantidos pelo tabuleiro
+    if not partida.tabuleiro.alcanca(jogador_obj.nome, origem, destino):
+        raise AcaoInvalida("Destino não alcançável pelos territórios do jogador")
+
+    # Lógica simples para mover exércitos entre territórios do mesmo jogador (sem alteração de estado)
+    return {"message": f"{jogador} moveu {quantidade} exércitos de {origem} para {destino}"}
+
+
+@com_jogadores("jogador", leitura=True)
+def verificar_objetivo(partida: Partida, jogador: str) -> dict:
+    encontrar_jogador(partida, jogador)
+    if partida.objetivos.cumpriu(jogador):
+        return {"message": f"O jogador {jogador} completou o objetivo!", "concluido": True}
+    return {"message": f"O jogador {jogador} não completou o objetivo ainda", "concluido": False}
+
+
+# Três cartas (três do mesmo tipo ou uma de cada; o coringa vale qualquer uma) por exércitos,
+# pela tabela de bônus das trocas da partida. Sem cartas, faz a melhor troca da mão (bots).
+# Cartas entregues, exércitos e contagem de trocas vão num só lote de registros
+@exclusiva
+def trocar_cartas(partida: Partida, jogador: str, cartas: List[str]) -> dict:
+    jogador_obj = encontrar_jogador(partida, jogador)
+    mao = partida.baralho.maos[jogador]
+    if cartas:
+        trio = contar(cartas)
+        if trio is None or not troca_valida(trio):
+            raise AcaoInvalida("Troca inválida: três cartas do mesmo tipo ou uma de cada")
+        if not mao.possui(trio):
+            raise AcaoInvalida("O jogador não tem essas cartas")
+    else:
+        trio = mao.melhor_troca()
+        if trio is None:
+            raise AcaoInvalida("O jogador não tem cartas para troca")
+
+    # Saem as primeiras cartas de cada tipo, as mesmas que os registros "del" removem
+    faltam = list(trio)
+    entregues, restantes = [], []
+    for carta in jogador_obj.cartas:
+        indice = INDICE[carta]
+        if faltam[indice]:
+            faltam[indice] -= 1
+            entregues.append(carta)
+        else:
+            restantes.append(carta)
+    jogador_obj.cartas = restantes
+    for carta in entregues:
+        mao.remover(carta)
+    partida.baralho.descartar(entregues)
+
+    exercitos = bonus(partida.baralho.trocas)
+    partida.baralho.trocas += 1
+    jogador_obj.exercitos += exercitos
+    jogador_obj.trocas += 1
+    registros = [{"op": "del", "nome": jogador, "campo": "cartas", "valor": carta} for carta in entregues]
+    registros.append({"op": "set", "nome": jogador, "campos": {"exercitos": jogador_obj.exercitos, "trocas": jogador_obj.trocas}})
+    registros.append({"op": "partida", "campos": {"trocas": partida.baralho.trocas}})
+    partida.registrar_lote(registros)
+    partida.notificar("cartas_trocadas", jogador=jogador, cartas=entregues, exercitos=exercitos, total=jogador_obj.exercitos)
+    return {"message": f"{jogador} trocou as cartas {entregues} por {exercitos} exércitos", "cartas": entregues, "exercitos": exercitos}
+
+
+# Ações aceitas em POST /rodada/lote/
+ACOES_DO_TURNO = {
+    "distribuir-exercitos": distribuir_exercitos,
+    "ataque": atacar,
+    "mover-exercitos": mover_exercitos,
+    "receber-cartas": receber_cartas,
+    "troca-cartas": trocar_cartas,
+}
+
+
+# Aplica as ações em ordem, tudo ou nada: se uma falhar, o estado volta ao de antes
+# do lote e nada é gravado; se todas passarem, os registros vão ao log de uma só vez
+@exclusiva(registrar_falha=True)
+def executar_lote(partida: Partida, acoes: list) -> List[dict]:
+    resultados = []
+    with partida.transacao():
+        for indice, (nome, parametros) in enumerate(acoes):
+            funcao = ACOES_DO_TURNO.get(nome)
+            if funcao is None:
+                raise AcaoInvalida(f"Ação {indice}: ação desconhecida '{nome}'")
+            try:
+                resultados.append(funcao(partida, **_converter(funcao, parametros)))
+            except ErroDeJogo as erro:
+                erro.args = (f"Ação {indice} ({nome}): {erro}",)
+                raise
+    return resultados
+
+
+# Confere os parâmetros do lote contra a assinatura da ação (int/str/List[str])
+def _converter(funcao, parametros: dict) -> dict:
+    tipos = typing.get_type_hints(funcao)
+    esperados = [nome for nome in tipos if nome not in ("partida", "return")]
+    if set(parametros) != set(esperados):
+        raise AcaoInvalida(f"parâmetros esperados: {', '.join(esperados)}")
+    try:
+        return {nome: _valor(tipos[nome], valor) for nome, valor in parametros.items()}
+    except (TypeError, ValueError):
+        raise AcaoInvalida("parâmetros com tipo inválido")
+
+
+def _valor(tipo, valor):
+    if typing.get_origin(tipo) is list:
+        if not isinstance(valor, list):
+            raise TypeError(tipo)
+        item, = typing.get_args(tipo)
+        return [item(v) for v in valor]
+    return tipo(valor)
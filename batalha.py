@@ -0,0 +1,91 @@
+# batalha.py
+# Simulador Monte Carlo vetorizado (NumPy) de batalhas completas: o atacante rola até
+# conquistar o território ou ficar com `parada` exércitos, com as mesmas regras de iniciar_ataque
+# (até 3 dados de ataque contra até 2 de defesa, comparados em pares; empate favorece a defesa).
+from functools import lru_cache
+from itertools import product
+from typing import Tuple
+import numpy as np
+
+
+# Probabilidade exata de o defensor perder 0, 1 ou 2 exércitos numa rolagem de
+# `dados_ataque` contra `dados_defesa` (o atacante perde o restante dos pares)
+@lru_cache(maxsize=None)
+def probabilidades_rolagem(dados_ataque: int, dados_defesa: int) -> Tuple[float, ...]:
+    pares = min(dados_ataque, dados_defesa)
+    contagem = [0] * (pares + 1)
+    for rolagem in product(range(1, 7), repeat=dados_ataque + dados_defesa):
+        ataque = sorted(rolagem[:dados_ataque], reverse=True)
+        defesa = sorted(rolagem[dados_ataque:], reverse=True)
+        contagem[sum(x > y for x, y in zip(ataque, defesa))] += 1
+    total = 6 ** (dados_ataque + dados_defesa)
+    return tuple(c / total for c in contagem)
+
+
+# Limiares por categoria de rolagem ((dados_ataque - 1) * 2 + dados_defesa - 1):
+# P(defensor perde 0) e P(defensor perde no máximo 1)
+@lru_cache(maxsize=None)
+def _limiares() -> Tuple[np.ndarray, np.ndarray]:
+    zero = np.ones(6)
+    ate_um = np.ones(6)
+    for dados_ataque in range(1, 4):
+        for dados_defesa in range(1, 3):
+            acumulada = np.cumsum(probabilidades_rolagem(dados_ataque, dados_defesa))
+            categoria = (dados_ataque - 1) * 2 + dados_defesa - 1
+            zero[categoria] = acumulada[0]
+            ate_um[categoria] = min(acumulada[1], 1.0)
+    return zero, ate_um
+
+
+def simular_batalhas(atacantes: int, defensores: int, simulacoes: int = 100_000, parada: int = 1, rng=None) -> dict:
+    rng = rng if rng is not None else np.random.default_rng()
+    parada = max(parada, 1)
+    limiar_zero, limiar_um = _limiares()
+    a = np.full(simulacoes, atacantes, dtype=np.int32)
+    d = np.full(simulacoes, defensores, dtype=np.int32)
+    # Só as batalhas em andamento ficam nos vetores compactos; as encerradas voltam para a/d
+    ativos = np.flatnonzero((a > parada) & (d > 0))
+    a_ativos = a[ativos]
+    d_ativos = d[ativos]
+    rodadas = 0
+    while ativos.size:
+        rodadas += 1
+        dados_ataque = np.minimum(3, a_ativos - 1)
+        dados_defesa = np.minimum(2, d_ativos)
+        pares = np.minimum(dados_ataque, dados_defesa)
+
+        # Uma única amostra uniforme por batalha decide o resultado da rolagem inteira
+        categoria = (dados_ataque - 1) * 2 + dados_defesa - 1
+        sorteio = rng.random(ativos.size)
+        vitorias = (sorteio >= limiar_zero[categoria]).astype(np.int32)
+        vitorias += sorteio >= limiar_um[categoria]
+
+        d_ativos -= vitorias
+        a_ativos -= pares - vitorias
+        continua = (a_ativos > parada) & (d_ativos > 0)
+        if not continua.all():
+            encerradas = ~continua
+            a[ativos[encerradas]] = a_ativos[encerradas]
+            d[ativos[encerradas]] = d_ativos[encerradas]
+            ativos = ativos[continua]
+            a_ativos = a_ativos[continua]
+            d_ativos = d_ativos[continua]
+
+    perdas_atacante = atacantes - a
+    perdas_defensor = defensores - d
+    return {
+        "simulacoes": simulacoes,
+        "probabilidade_vitoria": float(np.mean(d == 0)),
+        "rodadas_max": rodadas,
+        "perdas_atacante": _distribuicao(perdas_atacante, simulacoes),
+        "perdas_defensor": _distribuicao(perdas_defensor, simulacoes),
+    }
+
+
+# Média e distribuição (índice = número de exércitos perdidos)
+def _distribuicao(perdas: np.ndarray, simulacoes: int) -> dict:
+    contagem = np.bincount(perdas)
+    return {
+        "media": float(perdas.mean()),
+        "distribuicao": (contagem / simulacoes).round(6).tolist(),
+    }
@@ -0,0 +1,81 @@
+# JSON (snapshot + log) x SQLite: latência de uma mutação (com e sem fsync) e tempo de
+# carga com histórico grande (jogadores + mutações ainda não compactadas no snapshot).
+# Uso: python -m benchmarks.bench_armazenamento
+import os
+import random
+import tempfile
+import time
+from persistencia import Persistencia
+from persistencia_sqlite import PersistenciaSQLite
+
+BACKENDS = {
+    "json": lambda caminho, sincronizar: Persistencia(caminho, limite_log=10 ** 9, sincronizar=sincronizar),
+    "sqlite": lambda caminho, sincronizar: PersistenciaSQLite(caminho + ".db", sincronizar=sincronizar),
+}
+
+
+def gerar_jogadores(quantidade: int) -> list:
+    return [
+        {"nome": f"Jogador {i}", "cor_exercito": None, "objetivo": "Conquistar 24 territórios",
+         "territorios": [f"Território {i}-{t}" for t in range(4)], "exercitos": 10, "cartas": ["Carta 1"]}
+        for i in range(quantidade)
+    ]
+
+
+def historico(jogadores: int, mutacoes: int, rng: random.Random) -> list:
+    registros = [{"op": "novo", "jogador": j} for j in gerar_jogadores(jogadores)]
+    for i in range(mutacoes):
+        nome = f"Jogador {rng.randrange(jogadores)}"
+        if i % 3 == 0:
+            registros.append({"op": "add", "nome": nome, "campo": "cartas", "valor": "Carta 2"})
+        else:
+            registros.append({"op": "set", "nome": nome, "campos": {"exercitos": i}})
+    return registros
+
+
+def latencia(nome: str, caminho: str, jogadores: int, repeticoes: int, sincronizar: bool) -> float:
+    persistencia = BACKENDS[nome](caminho, sincronizar)
+    persistencia.carregar()
+    persistencia.registrar_lote([{"op": "novo", "jogador": j} for j in gerar_jogadores(jogadores)])
+    inicio = time.perf_counter()
+    for i in range(repeticoes):
+        persistencia.registrar("set", nome="Jogador 0", campos={"exercitos": i})
+    tempo = (time.perf_counter() - inicio) / repeticoes
+    persistencia.fechar()
+    return tempo
+
+
+def carga(nome: str, caminho: str, registros: list) -> float:
+    persistencia = BACKENDS[nome](caminho, False)
+    persistencia.carregar()
+    for i in range(0, len(registros), 1000):
+        persistencia.registrar_lote(registros[i:i + 1000])
+    persistencia.fechar()
+    inicio = time.perf_counter()
+    persistencia = BACKENDS[nome](caminho, False)
+    persistencia.carregar()
+    tempo = time.perf_counter() - inicio
+    persistencia.fechar()
+    return tempo
+
+
+def executar(jogadores=(100, 10_000), mutacoes=(10_000, 200_000), repeticoes: int = 200, semente: int = 0) -> dict:
+    rng = random.Random(semente)
+    resultados = {}
+    with tempfile.TemporaryDirectory() as diretorio:
+        for n in jogadores:
+            for nome in BACKENDS:
+                resultados[f"escrita/{nome}/{n}"] = {
+                    "us": latencia(nome, os.path.join(diretorio, f"e{n}{nome}.json"), n, repeticoes, False) * 1e6,
+                    "fsync_us": latencia(nome, os.path.join(diretorio, f"f{n}{nome}.json"), n, repeticoes // 4, True) * 1e6,
+                }
+        for m in mutacoes:
+            registros = historico(1000, m, rng)
+            for nome in BACKENDS:
+                resultados[f"carga/{nome}/1000+{m}"] = {"ms": carga(nome, os.path.join(diretorio, f"c{m}{nome}.json"), registros) * 1e3}
+    return resultados
+
+
+if __name__ == "__main__":
+    for chave, r in executar().items():
+        print(chave, {k: round(v, 1) for k, v in r.items()})
@@ -0,0 +1,59 @@
+# Tempo para estimar a probabilidade de vitória de uma batalha completa:
+# laço em Python puro (random.randint, como em iniciar_ataque) x simulador vetorizado
+# x tabela exata da cadeia de Markov (primeira consulta, que preenche a tabela, e consulta quente).
+# Uso: python -m benchmarks.bench_batalha
+import random
+import time
+from batalha import simular_batalhas
+from tabela_batalha import TabelaBatalha
+
+
+def batalha_python(atacantes: int, defensores: int) -> bool:
+    while atacantes > 1 and defensores > 0:
+        dados_atacante = sorted([random.randint(1, 6) for _ in range(min(3, atacantes - 1))], reverse=True)
+        dados_defensor = sorted([random.randint(1, 6) for _ in range(min(2, defensores))], reverse=True)
+        for dado_atacante, dado_defensor in zip(dados_atacante, dados_defensor):
+            if dado_atacante > dado_defensor:
+                defensores -= 1
+            else:
+                atacantes -= 1
+    return defensores == 0
+
+
+# O laço em Python roda `amostra_python` batalhas e o tempo é extrapolado para `simulacoes`
+def executar(confrontos=((5, 3), (10, 10), (30, 30)), simulacoes: int = 100_000, amostra_python: int = 10_000) -> dict:
+    resultados = {}
+    simular_batalhas(2, 1, 10)  # monta a tabela de probabilidades antes de medir
+    for atacantes, defensores in confrontos:
+        inicio = time.perf_counter()
+        vitorias = sum(batalha_python(atacantes, defensores) for _ in range(amostra_python))
+        python_s = (time.perf_counter() - inicio) * simulacoes / amostra_python
+        inicio = time.perf_counter()
+        vetorizado = simular_batalhas(atacantes, defensores, simulacoes)
+        numpy_s = time.perf_counter() - inicio
+        tabela = TabelaBatalha(limite=max(atacantes, defensores))
+        inicio = time.perf_counter()
+        exato = tabela.resultado(atacantes, defensores)
+        tabela_fria_s = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        tabela.resultado(atacantes, defensores)
+        tabela_quente_s = time.perf_counter() - inicio
+        resultados[f"{atacantes}x{defensores}"] = {
+            "python_ms": python_s * 1e3,
+            "numpy_ms": numpy_s * 1e3,
+            "tabela_fria_ms": tabela_fria_s * 1e3,
+            "tabela_quente_us": tabela_quente_s * 1e6,
+            "p_python": vitorias / amostra_python,
+            "p_numpy": vetorizado["probabilidade_vitoria"],
+            "p_exata": exato["probabilidade_vitoria"],
+        }
+    return resultados
+
+
+if __name__ == "__main__":
+    print(f"{'confronto':>10} {'python (ms)':>12} {'numpy (ms)':>11} {'tabela fria (ms)':>17} {'tabela quente (µs)':>19} {'p python':>9} {'p numpy':>8} {'p exata':>8}")
+    for chave, r in executar().items():
+        print(
+            f"{chave:>10} {r['python_ms']:>12.1f} {r['numpy_ms']:>11.1f} {r['tabela_fria_ms']:>17.2f} "
+            f"{r['tabela_quente_us']:>19.2f} {r['p_python']:>9.4f} {r['p_numpy']:>8.4f} {r['p_exata']:>8.4f}"
+        )
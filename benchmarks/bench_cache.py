@@ -0,0 +1,77 @@
+# Carga mista de leitura e escrita via ASGI (sem rede): para cada escrita (receber-cartas ou
+# distribuir-exercitos num jogador aleatório), `leituras` GETs de /jogadores/ver/ e /gerar-json/.
+# Metade dos leitores manda If-None-Match com o último ETag visto. Compara o cache de visões
+# ligado e desligado: taxa de acerto e latência p50/p99 das leituras.
+# Requer httpx. Uso: python -m benchmarks.bench_cache
+import asyncio
+import os
+import random
+import tempfile
+import time
+import httpx
+
+
+def percentil(valores: list, p: float) -> float:
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p))]
+
+
+async def carga(ativo: bool, jogadores: int, escritas: int, leituras: int, semente: int) -> dict:
+    import main
+    from partida import JOGO_PADRAO, Partidas
+    main.partidas = Partidas()
+    rng = random.Random(semente)
+    nomes = [f"Jogador {i}" for i in range(jogadores)]
+    etags = {}
+    latencias = []
+    transporte = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transporte, base_url="http://teste") as cliente:
+        for nome in nomes:
+            await cliente.post("/jogadores/adicionar/", params={"nome": nome})
+        partida = main.partidas.obter(JOGO_PADRAO)
+        partida.visoes.ativo = ativo
+        for _ in range(escritas):
+            nome = rng.choice(nomes)
+            if rng.random() < 0.5:
+                recebida = await cliente.post("/rodada/receber-cartas/", params={"jogador": nome})
+                if recebida.json().get("troca_disponivel"):
+                    await cliente.post("/rodada/troca-cartas/", params={"jogador": nome})
+            else:
+                await cliente.post("/preparacao/distribuir-exercitos/", params={"jogador": nome, "exercitos": 1})
+            for i in range(leituras):
+                if rng.random() < 0.1:
+                    url, parametros = "/gerar-json/", {}
+                else:
+                    url, parametros = "/jogadores/ver/", {"nome": rng.choice(nomes)}
+                chave = (url, parametros.get("nome"))
+                cabecalhos = {"If-None-Match": etags[chave]} if ativo and i % 2 and chave in etags else {}
+                inicio = time.perf_counter()
+                resposta = await cliente.get(url, params=parametros, headers=cabecalhos)
+                latencias.append(time.perf_counter() - inicio)
+                etags[chave] = resposta.headers.get("etag")
+        estatisticas = partida.visoes.estatisticas()
+    await main.partidas.parar()
+    main.partidas.fechar()
+    return {
+        "taxa_de_acerto": estatisticas["taxa_de_acerto"] if ativo else 0.0,
+        "p50_ms": percentil(latencias, 0.5) * 1e3,
+        "p99_ms": percentil(latencias, 0.99) * 1e3,
+    }
+
+
+def executar(jogadores: int = 200, escritas: int = 100, leituras: int = 50, semente: int = 0) -> dict:
+    original = os.getcwd()
+    resultados = {}
+    for ativo in (False, True):
+        with tempfile.TemporaryDirectory() as diretorio:
+            os.chdir(diretorio)
+            try:
+                resultados["com_cache" if ativo else "sem_cache"] = asyncio.run(carga(ativo, jogadores, escritas, leituras, semente))
+            finally:
+                os.chdir(original)
+    return resultados
+
+
+if __name__ == "__main__":
+    for chave, r in executar().items():
+        print(chave, {k: round(v, 3) for k, v in r.items()})
@@ -0,0 +1,92 @@
+# Tempo de partida do servidor com snapshots de 1 MB, 100 MB e 1 GB (um jogador por linha):
+# até responder /saude/ (a partida padrão carrega numa thread), até a partida padrão estar
+# pronta, e a carga antiga (json.load do documento + Jogador pydantic para todos), essa só
+# até `limite_antigo_mb` para não estourar a memória. Cada medida roda num processo novo
+# (pico de memória próprio). Uso: python -m benchmarks.bench_carga [tamanhos em MB...]
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+from mapa import MAPA_WAR
+
+
+def gerar_snapshot(caminho: str, megabytes: int, semente: int = 0):
+    rng = random.Random(semente)
+    territorios = list(MAPA_WAR.territorios)
+    alvo = megabytes * 1_000_000
+    escritos = 0
+    with open(caminho, "wb") as f:
+        f.write(b'{"seq":0,"jogadores":[\n')
+        linhas = []
+        i = 0
+        while escritos < alvo:
+            # Só os primeiros 42 jogadores têm território (o mapa tem 42); os demais têm cartas
+            jogador = {"nome": f"Jogador {i}", "cor_exercito": None, "objetivo": "Conquistar 18 territórios",
+                       "territorios": [territorios[i]] if i < len(territorios) else [], "exercitos": rng.randint(0, 99),
+                       "cartas": [rng.choice(["Carta 1", "Carta 2", "Carta 3"]) for _ in range(50)]}
+            linhas.append(json.dumps(jogador, ensure_ascii=False).encode("utf-8"))
+            escritos += len(linhas[-1]) + 2
+            i += 1
+            if len(linhas) == 10_000 or escritos >= alvo:
+                f.write((b",\n" if i > len(linhas) else b"") + b",\n".join(linhas))
+                linhas = []
+        f.write(b"\n]}\n")
+
+
+def _novo(diretorio: str) -> dict:
+    os.chdir(diretorio)
+    import httpx
+    import main
+
+    async def medir():
+        inicio = time.perf_counter()
+        await main.startup_event()
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://teste") as cliente:
+            await cliente.get("/saude/")
+            pronto = time.perf_counter() - inicio
+            await main.carga_inicial
+            carregado = time.perf_counter() - inicio
+            await cliente.get("/jogadores/ver/", params={"nome": "Jogador 1"})
+        main.partidas.fechar()
+        return {"ate_responder_s": pronto, "ate_carregar_s": carregado}
+
+    resultado = asyncio.run(medir())
+    resultado["pico_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return resultado
+
+
+def _antigo(diretorio: str) -> dict:
+    from modelos import Jogador
+    inicio = time.perf_counter()
+    with open(os.path.join(diretorio, "dados.json"), encoding="utf-8") as f:
+        dados = json.load(f)
+    jogadores = {j["nome"]: Jogador(**j) for j in dados["jogadores"]}
+    return {"ate_responder_s": time.perf_counter() - inicio, "jogadores": len(jogadores),
+            "pico_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}
+
+
+def _em_processo(funcao, diretorio: str) -> dict:
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        return pool.apply(funcao, (diretorio,))
+
+
+def executar(tamanhos=(1, 100, 1000), limite_antigo_mb: int = 100) -> dict:
+    resultados = {}
+    for megabytes in tamanhos:
+        with tempfile.TemporaryDirectory() as diretorio:
+            gerar_snapshot(os.path.join(diretorio, "dados.json"), megabytes)
+            resultados[f"novo/{megabytes}MB"] = _em_processo(_novo, diretorio)
+            if megabytes <= limite_antigo_mb:
+                resultados[f"antigo/{megabytes}MB"] = _em_processo(_antigo, diretorio)
+    return resultados
+
+
+if __name__ == "__main__":
+    tamanhos = tuple(int(t) for t in sys.argv[1:]) or (1, 100, 1000)
+    for chave, r in executar(tamanhos).items():
+        print(chave, {k: round(v, 3) for k, v in r.items()})
@@ -0,0 +1,71 @@
+# Escala horizontal (coordenador.py): vazão do bot da suíte (benchmarks/suite.py) com 1, 2,
+# 4 e 8 trabalhadores uvicorn, cada requisição direto no dono da partida (ClienteRoteado).
+# A carga sai de vários processos geradores, para o cliente não ser o gargalo. Escala quase
+# linear pede núcleos livres para trabalhadores e geradores (cpus >= 2x trabalhadores);
+# numa máquina com menos núcleos a vazão para de crescer quando eles acabam.
+# Requer uvicorn e httpx. Uso: python -m benchmarks.bench_escala [--trabalhadores 1 2 4 8]
+#   [--partidas 32] [--turnos 5] [--geradores 4]
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from benchmarks.suite import jogar_bot, percentil
+from coordenador import ClienteRoteado, iniciar_trabalhadores, parar_trabalhadores
+
+PORTA_BASE = 18700
+
+
+# Um processo gerador: `partidas` bots simultâneos; devolve as latências e o intervalo medido
+def gerar(urls: list, partidas: int, turnos: int, semente: int) -> tuple:
+    async def jogar():
+        latencias = []
+        rng = random.Random(semente)
+        async with ClienteRoteado(urls, timeout=None) as cliente:
+            inicio = time.time()
+            await asyncio.gather(*(jogar_bot(cliente, turnos, latencias, random.Random(rng.random())) for _ in range(partidas)))
+            return latencias, inicio, time.time()
+    return asyncio.run(jogar())
+
+
+def medir(trabalhadores: int, partidas: int, turnos: int, geradores: int) -> dict:
+    with tempfile.TemporaryDirectory() as diretorio:
+        # Durabilidade atrasada: mede o servidor, não o fsync do disco compartilhado
+        processos = iniciar_trabalhadores(trabalhadores, PORTA_BASE, diretorio=diretorio, ambiente={"WAR_DURABILIDADE": "atrasada"})
+        urls = [url for url, _ in processos]
+        try:
+            with ProcessPoolExecutor(geradores) as executor:
+                por_gerador = [partidas // geradores + (i < partidas % geradores) for i in range(geradores)]
+                resultados = list(executor.map(gerar, [urls] * geradores, por_gerador, [turnos] * geradores, range(geradores)))
+        finally:
+            parar_trabalhadores(processos)
+    latencias = [latencia for lista, _, _ in resultados for latencia in lista]
+    duracao = max(fim for _, _, fim in resultados) - min(inicio for _, inicio, _ in resultados)
+    return {"req_por_s": len(latencias) / duracao, "p50_ms": percentil(latencias, 0.5) * 1e3, "p99_ms": percentil(latencias, 0.99) * 1e3}
+
+
+def executar(trabalhadores=(1, 2, 4, 8), partidas: int = 32, turnos: int = 5, geradores: int = None) -> dict:
+    geradores = geradores or min(partidas, max(2, (os.cpu_count() or 1) // 2))
+    resultados = {}
+    for quantidade in trabalhadores:
+        resultado = medir(quantidade, partidas, turnos, geradores)
+        base = resultados[trabalhadores[0]]["req_por_s"] / trabalhadores[0] if resultados else resultado["req_por_s"] / quantidade
+        resultado["eficiencia"] = resultado["req_por_s"] / (base * quantidade)
+        resultados[quantidade] = resultado
+    return {"cpus": os.cpu_count(), "geradores": geradores, "trabalhadores": resultados}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--trabalhadores", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--partidas", type=int, default=32)
+    parser.add_argument("--turnos", type=int, default=5)
+    parser.add_argument("--geradores", type=int)
+    args = parser.parse_args()
+    resultado = executar(tuple(args.trabalhadores), args.partidas, args.turnos, args.geradores)
+    print(f"{resultado['cpus']} cpus, {resultado['geradores']} processos geradores")
+    for quantidade, medida in resultado["trabalhadores"].items():
+        print(f"{quantidade:>2} trabalhadores: {medida['req_por_s']:>9,.0f} req/s  p50 {medida['p50_ms']:6.1f} ms  "
+              f"p99 {medida['p99_ms']:7.1f} ms  eficiência {medida['eficiencia']:.0%}")
@@ -0,0 +1,76 @@
+# Espectadores por push x polling. Push: N conexões na Transmissao de uma partida, cada uma com
+# a tarefa de envio da rota WebSocket (o envio vai para um destino nulo). Mede a memória por
+# 1k conexões e o CPU por evento entregue a todas. Polling: CPU de um GET /jogadores/ver/ via
+# ASGI, para comparar com 1k espectadores consultando uma vez por segundo.
+# Requer httpx. Uso: python -m benchmarks.bench_eventos
+import asyncio
+import os
+import tempfile
+import time
+import tracemalloc
+import httpx
+from eventos import Transmissao
+
+
+async def espectador(conexao, recebidos: list):
+    while True:
+        for evento in await conexao.proximos():
+            evento.json  # o que a rota WebSocket enviaria
+            recebidos[0] += 1
+
+
+async def push(conexoes: int, eventos: int) -> dict:
+    transmissao = Transmissao("bench")
+    recebidos = [0]
+    tracemalloc.start()
+    inicio_memoria = tracemalloc.get_traced_memory()[0]
+    tarefas = [asyncio.create_task(espectador(transmissao.conectar(), recebidos)) for _ in range(conexoes)]
+    await asyncio.sleep(0)
+    memoria = tracemalloc.get_traced_memory()[0] - inicio_memoria
+    tracemalloc.stop()
+
+    inicio = time.process_time()
+    for i in range(eventos):
+        transmissao.notificar_observadores("ataque", jogador="Edson", perdas=1, rodada=i)
+        await asyncio.sleep(0)
+    while recebidos[0] < conexoes * eventos:
+        await asyncio.sleep(0)
+    cpu = time.process_time() - inicio
+    for tarefa in tarefas:
+        tarefa.cancel()
+    return {"memoria_mb_por_1k": memoria / conexoes * 1000 / 1e6, "cpu_ms_por_evento_por_1k": cpu / eventos * 1e3 * 1000 / conexoes}
+
+
+async def polling(consultas: int) -> float:
+    import main
+    from partida import Partidas
+    main.partidas = Partidas()
+    transporte = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transporte, base_url="http://teste") as cliente:
+        await cliente.post("/jogadores/adicionar/", params={"nome": "Edson"})
+        inicio = time.process_time()
+        for _ in range(consultas):
+            await cliente.get("/jogadores/ver/", params={"nome": "Edson"})
+        cpu = time.process_time() - inicio
+    await main.partidas.parar()
+    main.partidas.fechar()
+    return cpu / consultas
+
+
+def executar(conexoes=(1000, 10_000), eventos: int = 50, consultas: int = 2000) -> dict:
+    resultados = {f"push/{n}": asyncio.run(push(n, eventos)) for n in conexoes}
+    original = os.getcwd()
+    with tempfile.TemporaryDirectory() as diretorio:
+        os.chdir(diretorio)
+        try:
+            por_consulta = asyncio.run(polling(consultas))
+        finally:
+            os.chdir(original)
+    # 1k espectadores consultando 1x/s: CPU gasto por segundo, com ou sem mudanças no jogo
+    resultados["polling/1000"] = {"cpu_ms_por_consulta": por_consulta * 1e3, "cpu_ms_por_s_1k_a_1hz": por_consulta * 1e3 * 1000}
+    return resultados
+
+
+if __name__ == "__main__":
+    for chave, r in executar().items():
+        print(chave, {k: round(v, 3) for k, v in r.items()})
@@ -0,0 +1,40 @@
+# Rollouts por segundo da busca de jogadas (ia.py) num meio de partida no mapa do War:
+# 4 jogadores, territórios e exércitos sorteados, reforço de 8 exércitos. Mede a busca num
+# processo só (por núcleo) e no pool com um processo por CPU, com o mesmo prazo.
+# Uso: python -m benchmarks.bench_ia
+import os
+import random
+from array import array
+import ia
+from mapa import MAPA_WAR
+from objetivos import interpretar
+
+OBJETIVOS = ["Conquistar 24 territórios", "Eliminar um oponente", "Controlar dois continentes", "Conquistar 24 territórios"]
+
+
+def meio_de_partida(semente: int = 1):
+    rng = random.Random(semente)
+    dono = array("b", [t % len(OBJETIVOS) for t in range(len(MAPA_WAR))])
+    rng.shuffle(dono)
+    exercitos = array("i", [rng.randint(1, 6) for _ in range(len(MAPA_WAR))])
+    metas = [interpretar(texto, MAPA_WAR.continentes, len(MAPA_WAR)) for texto in OBJETIVOS]
+    return ia.Situacao(dono, exercitos, 0, 8), ia.Contexto(MAPA_WAR, metas)
+
+
+def executar(tempo: float = 2.0, semente: int = 1) -> dict:
+    raiz, contexto = meio_de_partida(semente)
+    resultado = {}
+    for rotulo, processos in (("um_processo", 1), ("pool", os.cpu_count() or 1)):
+        conselheiro = ia.Conselheiro(processos)
+        conselheiro.sugerir(raiz, contexto, 0.2, chave=rotulo, semente=semente)   # aquecimento (e início do pool)
+        sugestao = conselheiro.sugerir(raiz, contexto, tempo, semente=semente)
+        conselheiro.fechar()
+        resultado[f"{rotulo}_rollouts_por_s"] = sugestao["rollouts_por_s"]
+        resultado[f"{rotulo}_por_nucleo"] = sugestao["rollouts_por_s"] / processos
+    resultado["processos"] = os.cpu_count() or 1
+    return resultado
+
+
+if __name__ == "__main__":
+    for chave, valor in executar().items():
+        print(f"{chave:>28}: {valor:,.0f}")
@@ -0,0 +1,86 @@
+# Um turno de bot (5 reforços, 10 ataques, 1 movimento) feito com uma requisição por
+# ação contra o mesmo turno enviado de uma vez em POST /rodada/lote/.
+# Requer httpx. Uso: python -m benchmarks.bench_lote
+import asyncio
+import os
+import tempfile
+import time
+import httpx
+from mapa import MAPA_WAR
+
+
+# Primeiro par (território do atacante, território vizinho do defensor) no mapa do War
+def fronteira(territorios: dict, atacante: str, defensor: str) -> tuple:
+    return next(
+        (a, b) for a in territorios[atacante] for b in territorios[defensor]
+        if MAPA_WAR.fazem_fronteira(MAPA_WAR.id(a), MAPA_WAR.id(b))
+    )
+
+
+def turno(territorios: dict) -> list:
+    acoes = [("distribuir-exercitos", {"jogador": "Edson", "exercitos": 1}) for _ in range(5)]
+    origem, destino = fronteira(territorios, "Edson", "Marcelo")
+    acoes += [("ataque", {
+        "jogador_atacante": "Edson", "territorio_atacante": origem,
+        "jogador_defensor": "Marcelo", "territorio_defensor": destino,
+    }) for _ in range(10)]
+    acoes.append(("mover-exercitos", {
+        "jogador": "Edson", "origem": origem, "destino": origem, "quantidade": 1,
+    }))
+    return acoes
+
+
+ROTAS = {
+    "distribuir-exercitos": "/preparacao/distribuir-exercitos/",
+    "ataque": "/rodada/ataque/",
+    "mover-exercitos": "/rodada/mover-exercitos/",
+}
+
+
+async def medir(main, turnos: int) -> dict:
+    transporte = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transporte, base_url="http://teste") as cliente:
+        for nome in ("Edson", "Marcelo"):
+            await cliente.post("/jogadores/adicionar/", params={"nome": nome})
+        territorios = (await cliente.post("/preparacao/distribuir-territorios/")).json()
+        # Exércitos de sobra para que os ataques não esgotem durante a medição
+        for nome in territorios:
+            await cliente.post("/preparacao/distribuir-exercitos/", params={"jogador": nome, "exercitos": turnos * 40})
+        acoes = turno(territorios)
+
+        inicio = time.perf_counter()
+        for _ in range(turnos):
+            for nome, parametros in acoes:
+                await cliente.post(ROTAS[nome], params=parametros)
+        individual = (time.perf_counter() - inicio) / turnos
+
+        corpo = [{"acao": nome, "parametros": parametros} for nome, parametros in acoes]
+        inicio = time.perf_counter()
+        for _ in range(turnos):
+            await cliente.post("/rodada/lote/", json=corpo)
+        lote = (time.perf_counter() - inicio) / turnos
+    await main.partidas.parar()
+    return {"acoes_por_turno": len(acoes), "individual_ms": individual * 1e3, "lote_ms": lote * 1e3}
+
+
+def executar(turnos: int = 50, durabilidades=("imediata", "atrasada", "direta")) -> dict:
+    import main
+    from partida import Partidas
+    original = os.getcwd()
+    resultados = {}
+    for durabilidade in durabilidades:
+        with tempfile.TemporaryDirectory() as diretorio:
+            os.chdir(diretorio)
+            try:
+                main.partidas = Partidas(durabilidade=durabilidade)
+                resultados[durabilidade] = asyncio.run(medir(main, turnos))
+                main.partidas.fechar()
+            finally:
+                os.chdir(original)
+    return resultados
+
+
+if __name__ == "__main__":
+    print(f"{'modo':>10} {'ações':>6} {'individual (ms/turno)':>22} {'lote (ms/turno)':>16}")
+    for modo, r in executar().items():
+        print(f"{modo:>10} {r['acoes_por_turno']:>6} {r['individual_ms']:>22.2f} {r['lote_ms']:>16.2f}")
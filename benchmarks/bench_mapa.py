@@ -0,0 +1,75 @@
+# Alcance no mapa do War ("vou de A até B só pelos meus territórios?"): teste de bit nos
+# componentes que o Tabuleiro mantém x uma busca em largura por consulta. Também mede o custo
+# da troca de dono com e sem a manutenção dos componentes (conquistas aleatórias, 6 jogadores).
+# Uso: python -m benchmarks.bench_mapa
+import random
+import time
+from mapa import MAPA_WAR
+from tabuleiro import Tabuleiro
+
+
+def busca(tabuleiro: Tabuleiro, dono: str, origem: str, destino: str) -> bool:
+    if not (tabuleiro.pertence(origem, dono) and tabuleiro.pertence(destino, dono)):
+        return False
+    vistos, fila = {origem}, [origem]
+    while fila:
+        atual = fila.pop()
+        for v in MAPA_WAR.vizinhos[MAPA_WAR.id(atual)]:
+            nome = MAPA_WAR.territorios[v]
+            if nome not in vistos and tabuleiro.pertence(nome, dono):
+                vistos.add(nome)
+                fila.append(nome)
+    return destino in vistos
+
+
+def montar(mapa, jogadores: int, rng: random.Random) -> Tabuleiro:
+    tabuleiro = Tabuleiro(mapa)
+    territorios = list(MAPA_WAR.territorios)
+    rng.shuffle(territorios)
+    for i in range(jogadores):
+        tabuleiro.registrar_jogador(f"Jogador {i}", set(territorios[i::jogadores]))
+    return tabuleiro
+
+
+def executar(jogadores: int = 6, consultas: int = 200_000, conquistas: int = 200_000, semente: int = 0) -> dict:
+    rng = random.Random(semente)
+    tabuleiro = montar(MAPA_WAR, jogadores, rng)
+    nomes = [f"Jogador {i}" for i in range(jogadores)]
+    # Alguns jogadores com áreas grandes, como no meio de uma partida
+    for _ in range(300):
+        tabuleiro.atribuir(rng.choice(MAPA_WAR.territorios), rng.choice(nomes[:2]))
+    # Só pares do mesmo dono: os outros as duas formas recusam sem buscar nada
+    pares = []
+    while len(pares) < consultas:
+        a, b = rng.sample(MAPA_WAR.territorios, 2)
+        if tabuleiro.dono(a) == tabuleiro.dono(b):
+            pares.append((tabuleiro.dono(a), a, b))
+
+    inicio = time.perf_counter()
+    respostas = [tabuleiro.alcanca(dono, a, b) for dono, a, b in pares]
+    componentes = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    esperadas = [busca(tabuleiro, dono, a, b) for dono, a, b in pares]
+    largura = time.perf_counter() - inicio
+
+    trocas = [(rng.choice(MAPA_WAR.territorios), rng.choice(nomes)) for _ in range(conquistas)]
+    tempos = {}
+    for rotulo, mapa in (("com_mapa", MAPA_WAR), ("sem_mapa", None)):
+        tabuleiro = montar(mapa, jogadores, random.Random(semente))
+        inicio = time.perf_counter()
+        for territorio, nome in trocas:
+            tabuleiro.atribuir(territorio, nome)
+        tempos[rotulo] = (time.perf_counter() - inicio) / conquistas * 1e6
+    return {
+        "consulta_componentes_us": componentes / consultas * 1e6,
+        "consulta_busca_us": largura / consultas * 1e6,
+        "respostas_iguais": respostas == esperadas,
+        "alcancaveis": sum(respostas) / consultas,
+        "troca_com_componentes_us": tempos["com_mapa"],
+        "troca_sem_componentes_us": tempos["sem_mapa"],
+    }
+
+
+if __name__ == "__main__":
+    for chave, valor in executar().items():
+        print(f"{chave:>26}: {valor:,.3f}" if not isinstance(valor, bool) else f"{chave:>26}: {valor}")
@@ -0,0 +1,50 @@
+# Custo da instrumentação: o bot da suíte (benchmarks/suite.py) jogando pelas rotas com a
+# medição das rotas ligada e desligada, em rodadas alternadas (mediana da vazão de cada lado).
+# Também mede o perfilador ligado, para saber quanto custa deixá-lo rodando.
+# Uso: python -m benchmarks.bench_metricas
+import asyncio
+import os
+import statistics
+import tempfile
+import metricas
+from benchmarks.suite import carga_api
+
+
+def vazao(partidas_simultaneas: int, turnos: int) -> float:
+    import main
+    from partida import Partidas
+    original = os.getcwd()
+    with tempfile.TemporaryDirectory() as diretorio:
+        os.chdir(diretorio)
+        try:
+            main.partidas = Partidas()
+            resultado = asyncio.run(carga_api(partidas_simultaneas, turnos))
+            main.partidas.fechar()
+        finally:
+            os.chdir(original)
+    return resultado["req_por_s"]
+
+
+def executar(rodadas: int = 7, partidas_simultaneas: int = 4, turnos: int = 5) -> dict:
+    vazao(partidas_simultaneas, turnos)   # aquecimento
+    lados = {"sem_metricas": [], "com_metricas": [], "com_perfilador": []}
+    for _ in range(rodadas):
+        for lado, medicoes in lados.items():
+            metricas.medir_rotas = lado != "sem_metricas"
+            if lado == "com_perfilador":
+                metricas.perfilador.ligar()
+            medicoes.append(vazao(partidas_simultaneas, turnos))
+            metricas.perfilador.desligar()
+    metricas.medir_rotas = True
+    medianas = {f"{lado}_req_por_s": statistics.median(medicoes) for lado, medicoes in lados.items()}
+    base = medianas["sem_metricas_req_por_s"]
+    return {
+        **medianas,
+        "custo_metricas": 1 - medianas["com_metricas_req_por_s"] / base,
+        "custo_perfilador": 1 - medianas["com_perfilador_req_por_s"] / base,
+    }
+
+
+if __name__ == "__main__":
+    for chave, valor in executar().items():
+        print(f"{chave:>26}: {valor:,.1f}" if chave.endswith("_por_s") else f"{chave:>26}: {valor:+.1%}")
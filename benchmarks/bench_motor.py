@@ -0,0 +1,23 @@
+# Vazão do motor sem HTTP (partidas/s) em 1 processo e no ProcessPoolExecutor,
+# com a estimativa de tempo para 1M de partidas.
+# Uso: python -m benchmarks.bench_motor
+import os
+import time
+from motor import PoliticaAgressiva, PoliticaAleatoria, simular
+
+
+def executar(partidas: int = 5000, processos=(1, os.cpu_count())) -> dict:
+    politicas = [PoliticaAgressiva(), PoliticaAgressiva(), PoliticaAleatoria()]
+    resultados = {}
+    for quantidade in dict.fromkeys(processos):
+        inicio = time.perf_counter()
+        simular(partidas, politicas, semente=0, processos=quantidade, lote=max(1, partidas // (4 * quantidade)))
+        duracao = time.perf_counter() - inicio
+        resultados[quantidade] = {"partidas_por_s": partidas / duracao, "estimativa_1M_min": 1_000_000 / (partidas / duracao) / 60}
+    return resultados
+
+
+if __name__ == "__main__":
+    print(f"{'processos':>9} {'partidas/s':>11} {'1M partidas (min)':>18}")
+    for processos, r in executar().items():
+        print(f"{processos:>9} {r['partidas_por_s']:>11.0f} {r['estimativa_1M_min']:>18.1f}")
@@ -0,0 +1,87 @@
+# Teste de carga em processo: N partidas simultâneas, cada uma jogada por um bot roteirizado.
+# Mede vazão total (requisições/s) e latência p50/p99 por número de partidas concorrentes,
+# para cada modo de durabilidade do gravador (imediata, atrasada e a gravação direta antiga).
+# Requer httpx. Uso: python -m benchmarks.bench_partidas
+import asyncio
+import os
+import tempfile
+import time
+import httpx
+from mapa import MAPA_WAR
+
+
+def percentil(valores: list, p: float) -> float:
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p))]
+
+
+# Primeiro par (território do atacante, território vizinho do defensor) no mapa do War
+def fronteira(territorios: dict, atacante: str, defensor: str) -> tuple:
+    return next(
+        (a, b) for a in territorios[atacante] for b in territorios[defensor]
+        if MAPA_WAR.fazem_fronteira(MAPA_WAR.id(a), MAPA_WAR.id(b))
+    )
+
+
+async def jogar(cliente: httpx.AsyncClient, ataques: int, latencias: list):
+    async def chamar(metodo, rota, **params):
+        inicio = time.perf_counter()
+        resposta = await cliente.request(metodo, rota, params=params)
+        latencias.append(time.perf_counter() - inicio)
+        return resposta.json()
+
+    jogo = (await chamar("POST", "/jogos/"))["jogo_id"]
+    base = f"/jogos/{jogo}"
+    for nome in ("Edson", "Marcelo", "Pedro"):
+        await chamar("POST", f"{base}/jogadores/adicionar/", nome=nome)
+    territorios = await chamar("POST", f"{base}/preparacao/distribuir-territorios/")
+    for nome in territorios:
+        await chamar("POST", f"{base}/preparacao/distribuir-exercitos/", jogador=nome, exercitos=ataques * 3)
+    origem, destino = fronteira(territorios, "Edson", "Marcelo")
+    for _ in range(ataques):
+        await chamar(
+            "POST", f"{base}/rodada/ataque/",
+            jogador_atacante="Edson", territorio_atacante=origem,
+            jogador_defensor="Marcelo", territorio_defensor=destino,
+        )
+        await chamar("GET", f"{base}/jogadores/ver/", nome="Marcelo")
+
+
+async def rodada_de_carga(main, partidas_simultaneas: int, ataques: int) -> dict:
+    latencias = []
+    transporte = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transporte, base_url="http://teste") as cliente:
+        inicio = time.perf_counter()
+        await asyncio.gather(*(jogar(cliente, ataques, latencias) for _ in range(partidas_simultaneas)))
+        duracao = time.perf_counter() - inicio
+    await main.partidas.parar()
+    return {
+        "requisicoes": len(latencias),
+        "req_por_s": len(latencias) / duracao,
+        "p50_ms": percentil(latencias, 0.50) * 1e3,
+        "p99_ms": percentil(latencias, 0.99) * 1e3,
+    }
+
+
+def executar(simultaneas=(1, 10, 100, 500), ataques: int = 10, durabilidades=("imediata", "atrasada", "direta")) -> dict:
+    import main
+    from partida import Partidas
+    original = os.getcwd()
+    resultados = {}
+    for durabilidade in durabilidades:
+        with tempfile.TemporaryDirectory() as diretorio:
+            os.chdir(diretorio)
+            try:
+                for quantidade in simultaneas:
+                    main.partidas = Partidas(durabilidade=durabilidade)
+                    resultados[f"{durabilidade}/{quantidade}"] = asyncio.run(rodada_de_carga(main, quantidade, ataques))
+                    main.partidas.fechar()
+            finally:
+                os.chdir(original)
+    return resultados
+
+
+if __name__ == "__main__":
+    print(f"{'modo/partidas':>16} {'requisições':>12} {'req/s':>9} {'p50 (ms)':>9} {'p99 (ms)':>9}")
+    for chave, r in executar().items():
+        print(f"{chave:>16} {r['requisicoes']:>12} {r['req_por_s']:>9.0f} {r['p50_ms']:>9.2f} {r['p99_ms']:>9.2f}")
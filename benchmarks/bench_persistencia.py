@@ -0,0 +1,62 @@
+# Latência por escrita: reescrita completa do JSON (salvar_dados antigo) x log de mutações.
+# Uso: python -m benchmarks.bench_persistencia
+import json
+import os
+import tempfile
+import time
+from persistencia import Persistencia
+
+
+def gerar_jogadores(quantidade: int, territorios: int) -> list:
+    return [
+        {
+            "nome": f"Jogador {i}",
+            "cor_exercito": None,
+            "objetivo": "Conquistar 24 territórios",
+            "territorios": [f"Território {t}" for t in range(territorios)],
+            "exercitos": 10,
+            "cartas": ["Carta 1", "Carta 2"],
+        }
+        for i in range(quantidade)
+    ]
+
+
+def reescrita_completa(caminho: str, jogadores: list, repeticoes: int) -> float:
+    inicio = time.perf_counter()
+    for i in range(repeticoes):
+        jogadores[0]["exercitos"] = i
+        with open(caminho, "w") as f:
+            json.dump({"jogadores": jogadores}, f, indent=4)
+    return (time.perf_counter() - inicio) / repeticoes
+
+
+def log_de_mutacoes(caminho: str, jogadores: list, repeticoes: int, sincronizar: bool) -> float:
+    persistencia = Persistencia(caminho, limite_log=10 ** 9, sincronizar=sincronizar)
+    persistencia.carregar()
+    persistencia.registrar_lote([{"op": "novo", "jogador": j} for j in jogadores])
+    inicio = time.perf_counter()
+    for i in range(repeticoes):
+        persistencia.registrar("set", nome="Jogador 0", campos={"exercitos": i})
+    tempo = (time.perf_counter() - inicio) / repeticoes
+    persistencia.fechar()
+    return tempo
+
+
+def executar(tamanhos=((10, 5), (100, 42), (1000, 42), (10000, 42)), repeticoes: int = 50) -> dict:
+    resultados = {}
+    for quantidade, territorios in tamanhos:
+        jogadores = gerar_jogadores(quantidade, territorios)
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, "dados.json")
+            resultados[f"{quantidade}x{territorios}"] = {
+                "reescrita_us": reescrita_completa(caminho, jogadores, repeticoes) * 1e6,
+                "log_us": log_de_mutacoes(caminho + ".wal", jogadores, repeticoes, False) * 1e6,
+                "log_fsync_us": log_de_mutacoes(caminho + ".fsync", jogadores, repeticoes, True) * 1e6,
+            }
+    return resultados
+
+
+if __name__ == "__main__":
+    print(f"{'jogadores x territórios':>24} {'reescrita (µs)':>15} {'log (µs)':>10} {'log+fsync (µs)':>15}")
+    for chave, r in executar().items():
+        print(f"{chave:>24} {r['reescrita_us']:>15.1f} {r['log_us']:>10.1f} {r['log_fsync_us']:>15.1f}")
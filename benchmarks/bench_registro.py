@@ -0,0 +1,32 @@
+# Latência de busca de jogador: varredura da lista (encontrar_jogador antigo) x RegistroJogadores.
+# Uso: python -m benchmarks.bench_registro
+import timeit
+from types import SimpleNamespace
+from registro import RegistroJogadores
+
+
+def varredura(jogadores: list, nome: str):
+    for j in jogadores:
+        if j.nome == nome:
+            return j
+    return None
+
+
+def executar(tamanhos=(10, 1000, 100000), buscas: int = 200) -> dict:
+    resultados = {}
+    for quantidade in tamanhos:
+        lista = [SimpleNamespace(nome=f"Jogador {i}") for i in range(quantidade)]
+        registro = RegistroJogadores(lista)
+        # Pior caso (último da lista) e caso médio (meio da lista)
+        alvos = {"ultimo": lista[-1].nome, "meio": lista[quantidade // 2].nome}
+        for caso, nome in alvos.items():
+            lista_s = timeit.timeit(lambda: varredura(lista, nome), number=buscas) / buscas
+            registro_s = timeit.timeit(lambda: registro.obter(nome), number=buscas * 100) / (buscas * 100)
+            resultados[f"{quantidade}/{caso}"] = {"lista_us": lista_s * 1e6, "registro_us": registro_s * 1e6}
+    return resultados
+
+
+if __name__ == "__main__":
+    print(f"{'jogadores/caso':>16} {'lista (µs)':>12} {'registro (µs)':>14}")
+    for chave, r in executar().items():
+        print(f"{chave:>16} {r['lista_us']:>12.3f} {r['registro_us']:>14.3f}")
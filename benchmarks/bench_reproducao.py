@@ -0,0 +1,78 @@
+# Grava uma partida com semente (ataques, exércitos, cartas, rodadas, lotes) pelo acoes.py
+# com o diário ligado e depois a reproduz com reproducao.py, sem HTTP nem persistência.
+# Mede as ações por segundo da reprodução e confere se o estado final é o mesmo.
+# Uso: python -m benchmarks.bench_reproducao
+import os
+import random
+import tempfile
+import time
+import acoes
+from partida import MAPA, Partida
+from persistencia import Persistencia
+from reproducao import estado, ler_diario, reproduzir
+
+
+def gravar_partida(diretorio: str, jogadores: int, acoes_por_jogador: int, semente: int):
+    # Sem fsync: só o diário interessa aqui
+    partida = Partida("bench", Persistencia(os.path.join(diretorio, "bench.json"), sincronizar=False), semente=semente)
+    partida.carregar()
+    partida.abrir_diario(os.path.join(diretorio, "bench.json.acoes"))
+    nomes = [f"Jogador {i}" for i in range(jogadores)]
+    for nome in nomes:
+        acoes.adicionar_jogador(partida, nome)
+        acoes.distribuir_exercitos(partida, nome, acoes_por_jogador * 2)
+    acoes.definir_ordem(partida)
+    acoes.distribuir_territorios(partida)
+    # As escolhas do "bot" usam outro gerador: os sorteios do jogo saem dos fluxos da partida
+    rng = random.Random(semente)
+    inicio = time.perf_counter()
+    for i in range(jogadores * acoes_por_jogador):
+        sorteio = rng.random()
+        if sorteio < 0.7:
+            # Um território qualquer contra um vizinho de outro dono
+            origem = rng.choice(MAPA.territorios)
+            destino = MAPA.territorios[rng.choice(MAPA.vizinhos[MAPA.id(origem)])]
+            atacante, defensor = partida.tabuleiro.dono(origem), partida.tabuleiro.dono(destino)
+            if atacante != defensor:
+                try:
+                    acoes.atacar(partida, atacante, origem, defensor, destino)
+                except acoes.AcaoInvalida:
+                    pass
+        elif sorteio < 0.9:
+            nome = rng.choice(nomes)
+            if acoes.receber_cartas(partida, nome)["troca_disponivel"]:
+                acoes.trocar_cartas(partida, nome, [])
+        elif sorteio < 0.99:
+            acoes.distribuir_exercitos(partida, rng.choice(nomes), 3)
+        else:
+            acoes.iniciar_rodada(partida)
+    gravacao = time.perf_counter() - inicio
+    final = estado(partida)
+    caminho = partida.diario.caminho
+    partida.fechar()
+    return caminho, final, gravacao
+
+
+def executar(jogadores: int = 5, acoes_por_jogador: int = 50_000, semente: int = 7) -> dict:
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho, final, gravacao = gravar_partida(diretorio, jogadores, acoes_por_jogador, semente)
+        tamanho = os.path.getsize(caminho)
+        entradas = list(ler_diario(caminho))
+        quantidade = sum(1 for entrada in entradas if "acao" in entrada)
+        inicio = time.perf_counter()
+        partida = reproduzir(entradas)
+        duracao = time.perf_counter() - inicio
+        return {
+            "acoes": quantidade,
+            "diario_mb": tamanho / 2**20,
+            "gravacao_s": gravacao,
+            "reproducao_s": duracao,
+            "acoes_por_s": quantidade / duracao,
+            "estado_igual": estado(partida) == final,
+        }
+
+
+if __name__ == "__main__":
+    r = executar()
+    print(f"{r['acoes']} ações no diário ({r['diario_mb']:.1f} MB); jogo original {r['gravacao_s']:.2f}s")
+    print(f"reprodução: {r['reproducao_s']:.2f}s = {r['acoes_por_s']:,.0f} ações/s; estado final igual: {r['estado_igual']}")
@@ -0,0 +1,52 @@
+# Codificação do estado dos jogadores (formato do dados.json) com 10 a 10k jogadores:
+# json da biblioteca padrão com indent=4 (como era), json compacto e serializacao.dumps
+# (orjson/msgspec quando instalados). Mede codificação, decodificação e tamanho.
+# Uso: python -m benchmarks.bench_serializacao
+import json
+import random
+import timeit
+import serializacao
+from mapa import MAPA_WAR
+
+
+def estado(jogadores: int, rng: random.Random) -> dict:
+    territorios = list(MAPA_WAR.territorios)
+    return {"jogadores": [
+        {"nome": f"Jogador {i}", "cor_exercito": rng.choice(["Vermelho", "Azul", "Verde"]),
+         "objetivo": "Conquistar a Europa, América do Sul e um terceiro continente",
+         "territorios": rng.sample(territorios, 7), "exercitos": rng.randint(1, 60),
+         "cartas": ["Infantaria", "Cavalaria"]}
+        for i in range(jogadores)
+    ]}
+
+
+CODIFICADORES = {
+    "json_indent4": (lambda d: json.dumps(d, indent=4).encode("utf-8"), json.loads),
+    "json_compacto": (lambda d: json.dumps(d, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), json.loads),
+    f"serializacao_{serializacao.MOTOR}": (serializacao.dumps, serializacao.loads),
+}
+
+
+def medir(funcao, argumento, repeticoes: int) -> float:
+    return min(timeit.repeat(lambda: funcao(argumento), number=repeticoes, repeat=3)) / repeticoes
+
+
+def executar(tamanhos=(10, 100, 1000, 10_000), semente: int = 0) -> dict:
+    rng = random.Random(semente)
+    resultados = {}
+    for n in tamanhos:
+        dados = estado(n, rng)
+        repeticoes = max(1, 20_000 // n)
+        for nome, (codificar, decodificar) in CODIFICADORES.items():
+            corpo = codificar(dados)
+            resultados[f"{nome}/{n}"] = {
+                "codificar_ms": medir(codificar, dados, repeticoes) * 1e3,
+                "decodificar_ms": medir(decodificar, corpo, repeticoes) * 1e3,
+                "bytes": len(corpo),
+            }
+    return resultados
+
+
+if __name__ == "__main__":
+    for chave, r in executar().items():
+        print(chave, {k: round(v, 3) for k, v in r.items()})
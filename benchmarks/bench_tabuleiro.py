@@ -0,0 +1,66 @@
+# Memória por partida com 42 territórios e 6 jogadores: estado atual (Jogador pydantic com
+# territórios em strings, RegistroJogadores e Tabuleiro) x TabuleiroCompacto. O mapa é
+# compartilhado entre partidas e não entra na conta. Também mede copia() e snapshot().
+# Uso: python -m benchmarks.bench_tabuleiro
+import json
+import random
+import timeit
+import tracemalloc
+from mapa import MAPA_WAR
+from modelos import Jogador
+from registro import RegistroJogadores
+from tabuleiro import Tabuleiro
+from tabuleiro_compacto import TabuleiroCompacto
+
+
+def jogadores_json(jogadores: int, rng: random.Random) -> str:
+    territorios = list(MAPA_WAR.territorios)
+    rng.shuffle(territorios)
+    return json.dumps([
+        {"nome": f"Jogador {i}", "cor_exercito": None, "objetivo": "Eliminar um jogador",
+         "territorios": territorios[i::jogadores], "exercitos": 20, "cartas": ["Carta 1"]}
+        for i in range(jogadores)
+    ])
+
+
+def estado_atual(dados: list):
+    registro = RegistroJogadores(Jogador(**j) for j in dados)
+    tabuleiro = Tabuleiro()
+    for j in registro:
+        tabuleiro.registrar_jogador(j.nome, j.territorios)
+    return registro, tabuleiro
+
+
+def estado_compacto(dados: list):
+    return TabuleiroCompacto.de_jogadores(MAPA_WAR, dados)
+
+
+# Bytes alocados por partida; o texto JSON é decodificado dentro da medição nos dois casos
+def memoria(construir, textos: list) -> float:
+    tracemalloc.start()
+    inicio = tracemalloc.get_traced_memory()[0]
+    partidas = [construir(json.loads(texto)) for texto in textos]
+    total = tracemalloc.get_traced_memory()[0] - inicio
+    tracemalloc.stop()
+    del partidas
+    return total / len(textos)
+
+
+def executar(partidas: int = 1000, jogadores: int = 6) -> dict:
+    rng = random.Random(0)
+    textos = [jogadores_json(jogadores, rng) for _ in range(partidas)]
+    tabuleiro = estado_compacto(json.loads(textos[0]))
+    snapshot = tabuleiro.snapshot()
+    return {
+        "atual_bytes": memoria(estado_atual, textos),
+        "compacto_bytes": memoria(estado_compacto, textos),
+        "copia_us": timeit.timeit(tabuleiro.copia, number=10_000) / 10_000 * 1e6,
+        "snapshot_us": timeit.timeit(tabuleiro.snapshot, number=10_000) / 10_000 * 1e6,
+        "restaurar_us": timeit.timeit(lambda: tabuleiro.restaurar(snapshot), number=10_000) / 10_000 * 1e6,
+        "snapshot_bytes": len(snapshot),
+    }
+
+
+if __name__ == "__main__":
+    for chave, valor in executar().items():
+        print(f"{chave:>16}: {valor:,.1f}")
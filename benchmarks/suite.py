@@ -0,0 +1,305 @@
+# Suíte de benchmarks com resultado em JSON e comparação com uma linha de base, para pegar
+# regressões de desempenho. Três camadas:
+#   micro:  motor puro, sem HTTP (dados, ataque, salvar_dados, Jogo.distribuir_territorios,
+#           buscas no registro e no tabuleiro, serialização, rollouts da ia.py)
+#   api:    bot roteirizado jogando partidas via ASGI (httpx, sem rede): vazão e latências
+#   escala: varreduras por número de jogadores e tamanho do estado (carga, ataque, gerar-json)
+# Cada métrica é a mediana de algumas repetições. Nomes terminados em _por_s são "maior é
+# melhor"; os outros (_us, _ms) são "menor é melhor". A linha de base vale para a máquina em
+# que foi gravada: grave de novo (--gravar) ao trocar de máquina.
+# Uso:
+#   python -m benchmarks.suite [--camadas micro api escala] [--rapido] [--saida resultados.json]
+#   python -m benchmarks.suite --comparar benchmarks/linha_de_base.json [--limite 0.25]
+#   python -m benchmarks.suite --gravar benchmarks/linha_de_base.json
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+LINHA_DE_BASE = os.path.join(os.path.dirname(__file__), "linha_de_base.json")
+LIMITE = 0.25   # regressão: 25% pior que a linha de base
+
+
+# Microssegundos por chamada: mediana de `repeticoes` blocos de `vezes` chamadas
+def medir_us(funcao, vezes: int, repeticoes: int = 5) -> float:
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        for _ in range(vezes):
+            funcao()
+        tempos.append((time.perf_counter() - inicio) / vezes * 1e6)
+    return statistics.median(tempos)
+
+
+def percentil(valores: list, p: float) -> float:
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p))]
+
+
+# Partida em memória (sem gravar nada) com jogadores, territórios distribuídos e exércitos de sobra
+def partida_em_memoria(jogadores: int, extras: int = 0, semente: int = 0):
+    import acoes
+    from modelos import Jogador
+    from partida import Partida
+    from reproducao import PersistenciaNula
+    partida = Partida("bench", PersistenciaNula(), semente=semente)
+    partida.carregar()
+    for i in range(jogadores):
+        acoes.adicionar_jogador(partida, f"Jogador {i}")
+        acoes.distribuir_exercitos(partida, f"Jogador {i}", 10**9)
+    acoes.distribuir_territorios(partida)
+    # Estado grande: jogadores sem territórios, só para o registro e as visões crescerem
+    for i in range(extras):
+        partida.adicionar_jogador(Jogador(nome=f"Extra {i}", exercitos=i, cartas=["Carta 1"]))
+    return partida
+
+
+# Um par de territórios vizinhos de donos diferentes
+# Parâmetros nomeados, como as rotas chamam as ações
+def fronteira(partida) -> dict:
+    from partida import MAPA
+    for a in MAPA.territorios:
+        for v in MAPA.vizinhos[MAPA.id(a)]:
+            b = MAPA.territorios[v]
+            if partida.tabuleiro.dono(a) != partida.tabuleiro.dono(b):
+                return {
+                    "jogador_atacante": partida.tabuleiro.dono(a), "territorio_atacante": a,
+                    "jogador_defensor": partida.tabuleiro.dono(b), "territorio_defensor": b,
+                }
+    raise ValueError("Sem fronteira entre jogadores diferentes")
+
+
+def micro(rapido: bool) -> dict:
+    import acoes
+    from jogador import Jogador as JogadorDoJogo
+    from jogo import Jogo
+    from partida import Partida
+    from persistencia import Persistencia
+    from serializacao import dumps, loads
+    fator = 10 if rapido else 1
+    metricas = {}
+
+    rng = random.Random(0)
+    metricas["micro/rolar_dados_us"] = medir_us(lambda: acoes.rolar_dados(3, rng), 100_000 // fator)
+
+    partida = partida_em_memoria(4)
+    ataque = fronteira(partida)
+    atacante = ataque["jogador_atacante"]
+    metricas["micro/atacar_us"] = medir_us(lambda: acoes.atacar(partida, **ataque), 20_000 // fator)
+    metricas["micro/encontrar_jogador_us"] = medir_us(lambda: acoes.encontrar_jogador(partida, atacante), 200_000 // fator)
+    dono = partida.tabuleiro.dono
+    metricas["micro/dono_territorio_us"] = medir_us(lambda: dono(ataque["territorio_defensor"]), 200_000 // fator)
+    proprios = sorted(partida.tabuleiro.territorios_de(atacante))
+    metricas["micro/alcance_us"] = medir_us(lambda: partida.tabuleiro.alcanca(atacante, proprios[0], proprios[-1]), 100_000 // fator)
+
+    # Gravação real no log (sem fsync), como nas rotas com durabilidade "direta"
+    with tempfile.TemporaryDirectory() as diretorio:
+        gravada = Partida("bench", Persistencia(os.path.join(diretorio, "dados.json"), sincronizar=False))
+        gravada.carregar()
+        acoes.adicionar_jogador(gravada, "Edson")
+        jogador = acoes.encontrar_jogador(gravada, "Edson")
+        metricas["micro/salvar_dados_us"] = medir_us(lambda: acoes.salvar_dados(gravada, jogador, "exercitos"), 5_000 // fator)
+        gravada.fechar()
+
+    def distribuir():
+        jogo = Jogo(random.Random(0))
+        for i in range(6):
+            jogo.adicionar_jogador(JogadorDoJogo(f"Jogador {i}", None))
+        jogo.distribuir_territorios()
+    metricas["micro/jogo_distribuir_territorios_us"] = medir_us(distribuir, 20_000 // fator)
+
+    # Busca de jogadas (ia.py) num processo: rollouts por segundo por núcleo
+    from benchmarks.bench_ia import meio_de_partida
+    from ia import Conselheiro
+    raiz, contexto = meio_de_partida()
+    metricas["micro/ia_rollouts_por_s"] = Conselheiro(1).sugerir(raiz, contexto, 0.2 if rapido else 1.0, semente=0)["rollouts_por_s"]
+
+    jogadores = [j.model_dump() for j in partida_em_memoria(4, extras=996).jogadores]
+    texto = dumps({"jogadores": jogadores})
+    metricas["micro/dumps_1000_jogadores_us"] = medir_us(lambda: dumps({"jogadores": jogadores}), 200 // fator)
+    metricas["micro/loads_1000_jogadores_us"] = medir_us(lambda: loads(texto), 200 // fator)
+    return metricas
+
+
+# Bot: cria a partida, prepara 4 jogadores e joga turnos (ataques na fronteira, cartas e trocas,
+# leitura do jogador e do estado), sempre pelas rotas HTTP
+async def jogar_bot(cliente, turnos: int, latencias: list, rng: random.Random):
+    from partida import MAPA
+
+    async def chamar(metodo, rota, **params):
+        inicio = time.perf_counter()
+        resposta = await cliente.request(metodo, rota, params=params)
+        latencias.append(time.perf_counter() - inicio)
+        return resposta.json() if resposta.status_code != 304 else None
+
+    base = "/jogos/" + (await chamar("POST", "/jogos/", semente=rng.randrange(2**31)))["jogo_id"]
+    nomes = [f"Bot {i}" for i in range(4)]
+    for nome in nomes:
+        await chamar("POST", f"{base}/jogadores/adicionar/", nome=nome)
+        await chamar("POST", f"{base}/preparacao/distribuir-exercitos/", jogador=nome, exercitos=turnos * 10)
+    await chamar("POST", f"{base}/preparacao/definir-ordem/")
+    dono = {t: nome for nome, territorios in (await chamar("POST", f"{base}/preparacao/distribuir-territorios/")).items() for t in territorios}
+    for _ in range(turnos):
+        await chamar("POST", f"{base}/rodada/iniciar/")
+        for nome in nomes:
+            proprios = [t for t, d in dono.items() if d == nome]
+            for _ in range(3):
+                if not proprios:
+                    break
+                origem = rng.choice(proprios)
+                destino = MAPA.territorios[rng.choice(MAPA.vizinhos[MAPA.id(origem)])]
+                if dono[destino] == nome:
+                    continue
+                resultado = await chamar(
+                    "POST", f"{base}/rodada/ataque/",
+                    jogador_atacante=nome, territorio_atacante=origem, jogador_defensor=dono[destino], territorio_defensor=destino,
+                )
+                if resultado.get("conquista", "").startswith(nome):
+                    dono[destino] = nome
+            if (await chamar("POST", f"{base}/rodada/receber-cartas/", jogador=nome)).get("troca_disponivel"):
+                await chamar("POST", f"{base}/rodada/troca-cartas/", jogador=nome)
+            await chamar("GET", f"{base}/jogadores/ver/", nome=nome)
+        await chamar("GET", f"{base}/gerar-json/")
+
+
+async def carga_api(partidas_simultaneas: int, turnos: int) -> dict:
+    import httpx
+    import main
+    latencias = []
+    rng = random.Random(0)
+    transporte = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transporte, base_url="http://teste") as cliente:
+        inicio = time.perf_counter()
+        await asyncio.gather(*(jogar_bot(cliente, turnos, latencias, random.Random(rng.random())) for _ in range(partidas_simultaneas)))
+        duracao = time.perf_counter() - inicio
+    await main.partidas.parar()
+    return {"req_por_s": len(latencias) / duracao, "p50_ms": percentil(latencias, 0.5) * 1e3, "p99_ms": percentil(latencias, 0.99) * 1e3}
+
+
+def api(rapido: bool) -> dict:
+    import main
+    from partida import Partidas
+    original = os.getcwd()
+    metricas = {}
+    for simultaneas in ((1, 4) if rapido else (1, 8, 32)):
+        with tempfile.TemporaryDirectory() as diretorio:
+            os.chdir(diretorio)
+            try:
+                main.partidas = Partidas()
+                resultado = asyncio.run(carga_api(simultaneas, 3 if rapido else 10))
+                main.partidas.fechar()
+            finally:
+                os.chdir(original)
+        for chave, valor in resultado.items():
+            metricas[f"api/bot_{simultaneas}_partidas/{chave}"] = valor
+    return metricas
+
+
+def escala(rapido: bool) -> dict:
+    import acoes
+    from partida import Partida
+    from persistencia import Persistencia
+    from serializacao import dumps
+    metricas = {}
+    fator = 10 if rapido else 1
+    for jogadores in (2, 4, 6):
+        partida = partida_em_memoria(jogadores)
+        ataque = fronteira(partida)
+        metricas[f"escala/jogadores_{jogadores}/atacar_us"] = medir_us(lambda: acoes.atacar(partida, **ataque), 10_000 // fator)
+        metricas[f"escala/jogadores_{jogadores}/distribuir_territorios_us"] = medir_us(lambda: acoes.distribuir_territorios(partida), 500 // fator)
+    for extras in ((100, 1000) if rapido else (100, 10_000, 100_000)):
+        partida = partida_em_memoria(4, extras)
+        ataque = fronteira(partida)
+        prefixo = f"escala/estado_{extras}"
+        metricas[f"{prefixo}/atacar_us"] = medir_us(lambda: acoes.atacar(partida, **ataque), 5_000 // fator)
+        metricas[f"{prefixo}/gerar_json_ms"] = medir_us(lambda: dumps({"jogadores": [j.model_dump() for j in partida.jogadores]}), 3, 3) / 1e3
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, "dados.json")
+            persistencia = Persistencia(caminho, sincronizar=False)
+            persistencia.carregar()
+            persistencia.registrar_lote([{"op": "novo", "jogador": j.model_dump()} for j in partida.jogadores])
+            persistencia.compactar()
+            persistencia.fechar()
+
+            def carregar():
+                nova = Partida("bench", Persistencia(caminho, sincronizar=False))
+                nova.carregar()
+                nova.fechar()
+            metricas[f"{prefixo}/carregar_ms"] = medir_us(carregar, 1, 3) / 1e3
+    return metricas
+
+
+CAMADAS = {"micro": micro, "api": api, "escala": escala}
+
+
+def executar(camadas=tuple(CAMADAS), rapido: bool = False) -> dict:
+    from serializacao import MOTOR
+    metricas = {}
+    for camada in camadas:
+        metricas.update(CAMADAS[camada](rapido))
+    return {
+        "data": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "processador": platform.processor() or platform.machine(),
+        "cpus": os.cpu_count(),
+        "json": MOTOR,
+        "rapido": rapido,
+        "metricas": metricas,
+    }
+
+
+def maior_e_melhor(nome: str) -> bool:
+    return nome.endswith("_por_s")
+
+
+# Compara as métricas presentes nos dois resultados. piora > 0 é pior que a linha de base
+# (0.30 = 30% mais lento, ou 30% menos vazão); regrediu quando passa do limite
+def comparar(atual: dict, base: dict, limite: float = LIMITE) -> list:
+    linhas = []
+    for nome, valor in atual["metricas"].items():
+        referencia = base["metricas"].get(nome)
+        if referencia is None or referencia <= 0 or valor <= 0:
+            continue
+        piora = referencia / valor - 1 if maior_e_melhor(nome) else valor / referencia - 1
+        linhas.append({"metrica": nome, "base": referencia, "atual": valor, "piora": piora, "regrediu": piora > limite})
+    return linhas
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Suíte de benchmarks do War")
+    parser.add_argument("--camadas", nargs="+", default=list(CAMADAS), choices=list(CAMADAS))
+    parser.add_argument("--rapido", action="store_true", help="menos repetições e estados menores")
+    parser.add_argument("--saida", help="grava o resultado (JSON) neste arquivo")
+    parser.add_argument("--gravar", nargs="?", const=LINHA_DE_BASE, help="grava o resultado como linha de base")
+    parser.add_argument("--comparar", nargs="?", const=LINHA_DE_BASE, help="compara com a linha de base; sai com 1 se houver regressão")
+    parser.add_argument("--limite", type=float, default=LIMITE, help="piora tolerada (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    resultado = executar(args.camadas, args.rapido)
+    for caminho in filter(None, (args.saida, args.gravar)):
+        with open(caminho, "w", encoding="utf-8") as arquivo:
+            json.dump(resultado, arquivo, indent=2, ensure_ascii=False)
+            arquivo.write("\n")
+    if not args.comparar:
+        for nome, valor in resultado["metricas"].items():
+            print(f"{nome:<52} {valor:>14,.3f}")
+        sys.exit(0)
+
+    with open(args.comparar, encoding="utf-8") as arquivo:
+        base = json.load(arquivo)
+    linhas = comparar(resultado, base, args.limite)
+    print(f"{'métrica':<52} {'base':>12} {'atual':>12} {'piora':>8}")
+    for linha in linhas:
+        marca = "  REGRESSÃO" if linha["regrediu"] else ""
+        print(f"{linha['metrica']:<52} {linha['base']:>12,.3f} {linha['atual']:>12,.3f} {linha['piora']:>+8.1%}{marca}")
+    regressoes = [linha for linha in linhas if linha["regrediu"]]
+    print(f"{len(regressoes)} regressões acima de {args.limite:.0%} em {len(linhas)} métricas")
+    sys.exit(1 if regressoes else 0)
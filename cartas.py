@@ -0,0 +1,161 @@
+# cartas.py
+# Cartas de troca: baralho embaralhado com pilha de descarte, mão de cada jogador contada
+# por tipo (achar ou conferir uma troca é olhar 4 contadores, sem percorrer as cartas) e a
+# tabela crescente de exércitos das trocas.
+# O baralho não é gravado: numa carga ele volta a ser todas as cartas fora das mãos, na
+# ordem fixa, e só é embaralhado na primeira compra (com o fluxo da partida, que o diário
+# reproduz). O descarte volta ao baralho quando ele acaba. O total de trocas (Baralho.trocas)
+# é gravado como estado da partida: não cai quando um jogador sai.
+from typing import Dict, Iterable, List, Optional
+
+TIPOS = ("Infantaria", "Cavalaria", "Artilharia")
+CORINGA = "Coringa"
+# Índice de cada carta nos contadores; as cartas antigas ("Carta 1".."Carta 3") contam
+# como os três tipos
+INDICE = {carta: i for i, carta in enumerate(TIPOS + (CORINGA,))}
+INDICE.update({f"Carta {i + 1}": i for i in range(len(TIPOS))})
+NOMES = TIPOS + (CORINGA,)
+
+# 14 cartas de cada tipo e 2 coringas: as 44 cartas do War
+POR_TIPO = 14
+CORINGAS = 2
+COMPOSICAO = (POR_TIPO,) * len(TIPOS) + (CORINGAS,)
+
+# Exércitos da 1ª, 2ª... troca da partida; depois da tabela, 5 a mais a cada troca
+BONUS = (4, 6, 8, 10, 12, 15)
+
+
+def bonus(trocas: int) -> int:
+    if trocas < len(BONUS):
+        return BONUS[trocas]
+    return BONUS[-1] + 5 * (trocas - len(BONUS) + 1)
+
+
+def _trios() -> list:
+    # Todos os trios válidos, como contagem por índice: três do mesmo tipo ou um de cada,
+    # com coringas no lugar de qualquer carta. Os com menos coringas primeiro
+    trios = set()
+    for a in range(4):
+        for b in range(a, 4):
+            for c in range(b, 4):
+                tipos = [i for i in (a, b, c) if i < len(TIPOS)]
+                if len(set(tipos)) in (min(len(tipos), 1), len(tipos)):
+                    contagem = [0] * len(NOMES)
+                    for i in (a, b, c):
+                        contagem[i] += 1
+                    trios.add(tuple(contagem))
+    return sorted(trios, key=lambda trio: (trio[-1], -max(trio[:-1])))
+
+
+TRIOS = _trios()
+VALIDOS = frozenset(TRIOS)
+
+
+class Mao:
+    __slots__ = ("contagem",)
+
+    def __init__(self, cartas: Iterable[str] = ()):
+        self.contagem = [0] * len(NOMES)
+        for carta in cartas:
+            self.contagem[INDICE[carta]] += 1
+
+    def __len__(self) -> int:
+        return sum(self.contagem)
+
+    def adicionar(self, carta: str):
+        self.contagem[INDICE[carta]] += 1
+
+    def remover(self, carta: str):
+        self.contagem[INDICE[carta]] -= 1
+
+    def possui(self, trio: tuple) -> bool:
+        return all(tem >= usa for tem, usa in zip(self.contagem, trio))
+
+    # Há troca se os coringas completam três do tipo mais numeroso ou um de cada
+    def tem_troca(self) -> bool:
+        *tipos, coringas = self.contagem
+        return max(tipos) + coringas >= 3 or sum(1 for n in tipos if n) + coringas >= 3
+
+    # Troca para os bots: a que gasta menos coringas e, entre essas, a que ainda deixa
+    # uma troca na mão (sem isso, três iguais antes de uma de cada)
+    def melhor_troca(self) -> Optional[tuple]:
+        melhor = None
+        for trio in TRIOS:
+            if melhor is not None and trio[-1] > melhor[-1]:
+                break
+            if not self.possui(trio):
+                continue
+            resto = Mao()
+            resto.contagem = [tem - usa for tem, usa in zip(self.contagem, trio)]
+            if resto.tem_troca():
+                return trio
+            if melhor is None:
+                melhor = trio
+        return melhor
+
+
+# Contagem por índice de uma lista de cartas; None se alguma não for carta
+def contar(cartas: Iterable[str]) -> Optional[tuple]:
+    contagem = [0] * len(NOMES)
+    for carta in cartas:
+        indice = INDICE.get(carta)
+        if indice is None:
+            return None
+        contagem[indice] += 1
+    return tuple(contagem)
+
+
+def troca_valida(contagem: tuple) -> bool:
+    return contagem in VALIDOS
+
+
+class Baralho:
+    def __init__(self):
+        self.maos: Dict[str, Mao] = {}
+        self.fora = list(COMPOSICAO)      # cartas de cada tipo ainda sem dono (baralho + descarte)
+        self.monte: Optional[List[str]] = None   # montado e embaralhado na primeira compra
+        self.descarte: List[str] = []
+        self.trocas = 0
+
+    def adicionar_mao(self, nome: str, cartas: Iterable[str] = (), trocas: int = 0):
+        mao = self.maos[nome] = Mao(cartas)
+        self.trocas += trocas
+        for i, quantidade in enumerate(mao.contagem):
+            self.fora[i] -= quantidade
+
+    # As cartas de quem sai vão para o descarte
+    def remover_mao(self, nome: str, cartas: Iterable[str]):
+        self.maos.pop(nome, None)
+        self.descartar(cartas)
+
+    def comprar(self, nome: str, rng) -> Optional[str]:
+        if not self.monte:
+            if self.monte is None:
+                self.monte = [carta for carta, quantidade in zip(NOMES, self.fora) for _ in range(max(quantidade, 0))]
+            else:
+                self.monte, self.descarte = self.descarte, []
+            rng.shuffle(self.monte)
+            if not self.monte:
+                return None
+        carta = self.monte.pop()
+        self.fora[INDICE[carta]] -= 1
+        self.maos[nome].adicionar(carta)
+        return carta
+
+    def descartar(self, cartas: Iterable[str]):
+        for carta in cartas:
+            carta = NOMES[INDICE[carta]]
+            self.fora[INDICE[carta]] += 1
+            if self.monte is not None:
+                self.descarte.append(carta)
+
+    def copia(self) -> "Baralho":
+        copia = Baralho()
+        for nome, mao in self.maos.items():
+            copia.maos[nome] = Mao()
+            copia.maos[nome].contagem = list(mao.contagem)
+        copia.fora = list(self.fora)
+        copia.monte = None if self.monte is None else list(self.monte)
+        copia.descarte = list(self.descarte)
+        copia.trocas = self.trocas
+        return copia
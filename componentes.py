@@ -0,0 +1,68 @@
+# componentes.py
+# Componentes conexos dos territórios de cada jogador, mantidos a cada troca de dono.
+# Tudo em bitsets (int) sobre os ids do Mapa: cada território guarda o bitset do componente
+# em que está, então "dá para ir de A até B só pelos meus territórios" é um teste de bit.
+# Ganhar um território junta os componentes vizinhos do mesmo dono; perder um só refaz o
+# componente de onde ele saiu (busca em bitsets, limitada aos territórios desse componente).
+from mapa import Mapa
+
+
+def bits(mascara: int):
+    while mascara:
+        bit = mascara & -mascara
+        yield bit.bit_length() - 1
+        mascara ^= bit
+
+
+class Componentes:
+    def __init__(self, mapa: Mapa):
+        self.mapa = mapa
+        self.mascara = {}                     # jogador -> bitset dos territórios dele
+        self.componente = [0] * len(mapa)     # território -> bitset do componente (0 sem dono)
+
+    def conectados(self, a: int, b: int) -> bool:
+        return bool(self.componente[a] >> b & 1)
+
+    def ganhar(self, jogador, territorio: int):
+        bit = 1 << territorio
+        mascara = self.mascara.get(jogador, 0) | bit
+        self.mascara[jogador] = mascara
+        componente = bit
+        for vizinho in bits(self.mapa.vizinhanca[territorio] & mascara):
+            componente |= self.componente[vizinho]
+        self._marcar(componente)
+
+    def perder(self, jogador, territorio: int):
+        bit = 1 << territorio
+        mascara = self.mascara.get(jogador, 0) & ~bit
+        if mascara:
+            self.mascara[jogador] = mascara
+        else:
+            self.mascara.pop(jogador, None)
+        restante = self.componente[territorio] & ~bit
+        self.componente[territorio] = 0
+        # O que sobrou do componente pode ter se partido em vários
+        while restante:
+            componente = self._inundar(restante & -restante, restante)
+            self._marcar(componente)
+            restante &= ~componente
+
+    def remover_jogador(self, jogador):
+        for territorio in bits(self.mascara.pop(jogador, 0)):
+            self.componente[territorio] = 0
+
+    # Territórios alcançáveis a partir de `inicio` sem sair de `dentro`
+    def _inundar(self, inicio: int, dentro: int) -> int:
+        vizinhanca = self.mapa.vizinhanca
+        alcancados = fronteira = inicio
+        while fronteira:
+            proximos = 0
+            for territorio in bits(fronteira):
+                proximos |= vizinhanca[territorio]
+            fronteira = proximos & dentro & ~alcancados
+            alcancados |= fronteira
+        return alcancados
+
+    def _marcar(self, componente: int):
+        for territorio in bits(componente):
+            self.componente[territorio] = componente
@@ -0,0 +1,252 @@
+# coordenador.py
+# Vários processos servindo o jogo. O estado de cada partida continua na memória de um
+# único processo (o dono) e no arquivo dela; o que se divide entre os trabalhadores são as
+# partidas:
+#   - Anel: hashing consistente do id da partida nos trabalhadores, com nós virtuais. Pôr ou
+#     tirar um trabalhador só muda o dono de ~1/N das partidas
+#   - Roteador: app ASGI na frente dos trabalhadores; encaminha cada requisição HTTP ao dono
+#     da partida (o id vem de /jogos/{id}/..., ou do parâmetro jogo_id; sem ele, a partida
+#     padrão). POST /jogos/ sem id recebe aqui um id novo, para a partida nascer no dono
+#   - ClienteRoteado: o mesmo roteamento do lado do cliente (bots, testes de carga), direto
+#     nos trabalhadores, sem o salto pelo roteador
+# A posse (posse.py) garante um só processo gravando em cada partida mesmo com o
+# roteamento errado. Os WebSockets de eventos vão direto ao dono: GET /coordenador/dono/.
+# Uso: python -m coordenador --trabalhadores 4 [--porta 8000] [--sem-roteador]
+#      (trabalhadores nas portas seguintes: 8001, 8002...)
+import argparse
+import bisect
+import hashlib
+import os
+import subprocess
+import sys
+import time
+import uuid
+from typing import Dict, List, Optional
+from urllib.parse import parse_qsl
+import httpx
+from partida import JOGO_PADRAO
+from serializacao import dumps
+
+REPLICAS = 160    # nós virtuais por trabalhador: desvio de carga de poucos por cento
+# Cabeçalhos de uma conexão só, que não passam adiante
+SALTO = frozenset((b"connection", b"keep-alive", b"transfer-encoding", b"upgrade", b"host"))
+
+
+def _posicao(chave: str) -> int:
+    return int.from_bytes(hashlib.blake2b(chave.encode(), digest_size=8).digest(), "big")
+
+
+class Anel:
+    def __init__(self, nos: List[str], replicas: int = REPLICAS):
+        if not nos:
+            raise ValueError("O anel precisa de ao menos um trabalhador")
+        pontos = sorted((_posicao(f"{no}#{i}"), no) for no in nos for i in range(replicas))
+        self.nos = list(nos)
+        self.replicas = replicas
+        self._posicoes = [posicao for posicao, _ in pontos]
+        self._donos = [no for _, no in pontos]
+
+    def no(self, chave: str) -> str:
+        indice = bisect.bisect(self._posicoes, _posicao(chave))
+        return self._donos[indice % len(self._donos)]
+
+
+# Partida de uma requisição: /jogos/{id}/... ou ?jogo_id= (também na criação, POST /jogos/)
+def jogo_da_requisicao(caminho: str, parametros: dict) -> str:
+    partes = caminho.split("/", 3)
+    if len(partes) > 3 and partes[1] == "jogos" and partes[2]:
+        return partes[2]
+    return parametros.get("jogo_id") or JOGO_PADRAO
+
+
+def e_criacao(metodo: str, caminho: str) -> bool:
+    return metodo == "POST" and caminho.rstrip("/") == "/jogos"
+
+
+def novo_id() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+class Roteador:
+    # transportes: url -> transporte httpx (nos testes, httpx.ASGITransport de apps em processo)
+    def __init__(self, trabalhadores: List[str], replicas: int = REPLICAS, transportes: Optional[Dict[str, object]] = None):
+        self.anel = Anel(trabalhadores, replicas)
+        transportes = transportes or {}
+        self.clientes = {
+            url: httpx.AsyncClient(base_url=url, transport=transportes.get(url), timeout=None)
+            for url in trabalhadores
+        }
+
+    async def fechar(self):
+        for cliente in self.clientes.values():
+            await cliente.aclose()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._ciclo_de_vida(receive, send)
+        elif scope["type"] == "websocket":
+            # Não encaminhado: o cliente conecta direto no dono (GET /coordenador/dono/)
+            await send({"type": "websocket.close", "code": 4421})
+        else:
+            await self._http(scope, receive, send)
+
+    async def _ciclo_de_vida(self, receive, send):
+        while True:
+            mensagem = await receive()
+            if mensagem["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif mensagem["type"] == "lifespan.shutdown":
+                await self.fechar()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _http(self, scope, receive, send):
+        caminho, metodo = scope["path"], scope["method"]
+        parametros = parse_qsl(scope["query_string"].decode("latin-1"), keep_blank_values=True)
+        consulta = dict(parametros)
+        if caminho.startswith("/coordenador/"):
+            await self._responder(send, 200, self._coordenador(caminho, consulta))
+            return
+        if e_criacao(metodo, caminho) and not consulta.get("jogo_id"):
+            parametros.append(("jogo_id", novo_id()))
+            consulta["jogo_id"] = parametros[-1][1]
+        cliente = self.clientes[self.anel.no(jogo_da_requisicao(caminho, consulta))]
+
+        corpo = b""
+        while True:
+            mensagem = await receive()
+            corpo += mensagem.get("body", b"")
+            if not mensagem.get("more_body"):
+                break
+        # O tamanho do corpo o httpx recalcula
+        cabecalhos = [(nome, valor) for nome, valor in scope["headers"] if nome not in SALTO and nome != b"content-length"]
+        requisicao = cliente.build_request(metodo, caminho, params=parametros, headers=cabecalhos, content=corpo)
+        try:
+            resposta = await cliente.send(requisicao, stream=True)
+        except httpx.TransportError as erro:
+            await self._responder(send, 502, {"detail": f"Trabalhador {cliente.base_url} indisponível: {erro}"})
+            return
+        try:
+            await send({
+                "type": "http.response.start",
+                "status": resposta.status_code,
+                "headers": [(nome, valor) for nome, valor in resposta.headers.raw if nome.lower() not in SALTO],
+            })
+            # Em pedaços: os eventos SSE passam à medida que chegam
+            async for pedaco in resposta.aiter_raw():
+                await send({"type": "http.response.body", "body": pedaco, "more_body": True})
+            await send({"type": "http.response.body", "body": b""})
+        finally:
+            await resposta.aclose()
+
+    def _coordenador(self, caminho: str, consulta: dict) -> dict:
+        if caminho.rstrip("/") == "/coordenador/dono":
+            jogo = consulta.get("jogo_id") or JOGO_PADRAO
+            return {"jogo_id": jogo, "trabalhador": self.anel.no(jogo)}
+        return {"trabalhadores": self.anel.nos, "replicas": self.anel.replicas}
+
+    @staticmethod
+    async def _responder(send, status: int, conteudo: dict):
+        corpo = dumps(conteudo)
+        await send({"type": "http.response.start", "status": status, "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(corpo)).encode())]})
+        await send({"type": "http.response.body", "body": corpo})
+
+
+# Mesma interface de httpx.AsyncClient.request, mas direto no dono de cada partida
+class ClienteRoteado:
+    def __init__(self, trabalhadores: List[str], replicas: int = REPLICAS, **opcoes):
+        self.anel = Anel(trabalhadores, replicas)
+        self.clientes = {url: httpx.AsyncClient(base_url=url, **opcoes) for url in trabalhadores}
+
+    async def request(self, metodo: str, caminho: str, params: Optional[dict] = None, **opcoes):
+        params = dict(params or {})
+        if e_criacao(metodo, caminho) and not params.get("jogo_id"):
+            params["jogo_id"] = novo_id()
+        cliente = self.clientes[self.anel.no(jogo_da_requisicao(caminho, params))]
+        return await cliente.request(metodo, caminho, params=params, **opcoes)
+
+    async def aclose(self):
+        for cliente in self.clientes.values():
+            await cliente.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *erro):
+        await self.aclose()
+
+
+# Sobe `quantidade` processos uvicorn com main:app, nas portas porta_base, porta_base + 1...,
+# todos no mesmo diretório. Só o dono da partida padrão a carrega na partida, e os processos
+# da busca de jogadas (ia.py) são divididos entre eles. Devolve [(url, processo)]
+def iniciar_trabalhadores(quantidade: int, porta_base: int, host: str = "127.0.0.1", diretorio: Optional[str] = None,
+                          replicas: int = REPLICAS, ambiente: Optional[dict] = None, espera: float = 30) -> list:
+    urls = [f"http://{host}:{porta_base + i}" for i in range(quantidade)]
+    dono_padrao = Anel(urls, replicas).no(JOGO_PADRAO)
+    raiz = os.path.dirname(os.path.abspath(__file__))
+    base = dict(os.environ, **(ambiente or {}))
+    base["PYTHONPATH"] = os.pathsep.join(filter(None, (raiz, base.get("PYTHONPATH"))))
+    base.setdefault("WAR_IA_PROCESSOS", str(max(1, (os.cpu_count() or 1) // quantidade)))
+    processos = []
+    for url in urls:
+        variaveis = dict(base, WAR_CARREGAR_PADRAO="1" if url == dono_padrao else "0")
+        comando = [sys.executable, "-m", "uvicorn", "main:app", "--host", host, "--port", url.rsplit(":", 1)[1], "--log-level", "warning"]
+        processos.append((url, subprocess.Popen(comando, cwd=diretorio, env=variaveis)))
+    try:
+        _esperar(processos, espera)
+    except BaseException:
+        parar_trabalhadores(processos)
+        raise
+    return processos
+
+
+def _esperar(processos: list, espera: float):
+    limite = time.monotonic() + espera
+    for url, processo in processos:
+        while True:
+            if processo.poll() is not None:
+                raise RuntimeError(f"Trabalhador {url} saiu com código {processo.returncode}")
+            try:
+                if httpx.get(url + "/saude/", timeout=1).status_code == 200:
+                    break
+            except httpx.TransportError:
+                pass
+            if time.monotonic() > limite:
+                raise TimeoutError(f"Trabalhador {url} não respondeu em {espera}s")
+            time.sleep(0.05)
+
+
+# SIGTERM: o uvicorn faz o shutdown do app (descarrega as filas de gravação e fecha as partidas)
+def parar_trabalhadores(processos: list, espera: float = 30):
+    for _, processo in processos:
+        if processo.poll() is None:
+            processo.terminate()
+    for _, processo in processos:
+        try:
+            processo.wait(espera)
+        except subprocess.TimeoutExpired:
+            processo.kill()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sobe vários trabalhadores do jogo, com as partidas divididas entre eles")
+    parser.add_argument("--trabalhadores", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8000, help="porta do roteador; os trabalhadores usam as seguintes")
+    parser.add_argument("--sem-roteador", action="store_true", help="só os trabalhadores (clientes roteiam com o Anel)")
+    args = parser.parse_args()
+
+    processos = iniciar_trabalhadores(args.trabalhadores, args.porta + 1, args.host)
+    urls = [url for url, _ in processos]
+    print("trabalhadores:", " ".join(urls))
+    try:
+        if args.sem_roteador:
+            while all(processo.poll() is None for _, processo in processos):
+                time.sleep(1)
+        else:
+            import uvicorn
+            uvicorn.run(Roteador(urls), host=args.host, port=args.porta, log_level="warning")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        parar_trabalhadores(processos)
@@ -0,0 +1,89 @@
+# diario.py
+# Sorteios reproduzíveis e diário de ações de uma partida.
+# Fluxos: um random.Random por fluxo, todos derivados da semente da partida. O fluxo da
+# partida é usado pelas ações exclusivas (ordem, territórios); o de cada jogador pelas
+# ações que seguram a trava dele (dados do ataque, objetivo, cartas). Cada fluxo só é
+# usado sob a sua trava, então a sequência de sorteios de cada um não depende de como as
+# threads se intercalam, e nenhuma ação disputa um gerador global.
+# Diario: uma linha JSON por ação executada, gravada com as travas da ação ainda seguras
+# (a ordem do arquivo é a ordem em que as ações tocaram cada jogador). Cada carga da
+# partida abre um segmento com uma semente nova; reproducao.py refaz a partida a partir daí.
+import os
+import random
+import secrets
+import threading
+from serializacao import dumps
+
+PARTIDA = "partida"
+
+
+class Fluxos:
+    def __init__(self, semente: int = None):
+        self.semente = semente if semente is not None else secrets.randbits(63)
+        self._fluxos = {}
+
+    def de(self, nome: str = PARTIDA) -> random.Random:
+        fluxo = self._fluxos.get(nome)
+        if fluxo is None:
+            # Semente em texto: o Random usa o SHA-512 dela, igual em qualquer processo
+            fluxo = self._fluxos.setdefault(nome, random.Random(f"{self.semente}:{nome}"))
+        return fluxo
+
+
+class Diario:
+    def __init__(self, caminho: str):
+        self.caminho = caminho
+        self.acoes = 0
+        self._arquivo = None
+        self._trava = threading.Lock()
+        self._dentro = threading.local()
+
+    @property
+    def existe(self) -> bool:
+        return os.path.exists(self.caminho)
+
+    # Primeira linha do segmento: a semente dos fluxos e, se o diário começa com a partida
+    # já em andamento (partida anterior ao diário), o estado de onde a reprodução parte:
+    # os jogadores e o estado da partida fora deles (ex.: total de trocas)
+    def abrir(self, semente: int, estado: list = None, partida: dict = None):
+        cabecalho = {"semente": semente}
+        if estado is not None:
+            cabecalho["estado"] = estado
+            cabecalho["partida"] = partida or {}
+        with self._trava:
+            self._arquivo = open(self.caminho, "ab")
+            self._escrever(cabecalho)
+
+    # Ações chamadas por outra ação (as do lote) não entram no diário: a de fora já entrou
+    @property
+    def aninhada(self) -> bool:
+        return getattr(self._dentro, "ativo", False)
+
+    def entrar(self) -> bool:
+        if self.aninhada:
+            return False
+        self._dentro.ativo = True
+        return True
+
+    def sair(self):
+        self._dentro.ativo = False
+
+    def registrar(self, acao: str, parametros: dict, erro: str = None):
+        entrada = {"acao": acao, "parametros": parametros}
+        if erro is not None:
+            entrada["erro"] = erro
+        with self._trava:
+            if self._arquivo is not None:
+                self._escrever(entrada)
+                self.acoes += 1
+
+    def fechar(self):
+        with self._trava:
+            if self._arquivo is not None:
+                self._arquivo.close()
+                self._arquivo = None
+
+    # Sem fsync: o diário serve para depuração e reprodução, o estado durável é o da persistência
+    def _escrever(self, entrada: dict):
+        self._arquivo.write(dumps(entrada) + b"\n")
+        self._arquivo.flush()
@@ -0,0 +1,111 @@
+# eventos.py
+# Eventos da partida empurrados para espectadores (WebSocket / Server-Sent Events), no mesmo
+# padrão Observer de PadrãoObserverMarcelo/jogo.py: a Transmissao de cada partida é o sujeito
+# (adicionar_observador, remover_observador, notificar_observadores) e cada conexão é um
+# observador com um buffer de envio limitado. O evento é codificado uma vez só, não por conexão.
+import asyncio
+import itertools
+import threading
+from collections import deque
+from metricas import ENTREGAS, EVENTOS
+from serializacao import dumps_str
+
+# Tipos de evento enviados aos espectadores
+TIPOS = (
+    "jogador_adicionado", "jogador_removido", "cor_escolhida", "objetivo_recebido", "ordem_definida",
+    "territorios_distribuidos", "exercitos_distribuidos", "rodada_iniciada", "ataque", "conquista", "objetivo_concluido", "carta_recebida",
+    "cartas_trocadas",
+)
+
+
+class Evento:
+    __slots__ = ("seq", "tipo", "json", "_sse")
+
+    def __init__(self, seq: int, tipo: str, jogo_id: str, dados: dict):
+        self.seq = seq
+        self.tipo = tipo
+        self.json = dumps_str({"seq": seq, "tipo": tipo, "jogo": jogo_id, "dados": dados})
+        self._sse = None
+
+    # Quadro SSE, montado na primeira conexão SSE que precisar dele
+    @property
+    def sse(self) -> str:
+        if self._sse is None:
+            self._sse = f"id: {self.seq}\nevent: {self.tipo}\ndata: {self.json}\n\n"
+        return self._sse
+
+
+# Buffer de envio de uma conexão: quem publica nunca espera; se o cliente não acompanha,
+# os eventos mais antigos são descartados (o cliente percebe o salto pelo seq)
+class Conexao:
+    def __init__(self, tamanho: int = 256):
+        self.fila = deque(maxlen=tamanho)
+        self.descartados = 0
+        self._sinal = asyncio.Event()
+
+    def atualizar(self, evento: Evento):
+        if len(self.fila) == self.fila.maxlen:
+            self.descartados += 1
+        self.fila.append(evento)
+        self._sinal.set()
+
+    # Espera o próximo evento e devolve todos os que estão no buffer
+    async def proximos(self) -> list:
+        while not self.fila:
+            self._sinal.clear()
+            await self._sinal.wait()
+        lote = list(self.fila)
+        self.fila.clear()
+        return lote
+
+
+class Transmissao:
+    def __init__(self, jogo_id: str, tamanho_buffer: int = 256):
+        self.jogo_id = jogo_id
+        self.tamanho_buffer = tamanho_buffer
+        self.observadores = set()
+        self._seq = itertools.count(1)
+        self._loop = None
+        self._trava = threading.Lock()
+
+    # Guarda o loop das conexões (chamar de dentro dele): as rotas síncronas rodam no
+    # threadpool e entregam os eventos ao loop com call_soon_threadsafe
+    def iniciar(self):
+        self._loop = asyncio.get_running_loop()
+
+    def conectar(self) -> Conexao:
+        self.iniciar()
+        conexao = Conexao(self.tamanho_buffer)
+        self.adicionar_observador(conexao)
+        return conexao
+
+    def adicionar_observador(self, observador):
+        with self._trava:
+            self.observadores = self.observadores | {observador}
+
+    def remover_observador(self, observador):
+        with self._trava:
+            self.observadores = self.observadores - {observador}
+
+    def notificar_observadores(self, tipo: str, **dados):
+        if not self.observadores:
+            return
+        try:
+            no_loop = asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            no_loop = False
+        # Ações de jogadores diferentes publicam em paralelo: o seq e o envio ao loop ficam
+        # sob a trava para os eventos chegarem na ordem do seq
+        with self._trava:
+            evento = Evento(next(self._seq), tipo, self.jogo_id, dados)
+            if no_loop or self._loop is None:
+                self._distribuir(evento)
+            elif not self._loop.is_closed():
+                self._loop.call_soon_threadsafe(self._distribuir, evento)
+
+    def _distribuir(self, evento: Evento):
+        observadores = self.observadores
+        for observador in observadores:
+            observador.atualizar(evento)
+        EVENTOS.inc()
+        ENTREGAS.inc(len(observadores))
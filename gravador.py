@@ -0,0 +1,149 @@
+# gravador.py
+# Gravação assíncrona: as rotas só enfileiram registros; uma tarefa asyncio por partida
+# junta as rajadas de mutações e grava tudo com um único registrar_lote (um fsync).
+import asyncio
+import threading
+from typing import List
+
+# "imediata": a resposta só sai depois do flush (group commit)
+# "atrasada": a resposta sai logo; o flush acontece em até atraso_ms
+# "direta": grava dentro da própria rota, sem fila (comportamento anterior)
+DURABILIDADES = ("imediata", "atrasada", "direta")
+# Depois de uma gravação que falhou, nova tentativa em ESPERA_MINIMA s, dobrando a cada
+# falha seguida até ESPERA_MAXIMA s
+ESPERA_MINIMA = 0.05
+ESPERA_MAXIMA = 5.0
+
+
+class Gravador:
+    def __init__(self, persistencia, durabilidade: str = "imediata", atraso_ms: float = 5):
+        if durabilidade not in DURABILIDADES:
+            raise ValueError(f"Durabilidade inválida: {durabilidade}")
+        self.persistencia = persistencia
+        self.durabilidade = durabilidade
+        self.atraso = atraso_ms / 1000
+        self.enfileirados = 0
+        self.gravados = 0
+        self._pendentes = []
+        self._trava = threading.Lock()
+        self._loop = None
+        self._evento = None
+        self._tarefa = None
+        self._parando = False
+        self._esperando = []
+        self._falhas = 0
+        self._nova_tentativa = None
+
+    @property
+    def ativo(self) -> bool:
+        return self._tarefa is not None
+
+    # Precisa ser chamado de dentro do event loop (ex.: na dependência da rota)
+    def iniciar(self):
+        if self.durabilidade == "direta":
+            return
+        loop = asyncio.get_running_loop()
+        if self._tarefa is not None:
+            if self._loop is loop:
+                return
+            # O loop anterior foi encerrado (ex.: novo TestClient): grava o que sobrou e recomeça
+            with self._trava:
+                lote, self._pendentes = self._pendentes, []
+            self.persistencia.registrar_lote(lote)
+            self.gravados = self.enfileirados
+            self._esperando = []
+        self._parando = False
+        self._loop = loop
+        self._evento = asyncio.Event()
+        self._tarefa = self._loop.create_task(self._executar())
+
+    # Chamado pelas rotas (na threadpool); sem tarefa ativa grava na hora
+    def registrar_lote(self, registros: List[dict]):
+        if not registros:
+            return
+        if self._tarefa is None:
+            # O que sobrou de um parar() com erro vai antes, na ordem em que chegou
+            with self._trava:
+                lote = self._pendentes + list(registros)
+                self.persistencia.registrar_lote(lote)
+                self._pendentes = []
+            return
+        with self._trava:
+            self._pendentes.extend(registros)
+            self.enfileirados += len(registros)
+        self._loop.call_soon_threadsafe(self._evento.set)
+
+    # Espera até que tudo o que já foi enfileirado esteja no disco (só no modo imediato)
+    async def confirmar(self):
+        if self._tarefa is None or self.durabilidade != "imediata":
+            return
+        await self.descarregar()
+
+    async def descarregar(self):
+        alvo = self.enfileirados
+        if self._tarefa is None or self.gravados >= alvo:
+            return
+        futuro = self._loop.create_future()
+        self._esperando.append((alvo, futuro))
+        self._evento.set()
+        await futuro
+
+    async def parar(self):
+        if self._tarefa is None:
+            return
+        self._parando = True
+        self._evento.set()
+        if self._nova_tentativa is not None:
+            self._nova_tentativa.cancel()
+        # Mesmo se a última gravação falhar: sem tarefa, as próximas vão direto à persistência
+        try:
+            await self._tarefa
+        finally:
+            self._tarefa = None
+
+    async def _executar(self):
+        while True:
+            await self._evento.wait()
+            if self.durabilidade == "atrasada" and not self._parando:
+                await asyncio.sleep(self.atraso)  # janela para juntar mais mutações
+            self._evento.clear()
+            with self._trava:
+                lote, self._pendentes = self._pendentes, []
+                alvo = self.enfileirados
+            erro = None
+            if lote:
+                try:
+                    await asyncio.to_thread(self.persistencia.registrar_lote, lote)
+                except Exception as e:
+                    # Sem o quadro desta tarefa no traceback: quem recebe o erro (confirmar)
+                    # pode limpar os quadros dele, e isso encerraria a corrotina ainda viva
+                    erro = e.with_traceback(e.__traceback__.tb_next)
+                    with self._trava:
+                        self._pendentes[:0] = lote
+            if erro is None:
+                self.gravados = alvo
+                self._falhas = 0
+            elif not self._parando:
+                # O lote voltou para a fila: tenta de novo mesmo sem mutações novas chegando
+                espera = min(max(self.atraso, ESPERA_MINIMA) * 2 ** self._falhas, ESPERA_MAXIMA)
+                self._falhas += 1
+                self._nova_tentativa = self._loop.call_later(espera, self._evento.set)
+            self._avisar(erro)
+            if self._parando:
+                if erro is not None:
+                    raise erro
+                if not self._pendentes:
+                    return
+
+    def _avisar(self, erro):
+        restantes = []
+        for alvo, futuro in self._esperando:
+            if futuro.done():
+                continue
+            if erro is not None:
+                futuro.set_exception(erro)
+            elif alvo <= self.gravados:
+                futuro.set_result(None)
+            else:
+                restantes.append((alvo, futuro))
+        self._esperando = restantes
@@ -0,0 +1,481 @@
+# ia.py
+# Jogador artificial: MCTS (UCT) sobre as jogadas de um turno, no modelo do motor.py (exércitos
+# por território, dados pelas probabilidades exatas de motor.LIMIARES). Jogadas:
+#   reforço:  todos os exércitos da reserva num território da fronteira
+#   ataque:   atacar de origem para destino até conquistar ou a origem ficar com 1; ou parar
+#   movimento (fim do turno): levar os exércitos de um território do interior para a fronteira
+# O valor de uma folha é uma avaliação heurística no fim do turno (objetivo, territórios,
+# continentes, exércitos, fronteira exposta); o resto do turno é completado por uma política
+# rápida. A árvore é uma tabela estado -> nó (ataques têm resultado sorteado: o mesmo estado
+# pode aparecer por caminhos diferentes) e fica entre as buscas com a mesma chave: depois de
+# uma jogada, a próxima busca começa de estados que já têm visitas.
+# A busca tem prazo: cada iteração confere o relógio. Com processos > 1 cada processo do pool
+# busca na própria árvore e as visitas das jogadas da raiz são somadas (paralelismo na raiz).
+import math
+import os
+import random
+import time
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from mapa import BONUS_CONTINENTE, Mapa
+from motor import LIMIARES
+
+SEM_DONO = -1
+REFORCO, ATAQUE, MOVIMENTO, FIM = range(4)
+PARAR = (ATAQUE,)
+FICAR = (MOVIMENTO,)
+
+
+def e_ataque(jogada: tuple) -> bool:
+    return jogada[0] == ATAQUE and len(jogada) == 3
+
+# Jogadas consideradas em cada nó (as mais promissoras pela heurística de ordenação)
+LARGURA_REFORCO = 6
+LARGURA_ATAQUE = 10
+LARGURA_MOVIMENTO = 4
+MAX_ATAQUES_POR_TURNO = 30
+# Exércitos por território no modelo da busca (ataques com milhões de exércitos rolariam para sempre)
+MAX_EXERCITOS = 1000
+EXPLORACAO = 0.7
+MAX_NOS = 200_000       # nós por árvore; passou disso, a árvore recomeça
+MAX_ARVORES = 64        # árvores guardadas (chaves mais recentes)
+
+
+# Parte fixa da partida durante a busca: mapa, continentes e metas dos objetivos (objetivos.Meta)
+class Contexto:
+    def __init__(self, mapa: Mapa, metas: list):
+        self.mapa = mapa
+        self.metas = metas
+        self.mascaras = [(nome, sum(1 << t for t in membros)) for nome, membros in mapa.continentes.items()]
+        self.bonus = {nome: BONUS_CONTINENTE.get(nome, 1) for nome in mapa.continentes}
+        self.bonus_total = sum(self.bonus.values()) or 1
+
+
+class Situacao:
+    __slots__ = ("dono", "exercitos", "jogador", "fase", "reforcos", "ataques", "eliminou", "venceu")
+
+    def __init__(self, dono: array, exercitos: array, jogador: int, reforcos: int, eliminou: bool = False):
+        self.dono = dono                # array("b"): índice do jogador por território
+        self.exercitos = exercitos      # array("i"): exércitos por território
+        self.jogador = jogador          # quem joga o turno (e para quem a busca joga)
+        self.fase = REFORCO if reforcos else ATAQUE
+        self.reforcos = reforcos
+        self.ataques = 0
+        self.eliminou = eliminou
+        self.venceu = False
+
+    def copia(self) -> "Situacao":
+        copia = object.__new__(Situacao)
+        copia.dono = self.dono[:]
+        copia.exercitos = self.exercitos[:]
+        copia.jogador = self.jogador
+        copia.fase = self.fase
+        copia.reforcos = self.reforcos
+        copia.ataques = self.ataques
+        copia.eliminou = self.eliminou
+        copia.venceu = self.venceu
+        return copia
+
+    def chave(self) -> tuple:
+        return (self.fase, self.reforcos, self.ataques, self.eliminou, self.dono.tobytes(), self.exercitos.tobytes())
+
+
+# Do estado de uma Partida do servidor, que guarda um total de exércitos por jogador: como em
+# TabuleiroCompacto.de_jogadores, cada território recebe 1; a reserva de quem joga vira o reforço
+# e a dos adversários é espalhada pelos territórios deles (é o que defende)
+def da_partida(partida, jogador: str) -> tuple:
+    mapa = partida.tabuleiro.mapa
+    nomes = [j.nome for j in partida.jogadores]
+    indice = {nome: i for i, nome in enumerate(nomes)}
+    dono = array("b", [indice.get(partida.tabuleiro.dono(t), SEM_DONO) for t in mapa.territorios])
+    exercitos = array("i", [0 if d == SEM_DONO else 1 for d in dono])
+    reforcos = 0
+    for i, j in enumerate(partida.jogadores):
+        territorios = [t for t, d in enumerate(dono) if d == i]
+        reserva = max(0, j.exercitos - len(territorios))
+        if j.nome == jogador:
+            reforcos = min(reserva, MAX_EXERCITOS)
+        elif territorios:
+            for k, t in enumerate(territorios):
+                exercitos[t] = min(MAX_EXERCITOS, 1 + reserva // len(territorios) + (k < reserva % len(territorios)))
+    metas = [partida.objetivos.metas.get(nome) for nome in nomes]
+    situacao = Situacao(dono, exercitos, indice[jogador], reforcos, jogador in partida.objetivos.eliminou)
+    return situacao, Contexto(mapa, metas)
+
+
+def jogadas(s: Situacao, ctx: Contexto) -> list:
+    dono, exercitos, jogador, vizinhos = s.dono, s.exercitos, s.jogador, ctx.mapa.vizinhos
+    if s.fase == REFORCO:
+        # Fronteira mais pressionada primeiro: exércitos inimigos vizinhos menos os do território
+        fronteira, interior = [], []
+        for t, d in enumerate(dono):
+            if d != jogador:
+                continue
+            inimigos = 0
+            for v in vizinhos[t]:
+                if dono[v] != jogador and dono[v] != SEM_DONO:
+                    inimigos += exercitos[v]
+            (fronteira if inimigos else interior).append((exercitos[t] - inimigos, t))
+        fronteira.sort()
+        return [(REFORCO, t) for _, t in (fronteira or interior)[:LARGURA_REFORCO]]
+    if s.fase == ATAQUE:
+        if s.ataques >= MAX_ATAQUES_POR_TURNO:
+            return [PARAR]
+        ataques = [
+            ((exercitos[t] - 1) / exercitos[v], t, v)
+            for t, d in enumerate(dono) if d == jogador and exercitos[t] > 1
+            for v in vizinhos[t] if dono[v] != jogador and dono[v] != SEM_DONO
+        ]
+        ataques.sort(reverse=True)
+        return [(ATAQUE, t, v) for _, t, v in ataques[:LARGURA_ATAQUE]] + [PARAR]
+    if s.fase == MOVIMENTO:
+        movimentos = []
+        for t, d in enumerate(dono):
+            if d != jogador or exercitos[t] < 2:
+                continue
+            if any(dono[v] != jogador and dono[v] != SEM_DONO for v in vizinhos[t]):
+                continue
+            destinos = [v for v in vizinhos[t] if any(dono[w] != jogador and dono[w] != SEM_DONO for w in vizinhos[v])]
+            if destinos:
+                movimentos.append((exercitos[t], t, destinos[0]))
+        movimentos.sort(reverse=True)
+        return [FICAR] + [(MOVIMENTO, t, v, n - 1) for n, t, v in movimentos[:LARGURA_MOVIMENTO]]
+    return []
+
+
+def aplicar(s: Situacao, jogada: tuple, ctx: Contexto, rng: random.Random):
+    fase = jogada[0]
+    if fase == REFORCO:
+        s.exercitos[jogada[1]] += s.reforcos
+        s.reforcos = 0
+        s.fase = ATAQUE
+    elif fase == ATAQUE:
+        if len(jogada) == 1:
+            s.fase = MOVIMENTO
+        else:
+            s.ataques += 1
+            _atacar(s, jogada[1], jogada[2], ctx, rng)
+    elif len(jogada) == 1:
+        s.fase = FIM
+    else:
+        _, origem, destino, quantidade = jogada
+        s.exercitos[origem] -= quantidade
+        s.exercitos[destino] += quantidade
+        s.fase = FIM
+
+
+# Ataca até conquistar ou a origem ficar com 1 (mesma rolagem e ocupação de motor.rolar/_atacar)
+def _atacar(s: Situacao, origem: int, destino: int, ctx: Contexto, rng: random.Random):
+    exercitos = s.exercitos
+    ataque, defesa = exercitos[origem], exercitos[destino]
+    dados = 0
+    aleatorio = rng.random
+    while ataque > 1 and defesa > 0:
+        dados = 3 if ataque > 3 else ataque - 1
+        defendem = 2 if defesa > 1 else 1
+        zero, ate_um = LIMIARES[dados, defendem]
+        sorteio = aleatorio()
+        vitorias = 0 if sorteio < zero else (1 if sorteio < ate_um else 2)
+        defesa -= vitorias
+        ataque -= (dados if dados < defendem else defendem) - vitorias
+    if defesa > 0:
+        exercitos[origem], exercitos[destino] = ataque, defesa
+        return
+    ocupacao = min(dados, ataque - 1)
+    defensor = s.dono[destino]
+    s.dono[destino] = s.jogador
+    exercitos[origem], exercitos[destino] = ataque - ocupacao, ocupacao
+    if defensor not in s.dono:
+        s.eliminou = True
+    meta = ctx.metas[s.jogador]
+    if meta is None:
+        return
+    if not (meta.eliminar or meta.territorios):
+        # Meta de continentes: só muda quando o continente do território conquistado se completa
+        continente = ctx.mapa.continente_de[destino]
+        if continente is None or any(s.dono[t] != s.jogador for t in ctx.mapa.continentes[continente]):
+            return
+    if cumpriu(s, ctx):
+        s.venceu = True
+        s.fase = FIM
+
+
+def _mascara(s: Situacao) -> int:
+    jogador = s.jogador
+    return sum(1 << t for t, d in enumerate(s.dono) if d == jogador)
+
+
+# Continentes completos: teste de bits contra a máscara dos territórios do jogador
+def _completos(mascara: int, ctx: Contexto) -> list:
+    return [nome for nome, membros in ctx.mascaras if mascara & membros == membros]
+
+
+def cumpriu(s: Situacao, ctx: Contexto) -> bool:
+    meta = ctx.metas[s.jogador]
+    if meta is None:
+        return False
+    if meta.eliminar:
+        return s.eliminou
+    if meta.territorios:
+        return s.dono.count(s.jogador) >= meta.territorios
+    completos = _completos(_mascara(s), ctx)
+    return meta.continentes.issubset(completos) and len(completos) >= len(meta.continentes) + meta.continentes_extras
+
+
+# Quanto falta para o objetivo, de 0 a 1
+def _progresso(s: Situacao, ctx: Contexto, mascara: int, proprios: int) -> float:
+    meta = ctx.metas[s.jogador]
+    if meta is None:
+        return 0.0
+    if meta.eliminar:
+        return 1.0 if s.eliminou else 0.0
+    if meta.territorios:
+        return min(1.0, proprios / meta.territorios)
+    necessarios = len(meta.continentes) + meta.continentes_extras
+    if not necessarios:
+        return 0.0
+    # Fração de cada continente; os exigidos pelo nome vêm antes dos outros
+    parciais = sorted(
+        ((nome in meta.continentes, (mascara & membros).bit_count() / membros.bit_count()) for nome, membros in ctx.mascaras),
+        reverse=True,
+    )
+    return sum(fracao for _, fracao in parciais[:necessarios]) / necessarios
+
+
+# Valor do fim do turno para quem joga, entre 0 e 1. Territórios sem dono têm 0 exércitos,
+# então não pesam na exposição
+def avaliar(s: Situacao, ctx: Contexto) -> float:
+    if s.venceu:
+        return 1.0
+    dono, exercitos, jogador, vizinhos = s.dono, s.exercitos, s.jogador, ctx.mapa.vizinhos
+    proprios = [t for t, d in enumerate(dono) if d == jogador]
+    if not proprios:
+        return 0.0
+    mascara = meus = exposicao = 0
+    for t in proprios:
+        mascara |= 1 << t
+        proprio = exercitos[t]
+        meus += proprio
+        inimigos = 0
+        for v in vizinhos[t]:
+            if dono[v] != jogador and exercitos[v] > inimigos:
+                inimigos = exercitos[v]
+        if inimigos > proprio:
+            exposicao += inimigos - proprio
+    bonus = sum(ctx.bonus[nome] for nome in _completos(mascara, ctx)) / ctx.bonus_total
+    return (
+        0.3 * _progresso(s, ctx, mascara, len(proprios))
+        + 0.25 * len(proprios) / len(dono)
+        + 0.2 * meus / sum(exercitos)
+        + 0.15 * bonus
+        + 0.1 * (1.0 - min(1.0, exposicao / meus))
+    )
+
+
+# Política rápida para terminar o turno: reforça a fronteira mais pressionada e ataca em
+# cadeia a partir do maior exército da fronteira, sempre no vizinho inimigo mais fraco, enquanto
+# tiver vantagem clara; não move. Só olha os vizinhos de onde está (é o que mais pesa no rollout)
+def completar(s: Situacao, ctx: Contexto, rng: random.Random):
+    if s.fase == REFORCO:
+        aplicar(s, jogadas(s, ctx)[0], ctx, rng)
+    if s.fase == ATAQUE:
+        dono, exercitos, jogador, vizinhos = s.dono, s.exercitos, s.jogador, ctx.mapa.vizinhos
+        origem, maior = None, 1
+        for t, d in enumerate(dono):
+            if d == jogador and exercitos[t] > maior and any(dono[v] != jogador and dono[v] != SEM_DONO for v in vizinhos[t]):
+                origem, maior = t, exercitos[t]
+        while origem is not None and s.ataques < MAX_ATAQUES_POR_TURNO:
+            alvos = [(exercitos[v], v) for v in vizinhos[origem] if dono[v] != jogador and dono[v] != SEM_DONO]
+            if not alvos:
+                break
+            defesa, destino = min(alvos)
+            if exercitos[origem] - 1 < 1.5 * defesa:
+                break
+            s.ataques += 1
+            _atacar(s, origem, destino, ctx, rng)
+            if s.venceu or dono[destino] != jogador:
+                break
+            if exercitos[destino] > exercitos[origem]:
+                origem = destino
+    if s.fase != FIM:
+        s.fase = FIM
+
+
+class No:
+    __slots__ = ("jogadas", "visitas", "valores", "total")
+
+    def __init__(self, jogadas: list):
+        self.jogadas = jogadas
+        self.visitas = [0] * len(jogadas)
+        self.valores = [0.0] * len(jogadas)
+        self.total = 0
+
+    # UCT: média + EXPLORACAO * sqrt(ln(total) / visitas); jogadas ainda não visitadas antes
+    def escolher(self) -> int:
+        visitas = self.visitas
+        if 0 in visitas:
+            return visitas.index(0)
+        c = EXPLORACAO * math.sqrt(math.log(self.total))
+        raiz = math.sqrt
+        pontos = [v / n + c / raiz(n) for v, n in zip(self.valores, visitas)]
+        return pontos.index(max(pontos))
+
+    def mais_visitada(self) -> int:
+        return max(range(len(self.visitas)), key=self.visitas.__getitem__)
+
+
+NOVO = object()
+
+
+class Arvore:
+    def __init__(self, max_nos: int = MAX_NOS):
+        self.nos = {}
+        self.max_nos = max_nos
+
+    # Iterações até o prazo (time.monotonic) ou até `iteracoes`; devolve quantas fez
+    def buscar(self, raiz: Situacao, ctx: Contexto, prazo: float, rng: random.Random, iteracoes: int = None) -> int:
+        if len(self.nos) > self.max_nos:
+            self.nos.clear()
+        nos = self.nos
+        feitas = 0
+        relogio = time.monotonic
+        while relogio() < prazo and (iteracoes is None or feitas < iteracoes):
+            s = raiz.copia()
+            caminho = []
+            while s.fase != FIM:
+                chave = s.chave()
+                no = nos.get(chave, NOVO)
+                if no is NOVO:
+                    # Estado novo: só o rollout. A maioria (depois de um ataque) nunca se repete,
+                    # então as jogadas só são montadas na segunda visita
+                    nos[chave] = None
+                    completar(s, ctx, rng)
+                    break
+                if no is None:
+                    no = nos[chave] = No(jogadas(s, ctx))
+                i = no.escolher()
+                caminho.append((no, i))
+                aplicar(s, no.jogadas[i], ctx, rng)
+            valor = avaliar(s, ctx)
+            for no, i in caminho:
+                no.total += 1
+                no.visitas[i] += 1
+                no.valores[i] += valor
+            feitas += 1
+        return feitas
+
+    # Visitas e soma dos valores de cada jogada da raiz
+    def raiz(self, raiz: Situacao) -> dict:
+        no = self.nos.get(raiz.chave())
+        if no is None:
+            return {}
+        return {jogada: (n, v) for jogada, n, v in zip(no.jogadas, no.visitas, no.valores)}
+
+    # Jogadas mais visitadas da raiz em diante, começando por `primeira`, até o primeiro
+    # ataque (depois dele o estado depende dos dados) ou o fim do turno
+    def plano(self, raiz: Situacao, ctx: Contexto, primeira: tuple) -> list:
+        s = raiz.copia()
+        plano = [primeira]
+        while not e_ataque(plano[-1]):
+            aplicar(s, plano[-1], ctx, None)
+            no = self.nos.get(s.chave()) if s.fase != FIM else None
+            if no is None or not no.total:
+                break
+            plano.append(no.jogadas[no.mais_visitada()])
+        return plano
+
+
+# Árvores de cada processo, por chave (ex. (partida, jogador)), das mais recentes
+_arvores = OrderedDict()
+
+
+def _arvore(chave) -> Arvore:
+    arvore = _arvores.pop(chave, None) or Arvore()
+    _arvores[chave] = arvore
+    while len(_arvores) > MAX_ARVORES:
+        _arvores.popitem(last=False)
+    return arvore
+
+
+# Executado em cada processo do pool (ou no próprio processo)
+def _buscar(chave, raiz: Situacao, ctx: Contexto, prazo: float, semente: int, iteracoes: int = None) -> tuple:
+    arvore = _arvore(chave)
+    iteracoes = arvore.buscar(raiz, ctx, prazo, random.Random(semente), iteracoes)
+    estatisticas = arvore.raiz(raiz)
+    planos = {jogada: arvore.plano(raiz, ctx, jogada) for jogada in estatisticas}
+    return iteracoes, estatisticas, planos
+
+
+class Conselheiro:
+    # processos: buscas em paralelo (None = um por CPU; 1 = no processo atual, sem pool)
+    def __init__(self, processos: int = None):
+        self.processos = processos or os.cpu_count() or 1
+        self._executor = None
+
+    # iteracoes: limite de rollouts por processo, além do prazo de `tempo` segundos
+    def sugerir(self, raiz: Situacao, ctx: Contexto, tempo: float, chave=None, semente: int = None, iteracoes: int = None) -> dict:
+        inicio = time.monotonic()
+        prazo = inicio + tempo
+        semente = random.randrange(2**32) if semente is None else semente
+        if self.processos == 1:
+            resultados = [_buscar(chave, raiz, ctx, prazo, semente, iteracoes)]
+        else:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(self.processos)
+            futuros = [self._executor.submit(_buscar, chave, raiz, ctx, prazo, semente + i, iteracoes) for i in range(self.processos)]
+            resultados = [futuro.result() for futuro in futuros]
+        visitas, valores, planos = {}, {}, {}
+        for _, estatisticas, planos_do_processo in resultados:
+            for jogada, (n, v) in estatisticas.items():
+                if n > visitas.get(jogada, -1):
+                    planos[jogada] = planos_do_processo[jogada]
+                visitas[jogada] = visitas.get(jogada, 0) + n
+                valores[jogada] = valores.get(jogada, 0.0) + v
+        iteracoes = sum(r[0] for r in resultados)
+        duracao = time.monotonic() - inicio
+        melhor = max(visitas, key=visitas.get) if visitas else None
+        return {
+            "plano": planos[melhor] if melhor else [],
+            "jogadas": sorted(((j, visitas[j], valores[j] / visitas[j] if visitas[j] else 0.0) for j in visitas), key=lambda x: -x[1]),
+            "rollouts": iteracoes,
+            "duracao_s": duracao,
+            "rollouts_por_s": iteracoes / duracao if duracao else 0.0,
+        }
+
+    def fechar(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+
+# Jogada em nomes de territórios; ataque e movimento no formato de POST /rodada/lote/
+def descrever(jogada: tuple, s: Situacao, ctx: Contexto, nomes: list) -> dict:
+    territorios = ctx.mapa.territorios
+    jogador = nomes[s.jogador]
+    if jogada[0] == REFORCO:
+        return {"tipo": "reforco", "territorio": territorios[jogada[1]], "exercitos": s.reforcos}
+    if jogada == PARAR:
+        return {"tipo": "parar"}
+    if jogada == FICAR:
+        return {"tipo": "fim_do_turno"}
+    if jogada[0] == ATAQUE:
+        _, origem, destino = jogada
+        return {"tipo": "ataque", "acao": "ataque", "parametros": {
+            "jogador_atacante": jogador, "territorio_atacante": territorios[origem],
+            "jogador_defensor": nomes[s.dono[destino]], "territorio_defensor": territorios[destino],
+        }}
+    _, origem, destino, quantidade = jogada
+    return {"tipo": "movimento", "acao": "mover-exercitos", "parametros": {
+        "jogador": jogador, "origem": territorios[origem], "destino": territorios[destino], "quantidade": quantidade,
+    }}
+
+
+def descrever_plano(plano: list, raiz: Situacao, ctx: Contexto, nomes: list) -> list:
+    s = raiz.copia()
+    descricao = []
+    for jogada in plano:
+        descricao.append(descrever(jogada, s, ctx, nomes))
+        if not e_ataque(jogada):
+            aplicar(s, jogada, ctx, None)
+    return descricao
@@ -21,6 +21,8 @@ class Jogador:
             self.exercitos -= quantidade
             
 
-    def verificar_objetivo(self):
-       
-        pass
+    # acompanhamento: objetivos.Acompanhamento da partida, com os contadores já atualizados
+    def verificar_objetivo(self, acompanhamento=None):
+        if acompanhamento is None:
+            return False
+        return acompanhamento.cumpriu(self.nome)
@@ -1,9 +1,12 @@
-import json
 import random
+from cartas import POR_TIPO
 from jogador import Jogador
+from serializacao import dumps_str
 
 class Jogo:
-    def __init__(self):
+    # rng: instância de random.Random para partidas reproduzíveis (padrão: módulo random)
+    def __init__(self, rng=None):
+        self.rng = rng if rng is not None else random
         self.jogadores = []
         self.territorios = ["Território1", "Território2", "Território3", "Território4", "Território5", "Território6"]
         self.objetivos = [
@@ -23,26 +26,30 @@ class Jogo:
         self.jogadores.append(jogador)
 
     def definir_ordem_jogadores(self):
-        self.ordem_jogadores = random.sample(self.jogadores, len(self.jogadores))
+        self.ordem_jogadores = self.rng.sample(self.jogadores, len(self.jogadores))
 
     def distribuir_territorios(self):
-        random.shuffle(self.territorios)
+        self.rng.shuffle(self.territorios)
         for i, jogador in enumerate(self.jogadores):
             jogador.receber_territorios(self.territorios[i::len(self.jogadores)])
 
     def distribuir_objetivos(self):
         for jogador in self.jogadores:
-            jogador.receber_objetivo(random.choice(self.objetivos))
+            jogador.receber_objetivo(self.rng.choice(self.objetivos))
 
     def iniciar_rodada(self):
         for jogador in self.jogadores:
             jogador.distribuir_exercitos(5) 
 
+    # Três cartas para cada um, tiradas de um baralho embaralhado (sem reposição)
     def distribuir_cartas(self):
-        for jogador in self.jogadores:
-            jogador.cartas = random.choices(self.cartas, k=3)  
+        baralho = [carta for carta in self.cartas for _ in range(POR_TIPO)]
+        self.rng.shuffle(baralho)
+        for i, jogador in enumerate(self.jogadores):
+            jogador.cartas = baralho[3 * i:3 * i + 3]
 
-    def gerar_json(self):
+    # Compacto por padrão; indentar=True para leitura humana
+    def gerar_json(self, indentar: bool = False):
         dados = {
             "jogadores": [
                 {
@@ -55,4 +62,4 @@ class Jogo:
                 } for jogador in self.jogadores
             ]
         }
-        return json.dumps(dados, indent=4)
+        return dumps_str(dados, indentar)
@@ -1,201 +1,360 @@
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
-from typing import List
-import random
-import json
+from fastapi import APIRouter, Body, Depends, FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import Response, StreamingResponse
+from typing import List, Optional
+import asyncio
 import os
+import acoes
+import ia
+import metricas
+from acoes import encontrar_jogador
+from batalha import simular_batalhas
+from modelos import AcaoDoLote, Confronto
+from partida import JOGO_PADRAO, Partida, Partidas
+from posse import PartidaEmOutroProcesso
+from serializacao import RespostaJSON, dumps, resposta
+from tabela_batalha import TabelaBatalha
+from visoes import PARTIDA, chave_jogador
 
-app = FastAPI()
-
-# Modelos de dados
-class Jogador(BaseModel):
-    nome: str
-    cor_exercito: str = None
-    objetivo: str = None
-    territorios: List[str] = []
-    exercitos: int = 0
-    cartas: List[str] = []
-
-# Simulando alguns dados
-territorios_iniciais = ["Território 1", "Território 2", "Território 3", "Território 4", "Território 5"]
-objetivos_possiveis = ["Conquistar 24 territórios", "Eliminar um oponente", "Controlar dois continentes"]
-cores_disponiveis = ["Vermelho", "Azul", "Verde", "Amarelo"]
-cartas_possiveis = ["Carta 1", "Carta 2", "Carta 3"]
-
-jogadores = []
-
-# Carregar dados do arquivo JSON
-def carregar_dados():
-    global jogadores
-    if os.path.exists('dados.json'):
-        with open('dados.json', 'r') as f:
-            dados = json.load(f)
-            jogadores = [Jogador(**j) for j in dados['jogadores']]
-
-# Salvar dados no arquivo JSON
-def salvar_dados():
-    dados = {
-        "jogadores": [j.dict() for j in jogadores]
-    }
-    with open('dados.json', 'w') as f:
-        json.dump(dados, f, indent=4)
+# Respostas codificadas por serializacao (orjson quando instalado)
+app = FastAPI(default_response_class=RespostaJSON)
+# Tempo de cada rota, exposto em /metrics
+app.add_middleware(metricas.MedicaoDeRotas)
+
+# Rotas de uma partida; montadas em /jogos/{jogo_id}/... e, sem prefixo, para a partida padrão
+rotas = APIRouter()
+
+# Limite de simulações por consulta de probabilidade
+MAX_SIMULACOES = 1_000_000
+# Exércitos de cada lado na simulação: o laço vetorizado roda ~uma rodada por exército
+MAX_EXERCITOS_SIMULACAO = 1000
+MAX_CONFRONTOS = 10_000
+MAX_ACOES_LOTE = 1000
+MAX_TEMPO_IA_MS = 5000
+
+# Tabela exata de batalhas, compartilhada por todas as partidas e salva entre execuções
+ARQUIVO_TABELA = os.environ.get("WAR_TABELA_BATALHA", "tabela_batalha.npz")
+tabela_batalha = TabelaBatalha(limite=int(os.environ.get("WAR_LIMITE_TABELA", "200")))
+
+# Busca de jogadas (ia.py) em WAR_IA_PROCESSOS processos (padrão: um por CPU)
+conselheiro = ia.Conselheiro(int(os.environ.get("WAR_IA_PROCESSOS", "0")) or None)
+ROLLOUTS_IA = metricas.registro.contador("war_ia_rollouts_total", "Rollouts das buscas de jogada")
+
+# Cada partida tem seus jogadores, tabuleiro e cores; a padrão continua em dados.json.
+# WAR_DURABILIDADE: "imediata" (responde após o flush), "atrasada" (flush em até
+# WAR_ATRASO_MS ms, sem esperar) ou "direta" (grava dentro da rota).
+# WAR_ARMAZENAMENTO: "json" (dados.json + log) ou "sqlite" (dados.db, tabelas indexadas)
+partidas = Partidas(
+    durabilidade=os.environ.get("WAR_DURABILIDADE", "imediata"),
+    atraso_ms=float(os.environ.get("WAR_ATRASO_MS", "5")),
+    armazenamento=os.environ.get("WAR_ARMAZENAMENTO", "json"),
+)
+
+# Carrega a partida do disco no primeiro acesso. Com vários trabalhadores (coordenador.py),
+# a partida de outro processo responde 409: a requisição chegou ao trabalhador errado
+def obter_partida(jogo_id: str = JOGO_PADRAO) -> Partida:
+    try:
+        partida = partidas.obter(jogo_id)
+    except PartidaEmOutroProcesso as erro:
+        raise HTTPException(status_code=409, detail=str(erro))
+    if partida is None:
+        raise HTTPException(status_code=404, detail="Partida não encontrada")
+    return partida
+
+# Liga o gravador da partida e, depois da rota, espera o flush do que ela registrou.
+# As travas ficam nas ações (acoes.py): por jogador, ou exclusiva para a partida inteira.
+# Rotas só de leitura usam obter_partida direto: um 304 não passa pelo gravador
+async def partida_ativa(partida: Partida = Depends(obter_partida)):
+    partida.gravador.iniciar()
+    yield partida
+    await partida.gravador.confirmar()
+
+# Erros do jogo (jogador não encontrado, já existe...) viram a resposta HTTP correspondente
+@app.exception_handler(acoes.ErroDeJogo)
+async def tratar_erro_de_jogo(request: Request, erro: acoes.ErroDeJogo):
+    return resposta({"detail": str(erro)}, erro.status)
+
+# Executa uma ação do jogo; jogadas recusadas pelas regras respondem {"error": ...}
+def executar(acao, partida: Partida, **parametros):
+    try:
+        return acao(partida, **parametros)
+    except acoes.AcaoInvalida as erro:
+        return {"error": str(erro)}
+
+# Montagem das visões (model_dump + JSON) quando não estão no cache: chave[0] é "partida" ou "jogador"
+MONTAGEM = {
+    tipo: metricas.registro.histograma("war_visao_montagem_segundos", "Montagem de visões fora do cache (dados + JSON)", visao=tipo)
+    for tipo in ("partida", "jogador")
+}
 
-# Encontrar jogador
-def encontrar_jogador(nome: str) -> Jogador:
-    for j in jogadores:
-        if j.nome == nome:
-            return j
-    raise HTTPException(status_code=404, detail="Jogador não encontrado")
+def montar_visao(chave: tuple, montar) -> bytes:
+    with MONTAGEM[chave[0]].medir():
+        return dumps(montar())
 
-# Função auxiliar para rolar dados
-def rolar_dados(quantidade: int) -> List[int]:
-    return sorted([random.randint(1, 6) for _ in range(quantidade)], reverse=True)
+# Visão de leitura servida do cache da partida, com ETag; If-None-Match igual responde 304
+def responder_visao(partida: Partida, chave: tuple, request: Request, montar) -> Response:
+    etag = partida.visoes.etag(chave)
+    if partida.visoes.nao_modificada(chave, request.headers.get("if-none-match")):
+        return Response(status_code=304, headers={"ETag": etag})
+    corpo = partida.visoes.obter(chave, lambda: montar_visao(chave, montar))
+    return Response(content=corpo, media_type="application/json", headers={"ETag": etag})
+
+# A partida padrão carrega numa thread: o servidor já atende enquanto isso, e as rotas
+# dessa partida esperam a carga terminar (as das outras partidas, não). Com vários
+# trabalhadores, só o dono da partida padrão a carrega (WAR_CARREGAR_PADRAO=0 nos outros)
+carga_inicial = None
+carregar_padrao = os.environ.get("WAR_CARREGAR_PADRAO", "1") != "0"
 
 @app.on_event("startup")
 async def startup_event():
-    carregar_dados()
+    global tabela_batalha, carga_inicial
+    if os.path.exists(ARQUIVO_TABELA):
+        tabela_batalha = TabelaBatalha.carregar(ARQUIVO_TABELA, tabela_batalha.limite, tabela_batalha.parada)
+    if carregar_padrao:
+        carga_inicial = asyncio.create_task(asyncio.to_thread(partidas.obter, JOGO_PADRAO))
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    if carga_inicial is not None:
+        await asyncio.gather(carga_inicial, return_exceptions=True)
+    metricas.perfilador.desligar()
+    await partidas.parar()
+    partidas.fechar()
+    tabela_batalha.salvar(ARQUIVO_TABELA)
+    conselheiro.fechar()
+
+# Responde mesmo durante a carga inicial; informa as partidas ainda carregando
+@app.get("/saude/")
+def saude():
+    return {"ok": True, "partidas": len(partidas), "carregando": partidas.carregando()}
+
+# Métricas no formato texto do Prometheus (rotas, persistência, eventos, perfilador)
+metricas.registro.valor("war_partidas", "Partidas em memória", lambda: len(partidas))
+
+@app.get("/metrics")
+def ver_metricas():
+    return Response(content=metricas.registro.texto(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+# Liga/desliga o perfilador por amostragem; zerar descarta as amostras anteriores
+@app.post("/metrics/perfilador/")
+def alternar_perfilador(ligado: bool, zerar: bool = False):
+    if zerar:
+        metricas.perfilador.zerar()
+    if ligado:
+        metricas.perfilador.ligar()
+    else:
+        metricas.perfilador.desligar()
+    return {"ligado": metricas.perfilador.ligado, "amostras": metricas.perfilador.amostras}
+
+# Partidas; com semente, os sorteios da partida se repetem (dados, ordem, territórios...)
+@app.post("/jogos/")
+def criar_jogo(jogo_id: Optional[str] = None, semente: Optional[int] = None):
+    try:
+        partida = partidas.criar(jogo_id, semente)
+    except ValueError as erro:
+        raise HTTPException(status_code=400, detail=str(erro))
+    except PartidaEmOutroProcesso as erro:
+        raise HTTPException(status_code=409, detail=str(erro))
+    return {"jogo_id": partida.id, "semente": partida.fluxos.semente}
 
 # Preparação
-@app.post("/jogadores/adicionar/")
-def adicionar_jogador(nome: str):
-    if any(j.nome == nome for j in jogadores):
-        raise HTTPException(status_code=400, detail="Jogador já existe")
-    jogador = Jogador(nome=nome)
-    jogadores.append(jogador)
-    salvar_dados()
-    return {"message": f"Jogador {jogador.nome} adicionado com sucesso"}
-
-@app.post("/preparacao/escolher-cor/")
-def escolher_cor(jogador: str, cor: str):
-    if cor not in cores_disponiveis:
-        return {"error": "Cor não disponível"}
-    jogador_obj = encontrar_jogador(jogador)
-    jogador_obj.cor_exercito = cor
-    cores_disponiveis.remove(cor)
-    salvar_dados()
-    return {"message": f"O jogador {jogador} escolheu a cor {cor}."}
-
-@app.post("/preparacao/objetivo/")
-def receber_objetivo(jogador: str):
-    jogador_obj = encontrar_jogador(jogador)
-    objetivo = random.choice(objetivos_possiveis)
-    jogador_obj.objetivo = objetivo
-    salvar_dados()
-    return {"message": f"Objetivo do jogador {jogador}: {objetivo}"}
-
-@app.post("/preparacao/definir-ordem/")
-def definir_ordem():
-    random.shuffle(jogadores)
-    ordem = [j.nome for j in jogadores]
-    salvar_dados()
-    return {"ordem": ordem}
-
-@app.post("/preparacao/distribuir-territorios/")
-def distribuir_territorios():
-    random.shuffle(territorios_iniciais)
-    for i, jogador in enumerate(jogadores):
-        jogador.territorios.append(territorios_iniciais[i % len(jogadores)])
-    salvar_dados()
-    return {j.nome: j.territorios for j in jogadores}
-
-@app.post("/preparacao/distribuir-exercitos/")
-def distribuir_exercitos(jogador: str, exercitos: int):
-    jogador_obj = encontrar_jogador(jogador)
-    jogador_obj.exercitos += exercitos
-    salvar_dados()
-    return {"message": f"{exercitos} exércitos distribuídos para o jogador {jogador}"}
+@rotas.post("/jogadores/adicionar/")
+def adicionar_jogador(nome: str, partida: Partida = Depends(partida_ativa)):
+    return executar(acoes.adicionar_jogador, partida, nome=nome)
+
+@rotas.post("/jogadores/remover/")
+def remover_jogador(nome: str, partida: Partida = Depends(partida_ativa)):
+    return executar(acoes.remover_jogador, partida, nome=nome)
+
+@rotas.post("/preparacao/escolher-cor/")
+def escolher_cor(jogador: str, cor: str, partida: Partida = Depends(partida_ativa)):
+    return executar(acoes.escolher_cor, partida, jogador=jogador, cor=cor)
+
+@rotas.post("/preparacao/objetivo/")
+def receber_objetivo(jogador: str, partida: Partida = Depends(partida_ativa)):
+    return executar(acoes.receber_objetivo, partida, jogador=jogador)
+
+@rotas.post("/preparacao/definir-ordem/")
+def definir_ordem(partida: Partida = Depends(partida_ativa)):
+    return executar(acoes.definir_ordem, partida)
+
+@rotas.post("/preparacao/distribuir-territorios/")
+def distribuir_territorios(partida: Partida = Depends(partida_ativa)):
+    return executar(acoes.distribuir_territorios, partida)
+
+@rotas.post("/preparacao/distribuir-exercitos/")
+def distribuir_exercitos(jogador: str, exercitos: int, partida: Partida = Depends(partida_ativa)):
+    return executar(acoes.distribuir_exercitos, partida, jogador=jogador, exercitos=exercitos)
 
 # Rodada
-@app.post("/rodada/iniciar/")
-def iniciar_rodada():
-    for j in jogadores:
-        j.exercitos += 5  #  5 exércitos por rodada
-    salvar_dados()
-    return {j.nome: j.exercitos for j in jogadores}
-
-@app.post("/rodada/ataque/")
-def iniciar_ataque(jogador_atacante: str, territorio_atacante: str, jogador_defensor: str, territorio_defensor: str):
-    atacante = encontrar_jogador(jogador_atacante)
-    defensor = encontrar_jogador(jogador_defensor)
-    
-    if territorio_atacante not in atacante.territorios or territorio_defensor not in defensor.territorios:
-        return {"error": "Territórios inválidos para ataque"}
-    
-    # Rolar dados para atacante e defensor
-    dados_atacante = rolar_dados(min(3, atacante.exercitos - 1))  # Ataque com até 3 exércitos
-    dados_defensor = rolar_dados(min(2, defensor.exercitos))      # Defesa com até 2 exércitos
-    
-    perdas_atacante = 0
-    perdas_defensor = 0
-    
-    # Verifica os dados para determinar perdas
-    for dado_atacante, dado_defensor in zip(dados_atacante, dados_defensor):
-        if dado_atacante > dado_defensor:
-            perdas_defensor += 1
-        else:
-            perdas_atacante += 1
-    
-    atacante.exercitos -= perdas_atacante
-    defensor.exercitos -= perdas_defensor
-    
-    # Se o defensor perde todos os exércitos, atacante conquista o território
-    if defensor.exercitos <= 0:
-        defensor.territorios.remove(territorio_defensor)
-        atacante.territorios.append(territorio_defensor)
-    
-    salvar_dados()
+@rotas.post("/rodada/iniciar/")
+def iniciar_rodada(partida: Partida = Depends(partida_ativa)):
+    return executar(acoes.iniciar_rodada, partida)
+
+@rotas.post("/rodada/ataque/")
+def iniciar_ataque(jogador_atacante: str, territorio_atacante: str, jogador_defensor: str, territorio_defensor: str, partida: Partida = Depends(partida_ativa)):
+    return executar(
+        acoes.atacar, partida,
+        jogador_atacante=jogador_atacante, territorio_atacante=territorio_atacante,
+        jogador_defensor=jogador_defensor, territorio_defensor=territorio_defensor,
+    )
+
+# Probabilidade de conquista atacando até vencer ou ficar com `parar_com` exércitos.
+# Não segura a trava da partida: lê os exércitos atuais e simula fora dela
+@rotas.get("/rodada/ataque/probabilidade/")
+def probabilidade_ataque(jogador_atacante: str, jogador_defensor: str, simulacoes: int = 100_000, parar_com: int = 1, partida: Partida = Depends(obter_partida)):
+    if not 1 <= simulacoes <= MAX_SIMULACOES:
+        raise HTTPException(status_code=400, detail=f"simulacoes deve estar entre 1 e {MAX_SIMULACOES}")
+    atacante = encontrar_jogador(partida, jogador_atacante)
+    defensor = encontrar_jogador(partida, jogador_defensor)
+    if max(atacante.exercitos, defensor.exercitos) > MAX_EXERCITOS_SIMULACAO:
+        raise HTTPException(status_code=400, detail=f"Simulação limitada a {MAX_EXERCITOS_SIMULACAO} exércitos por lado")
+    resultado = simular_batalhas(atacante.exercitos, defensor.exercitos, simulacoes, parar_com)
     return {
-        "resultados_dados": {
-            "atacante": dados_atacante,
-            "defensor": dados_defensor
-        },
-        "resultado_batalha": {
-            "atacante": {"nome": atacante.nome, "perdas": perdas_atacante, "exercitos_restantes": atacante.exercitos},
-            "defensor": {"nome": defensor.nome, "perdas": perdas_defensor, "exercitos_restantes": defensor.exercitos},
-        },
-        "conquista": f"{atacante.nome} conquistou {territorio_defensor}" if defensor.exercitos <= 0 else "Território não conquistado"
+        "atacante": {"nome": atacante.nome, "exercitos": atacante.exercitos},
+        "defensor": {"nome": defensor.nome, "exercitos": defensor.exercitos},
+        **resultado
     }
 
-@app.post("/rodada/receber-cartas/")
-def receber_cartas(jogador: str):
-    jogador_obj = encontrar_jogador(jogador)
-    carta = random.choice(cartas_possiveis)
-    jogador_obj.cartas.append(carta)
-    salvar_dados()
-    return {"message": f"O jogador {jogador} recebeu a carta {carta}"}
-
-@app.post("/rodada/mover-exercitos/")
-def mover_exercitos(jogador: str, origem: str, destino: str, quantidade: int):
-    jogador_obj = encontrar_jogador(jogador)
-    if origem not in jogador_obj.territorios or destino not in jogador_obj.territorios:
-        return {"error": "Movimento inválido entre territórios não controlados"}
-    
-    # Lógica simples para mover exércitos entre territórios do mesmo jogador
-    salvar_dados()
-    return {"message": f"{jogador} moveu {quantidade} exércitos de {origem} para {destino}"}
-
-@app.post("/rodada/troca-cartas/")
-def trocar_cartas(jogador: str, cartas: List[str]):
-    jogador_obj = encontrar_jogador(jogador)
-    # Adicione lógica para troca de cartas (regras do jogo War)
-    salvar_dados()
-    return {"message": f"{jogador} trocou as cartas {cartas}"}
-
-@app.get("/objetivo/verificar/")
-def verificar_objetivo(jogador: str):
-    jogador_obj = encontrar_jogador(jogador)
-    # Verificação fictícia, adicionar lógica para verificar condição de vitória
-    return {"message": f"O jogador {jogador} não completou o objetivo ainda"}
+# Probabilidades exatas para vários pares (atacantes, defensores) numa única chamada. A tabela
+# é a mesma para todas as partidas; a partida só precisa existir (404, como nas outras rotas)
+@rotas.post("/rodada/ataque/probabilidades/")
+def probabilidades_ataque(confrontos: List[Confronto], partida: Partida = Depends(obter_partida)):
+    if len(confrontos) > MAX_CONFRONTOS:
+        raise HTTPException(status_code=400, detail=f"No máximo {MAX_CONFRONTOS} confrontos por chamada")
+    try:
+        # Até MAX_CONFRONTOS resultados: codificados direto, sem passar pelo jsonable_encoder
+        return resposta([tabela_batalha.resultado(c.atacantes, c.defensores) for c in confrontos])
+    except ValueError as erro:
+        raise HTTPException(status_code=400, detail=str(erro))
 
-# Nova rota para visualizar informações de um jogador
-@app.get("/jogadores/ver/")
-def ver_jogador(nome: str):
-    jogador = encontrar_jogador(nome)
+@rotas.post("/rodada/receber-cartas/")
+def receber_cartas(jogador: str, partida: Partida = Depends(partida_ativa)):
+    return executar(acoes.receber_cartas, partida, jogador=jogador)
+
+@rotas.post("/rodada/mover-exercitos/")
+def mover_exercitos(jogador: str, origem: str, destino: str, quantidade: int, partida: Partida = Depends(partida_ativa)):
+    return executar(acoes.mover_exercitos, partida, jogador=jogador, origem=origem, destino=destino, quantidade=quantidade)
+
+# Corpo com as três cartas; sem corpo (ou lista vazia), a melhor troca da mão
+@rotas.post("/rodada/troca-cartas/")
+def trocar_cartas(jogador: str, cartas: List[str] = Body([]), partida: Partida = Depends(partida_ativa)):
+    return executar(acoes.trocar_cartas, partida, jogador=jogador, cartas=cartas)
+
+# Várias ações do turno numa só requisição: aplicadas em memória, tudo ou nada, e
+# gravadas num único lote. Se uma ação falha, nenhuma é aplicada (400 com o índice)
+@rotas.post("/rodada/lote/")
+def executar_lote(lote: List[AcaoDoLote], partida: Partida = Depends(partida_ativa)):
+    if len(lote) > MAX_ACOES_LOTE:
+        raise HTTPException(status_code=400, detail=f"No máximo {MAX_ACOES_LOTE} ações por lote")
+    return {"resultados": acoes.executar_lote(partida, [(a.acao, a.parametros) for a in lote])}
+
+# Jogada sugerida para o turno do jogador: MCTS com prazo de tempo_ms sobre o estado atual
+# (a trava exclusiva só para copiar o tabuleiro). O plano vai até o primeiro ataque, cujo
+# resultado depende dos dados: depois dele, pedir de novo continua a mesma árvore
+@rotas.post("/rodada/sugerir-jogada/")
+def sugerir_jogada(jogador: str, tempo_ms: int = 200, partida: Partida = Depends(obter_partida)):
+    if not 1 <= tempo_ms <= MAX_TEMPO_IA_MS:
+        raise HTTPException(status_code=400, detail=f"tempo_ms deve estar entre 1 e {MAX_TEMPO_IA_MS}")
+    with partida.travas.exclusiva():
+        encontrar_jogador(partida, jogador)
+        if not partida.tabuleiro.territorios_de(jogador):
+            raise HTTPException(status_code=400, detail="Jogador sem territórios")
+        raiz, contexto = ia.da_partida(partida, jogador)
+        nomes = [j.nome for j in partida.jogadores]
+    sugestao = conselheiro.sugerir(raiz, contexto, tempo_ms / 1000, chave=(partida.id, jogador))
+    ROLLOUTS_IA.inc(sugestao["rollouts"])
     return {
-        "nome": jogador.nome,
-        "cor_exercito": jogador.cor_exercito,
-        "objetivo": jogador.objetivo,
-        "territorios": jogador.territorios,
-        "exercitos": jogador.exercitos,
-        "cartas": jogador.cartas
+        "jogador": jogador,
+        "plano": ia.descrever_plano(sugestao["plano"], raiz, contexto, nomes),
+        "alternativas": [
+            {**ia.descrever(jogada, raiz, contexto, nomes), "visitas": visitas, "valor": valor}
+            for jogada, visitas, valor in sugestao["jogadas"][:5]
+        ],
+        "rollouts": sugestao["rollouts"],
+        "rollouts_por_s": sugestao["rollouts_por_s"],
+        "duracao_ms": sugestao["duracao_s"] * 1000,
     }
+
+@rotas.get("/objetivo/verificar/")
+def verificar_objetivo(jogador: str, partida: Partida = Depends(obter_partida)):
+    return executar(acoes.verificar_objetivo, partida, jogador=jogador)
+
+# Nova rota para visualizar informações de um jogador
+@rotas.get("/jogadores/ver/")
+def ver_jogador(nome: str, request: Request, partida: Partida = Depends(obter_partida)):
+    with partida.travas.jogadores(nome):
+        jogador = encontrar_jogador(partida, nome)
+        return responder_visao(partida, chave_jogador(nome), request, lambda: {
+            "nome": jogador.nome,
+            "cor_exercito": jogador.cor_exercito,
+            "objetivo": jogador.objetivo,
+            "territorios": sorted(jogador.territorios),
+            "exercitos": jogador.exercitos,
+            "cartas": jogador.cartas
+        })
+
+# Estado de todos os jogadores, no formato do dados.json (ordem dos turnos)
+@rotas.get("/gerar-json/")
+def gerar_json(request: Request, partida: Partida = Depends(obter_partida)):
+    with partida.travas.exclusiva():
+        return responder_visao(partida, PARTIDA, request, lambda: {"jogadores": [j.model_dump() for j in partida.jogadores]})
+
+# Acertos do cache de visões da partida
+@rotas.get("/visoes/estatisticas/")
+def estatisticas_visoes(partida: Partida = Depends(obter_partida)):
+    return partida.visoes.estatisticas()
+
+# Quem controla um território (consulta direta no índice do tabuleiro)
+@rotas.get("/territorios/dono/")
+def ver_dono_territorio(territorio: str, partida: Partida = Depends(obter_partida)):
+    dono = partida.tabuleiro.dono(territorio)
+    if dono is None:
+        raise HTTPException(status_code=404, detail="Território sem dono")
+    return {"territorio": territorio, "dono": dono}
+
+# Eventos da partida empurrados aos espectadores (ataques, conquistas, cartas, rodadas...),
+# em vez de polling em /jogadores/ver/. Cada conexão tem seu buffer; o campo seq revela descartes
+@rotas.websocket("/eventos/ws")
+async def eventos_websocket(websocket: WebSocket, jogo_id: str = JOGO_PADRAO):
+    try:
+        partida = partidas.obter(jogo_id)
+    except PartidaEmOutroProcesso:
+        await websocket.close(code=4409)
+        return
+    if partida is None:
+        await websocket.close(code=4404)
+        return
+    await websocket.accept()
+    conexao = partida.transmissao.conectar()
+
+    async def enviar():
+        while True:
+            for evento in await conexao.proximos():
+                await websocket.send_text(evento.json)
+
+    envio = asyncio.create_task(enviar())
+    try:
+        # O cliente não precisa mandar nada; a leitura só serve para perceber a desconexão
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        envio.cancel()
+        partida.transmissao.remover_observador(conexao)
+
+@rotas.get("/eventos/sse")
+async def eventos_sse(partida: Partida = Depends(obter_partida)):
+    conexao = partida.transmissao.conectar()
+
+    async def fluxo():
+        try:
+            while True:
+                yield "".join(evento.sse for evento in await conexao.proximos())
+        finally:
+            partida.transmissao.remover_observador(conexao)
+
+    return StreamingResponse(fluxo(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+app.include_router(rotas, prefix="/jogos/{jogo_id}")
+app.include_router(rotas)
@@ -0,0 +1,93 @@
+# mapa.py
+# Mapa do War: 42 territórios em 6 continentes e as fronteiras entre eles.
+# Territórios são ids inteiros (posição em Mapa.territorios); a adjacência fica em CSR
+# (inicio/adjacentes em array) e, para iteração rápida em Python, em tuplas por território.
+# vizinhanca traz os mesmos vizinhos como bitset (int), para testes e uniões de um passo.
+from array import array
+
+CONTINENTES = {
+    "América do Norte": ["Alasca", "Mackenzie", "Groenlândia", "Vancouver", "Ottawa", "Labrador", "Califórnia", "Nova York", "México"],
+    "América do Sul": ["Venezuela", "Peru", "Brasil", "Argentina"],
+    "Europa": ["Islândia", "Inglaterra", "Suécia", "Moscou", "Alemanha", "Polônia", "Portugal"],
+    "África": ["Argélia", "Egito", "Sudão", "Congo", "África do Sul", "Madagascar"],
+    "Ásia": ["Oriente Médio", "Aral", "Omsk", "Dudinka", "Sibéria", "Vladivostok", "Tchita", "Mongólia", "China", "Japão", "Índia", "Vietnã"],
+    "Oceania": ["Sumatra", "Bornéu", "Nova Guiné", "Austrália"],
+}
+
+# Exércitos extras por continente dominado
+BONUS_CONTINENTE = {"América do Norte": 5, "América do Sul": 2, "Europa": 5, "África": 3, "Ásia": 7, "Oceania": 2}
+
+FRONTEIRAS = [
+    # América do Norte
+    ("Alasca", "Mackenzie"), ("Alasca", "Vancouver"), ("Mackenzie", "Vancouver"), ("Mackenzie", "Ottawa"),
+    ("Mackenzie", "Groenlândia"), ("Groenlândia", "Labrador"), ("Vancouver", "Ottawa"), ("Vancouver", "Califórnia"),
+    ("Ottawa", "Labrador"), ("Ottawa", "Califórnia"), ("Ottawa", "Nova York"), ("Labrador", "Nova York"),
+    ("Califórnia", "Nova York"), ("Califórnia", "México"), ("Nova York", "México"),
+    # América do Sul
+    ("Venezuela", "Peru"), ("Venezuela", "Brasil"), ("Peru", "Brasil"), ("Peru", "Argentina"), ("Brasil", "Argentina"),
+    # Europa
+    ("Islândia", "Inglaterra"), ("Inglaterra", "Suécia"), ("Inglaterra", "Alemanha"), ("Inglaterra", "Portugal"),
+    ("Suécia", "Moscou"), ("Moscou", "Polônia"), ("Alemanha", "Portugal"), ("Alemanha", "Polônia"), ("Polônia", "Portugal"),
+    # África
+    ("Argélia", "Egito"), ("Argélia", "Sudão"), ("Argélia", "Congo"), ("Egito", "Sudão"), ("Sudão", "Congo"),
+    ("Sudão", "África do Sul"), ("Sudão", "Madagascar"), ("Congo", "África do Sul"), ("África do Sul", "Madagascar"),
+    # Ásia
+    ("Oriente Médio", "Aral"), ("Oriente Médio", "Índia"), ("Aral", "Omsk"), ("Aral", "China"), ("Aral", "Índia"),
+    ("Omsk", "Dudinka"), ("Omsk", "Mongólia"), ("Omsk", "China"), ("Dudinka", "Sibéria"), ("Dudinka", "Tchita"),
+    ("Dudinka", "Mongólia"), ("Sibéria", "Tchita"), ("Sibéria", "Vladivostok"), ("Vladivostok", "Tchita"),
+    ("Vladivostok", "China"), ("Vladivostok", "Japão"), ("Tchita", "Mongólia"), ("Tchita", "China"),
+    ("Mongólia", "China"), ("China", "Japão"), ("China", "Índia"), ("China", "Vietnã"), ("Índia", "Vietnã"),
+    # Oceania
+    ("Sumatra", "Austrália"), ("Bornéu", "Austrália"), ("Bornéu", "Nova Guiné"), ("Nova Guiné", "Austrália"),
+    # Entre continentes
+    ("Alasca", "Vladivostok"), ("Groenlândia", "Islândia"), ("México", "Venezuela"), ("Brasil", "Argélia"),
+    ("Portugal", "Argélia"), ("Portugal", "Egito"), ("Polônia", "Egito"), ("Polônia", "Oriente Médio"),
+    ("Moscou", "Omsk"), ("Moscou", "Aral"), ("Moscou", "Oriente Médio"), ("Egito", "Oriente Médio"),
+    ("Índia", "Sumatra"), ("Vietnã", "Bornéu"),
+]
+
+
+class Mapa:
+    def __init__(self, territorios: list, fronteiras: list, continentes: dict = None):
+        self.territorios = tuple(territorios)
+        self.indice = {nome: t for t, nome in enumerate(self.territorios)}
+        if len(self.indice) != len(self.territorios):
+            raise ValueError("Territórios repetidos no mapa")
+        listas = [set() for _ in self.territorios]
+        for a, b in fronteiras:
+            ia, ib = self.id(a), self.id(b)
+            listas[ia].add(ib)
+            listas[ib].add(ia)
+        self.vizinhos = tuple(tuple(sorted(v)) for v in listas)
+        self.vizinhanca = tuple(sum(1 << t for t in v) for v in self.vizinhos)
+        # CSR: vizinhos de t são adjacentes[inicio[t]:inicio[t + 1]]
+        self.inicio = array("H", [0])
+        self.adjacentes = array("H")
+        for v in self.vizinhos:
+            self.adjacentes.extend(v)
+            self.inicio.append(len(self.adjacentes))
+        self.continentes = {nome: tuple(self.id(t) for t in membros) for nome, membros in (continentes or {}).items()}
+        self.continente_de = [None] * len(self.territorios)
+        for nome, membros in self.continentes.items():
+            for t in membros:
+                self.continente_de[t] = nome
+
+    def __len__(self):
+        return len(self.territorios)
+
+    def id(self, nome: str) -> int:
+        try:
+            return self.indice[nome]
+        except KeyError:
+            raise ValueError(f"Território desconhecido: {nome}")
+
+    def fazem_fronteira(self, a: int, b: int) -> bool:
+        return bool(self.vizinhanca[a] >> b & 1)
+
+    # Mapa sem geografia: todo território faz fronteira com todos os outros
+    @classmethod
+    def completo(cls, territorios: list) -> "Mapa":
+        return cls(territorios, [(a, b) for i, a in enumerate(territorios) for b in territorios[i + 1:]])
+
+
+MAPA_WAR = Mapa([t for membros in CONTINENTES.values() for t in membros], FRONTEIRAS, CONTINENTES)
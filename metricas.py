@@ -0,0 +1,286 @@
+# metricas.py
+# Instrumentação leve dos caminhos quentes, exposta em /metrics no formato texto do Prometheus.
+#   - contadores e histogramas de tempo (séries criadas uma vez e reaproveitadas: medir é
+#     um perf_counter no começo e outro no fim, sem montar rótulos a cada chamada)
+#   - MedicaoDeRotas: middleware ASGI com o tempo de cada rota, por método, rota e status
+#   - Perfilador: amostragem opcional das pilhas de todas as threads (sys._current_frames);
+#     conta, por função, em quantas amostras ela estava na pilha. É o que mostra o tempo de
+#     funções curtas demais para cronometrar uma a uma (encontrar_jogador, rolar_dados,
+#     model_dump...). Desligado, não custa nada.
+# WAR_METRICAS=0 desliga a medição das rotas; WAR_PERFILADOR=1 liga o perfilador na partida.
+import bisect
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+# Limites dos baldes dos histogramas de tempo, em segundos
+BALDES = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+def _rotulos(rotulos: dict, extra: str = "") -> str:
+    pares = [f'{chave}="{_escapar(valor)}"' for chave, valor in rotulos.items()]
+    if extra:
+        pares.append(extra)
+    return "{" + ",".join(pares) + "}" if pares else ""
+
+
+def _escapar(valor) -> str:
+    return str(valor).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _numero(valor) -> str:
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+
+class Contador:
+    __slots__ = ("rotulos", "valor", "_trava")
+
+    def __init__(self, rotulos: dict):
+        self.rotulos = rotulos
+        self.valor = 0
+        self._trava = threading.Lock()
+
+    def inc(self, quantidade=1):
+        with self._trava:
+            self.valor += quantidade
+
+    def linhas(self, nome: str):
+        yield f"{nome}{_rotulos(self.rotulos)} {_numero(self.valor)}"
+
+
+class Histograma:
+    __slots__ = ("rotulos", "baldes", "contagens", "soma", "total", "_trava")
+
+    def __init__(self, rotulos: dict, baldes: tuple = BALDES):
+        self.rotulos = rotulos
+        self.baldes = baldes
+        self.contagens = [0] * (len(baldes) + 1)
+        self.soma = 0.0
+        self.total = 0
+        self._trava = threading.Lock()
+
+    def observar(self, valor: float):
+        indice = bisect.bisect_left(self.baldes, valor)
+        with self._trava:
+            self.contagens[indice] += 1
+            self.soma += valor
+            self.total += 1
+
+    def medir(self) -> "Medicao":
+        return Medicao(self)
+
+    def linhas(self, nome: str):
+        with self._trava:
+            contagens, soma, total = list(self.contagens), self.soma, self.total
+        acumulado = 0
+        for limite, contagem in zip(self.baldes + ("+Inf",), contagens):
+            acumulado += contagem
+            le = f'le="{limite}"'
+            yield f"{nome}_bucket{_rotulos(self.rotulos, le)} {acumulado}"
+        yield f"{nome}_sum{_rotulos(self.rotulos)} {_numero(soma)}"
+        yield f"{nome}_count{_rotulos(self.rotulos)} {total}"
+
+
+# with histograma.medir(): ... observa a duração do bloco (também quando ele levanta exceção)
+class Medicao:
+    __slots__ = ("histograma", "inicio")
+
+    def __init__(self, histograma: Histograma):
+        self.histograma = histograma
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *erro):
+        self.histograma.observar(time.perf_counter() - self.inicio)
+        return False
+
+
+class Familia:
+    def __init__(self, nome: str, tipo: str, ajuda: str, fabrica):
+        self.nome = nome
+        self.tipo = tipo
+        self.ajuda = ajuda
+        self.fabrica = fabrica
+        self.series = {}
+
+    def serie(self, rotulos: dict):
+        chave = tuple(rotulos.items())
+        serie = self.series.get(chave)
+        if serie is None:
+            serie = self.series.setdefault(chave, self.fabrica(rotulos))
+        return serie
+
+
+class Registro:
+    def __init__(self):
+        self.familias = {}
+        self.valores = {}      # métricas calculadas na hora da coleta: nome -> (ajuda, função)
+        self._trava = threading.Lock()
+
+    def _familia(self, nome: str, tipo: str, ajuda: str, fabrica) -> Familia:
+        familia = self.familias.get(nome)
+        if familia is None:
+            with self._trava:
+                familia = self.familias.setdefault(nome, Familia(nome, tipo, ajuda, fabrica))
+        if familia.tipo != tipo:
+            raise ValueError(f"Métrica {nome} já registrada como {familia.tipo}")
+        return familia
+
+    def contador(self, nome: str, ajuda: str, **rotulos) -> Contador:
+        return self._familia(nome, "counter", ajuda, Contador).serie(rotulos)
+
+    def histograma(self, nome: str, ajuda: str, **rotulos) -> Histograma:
+        return self._familia(nome, "histogram", ajuda, Histograma).serie(rotulos)
+
+    # Gauge lido na coleta; a função devolve um número ou uma lista de (rótulos, número)
+    def valor(self, nome: str, ajuda: str, funcao):
+        self.valores[nome] = (ajuda, funcao)
+
+    def texto(self) -> str:
+        linhas = []
+        for familia in list(self.familias.values()):
+            linhas.append(f"# HELP {familia.nome} {familia.ajuda}")
+            linhas.append(f"# TYPE {familia.nome} {familia.tipo}")
+            for serie in list(familia.series.values()):
+                linhas.extend(serie.linhas(familia.nome))
+        for nome, (ajuda, funcao) in list(self.valores.items()):
+            valores = funcao()
+            linhas.append(f"# HELP {nome} {ajuda}")
+            linhas.append(f"# TYPE {nome} gauge")
+            for rotulos, valor in (valores if isinstance(valores, list) else [({}, valores)]):
+                linhas.append(f"{nome}{_rotulos(rotulos)} {_numero(valor)}")
+        return "\n".join(linhas) + "\n"
+
+
+registro = Registro()
+
+# Persistência (por armazenamento): duração de cada gravação, lotes e registros gravados
+def persistencia(armazenamento: str) -> tuple:
+    return (
+        registro.histograma("war_persistencia_segundos", "Duração das gravações de lotes no armazenamento", armazenamento=armazenamento),
+        registro.contador("war_persistencia_lotes_total", "Lotes gravados", armazenamento=armazenamento),
+        registro.contador("war_persistencia_registros_total", "Registros (mutações de jogadores) gravados", armazenamento=armazenamento),
+    )
+
+# Eventos publicados aos espectadores e entregas (um evento para cada observador)
+EVENTOS = registro.contador("war_eventos_total", "Eventos publicados aos espectadores")
+ENTREGAS = registro.contador("war_eventos_entregas_total", "Eventos entregues aos observadores (fan-out)")
+
+
+# Middleware ASGI: tempo de cada requisição HTTP até o fim da resposta. A rota é o nome da
+# função que a atende (o mesmo nas partidas com e sem prefixo), para não criar uma série por URL
+medir_rotas = os.environ.get("WAR_METRICAS", "1") != "0"
+
+class MedicaoDeRotas:
+    def __init__(self, app):
+        self.app = app
+        self.series = {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not medir_rotas:
+            await self.app(scope, receive, send)
+            return
+        status = 500
+        inicio = time.perf_counter()
+
+        async def enviar(mensagem):
+            nonlocal status
+            if mensagem["type"] == "http.response.start":
+                status = mensagem["status"]
+            await send(mensagem)
+
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            duracao = time.perf_counter() - inicio
+            endpoint = scope.get("endpoint")
+            chave = (scope["method"], getattr(endpoint, "__name__", "desconhecida"), status)
+            serie = self.series.get(chave)
+            if serie is None:
+                serie = self.series[chave] = registro.histograma(
+                    "war_requisicao_segundos", "Duração das requisições HTTP",
+                    metodo=chave[0], rota=chave[1], status=chave[2],
+                )
+            serie.observar(duracao)
+
+
+# Amostragem das pilhas: a cada `intervalo` segundos, anota as funções na pilha de cada
+# thread (menos a do próprio perfilador). "propria" conta só a função do topo da pilha
+class Perfilador:
+    def __init__(self, intervalo: float = 0.005):
+        self.intervalo = intervalo
+        self.amostras = 0
+        self.inclusiva = Counter()
+        self.propria = Counter()
+        self._trava = threading.Lock()
+        self._parar = None
+        self._thread = None
+
+    @property
+    def ligado(self) -> bool:
+        return self._thread is not None
+
+    def ligar(self):
+        with self._trava:
+            if self._thread is not None:
+                return
+            self._parar = threading.Event()
+            self._thread = threading.Thread(target=self._amostrar, args=(self._parar,), name="perfilador", daemon=True)
+            self._thread.start()
+
+    def desligar(self):
+        with self._trava:
+            thread, self._thread = self._thread, None
+            if thread is None:
+                return
+            self._parar.set()
+        thread.join()
+
+    def zerar(self):
+        with self._trava:
+            self.amostras = 0
+            self.inclusiva.clear()
+            self.propria.clear()
+
+    def mais_frequentes(self, quantidade: int = 50) -> list:
+        with self._trava:
+            return [(funcao, vezes, self.propria[funcao]) for funcao, vezes in self.inclusiva.most_common(quantidade)]
+
+    def _amostrar(self, parar: threading.Event):
+        propria = threading.get_ident()
+        while not parar.wait(self.intervalo):
+            pilhas = []
+            for ident, quadro in sys._current_frames().items():
+                if ident == propria:
+                    continue
+                funcoes = []
+                while quadro is not None:
+                    codigo = quadro.f_code
+                    funcoes.append(f"{os.path.basename(codigo.co_filename)}:{codigo.co_name}")
+                    quadro = quadro.f_back
+                pilhas.append(funcoes)
+            with self._trava:
+                for funcoes in pilhas:
+                    self.amostras += 1
+                    self.inclusiva.update(set(funcoes))
+                    self.propria[funcoes[0]] += 1
+
+
+perfilador = Perfilador(float(os.environ.get("WAR_PERFIL_INTERVALO_MS", "5")) / 1000)
+
+
+def _perfil():
+    frequentes = perfilador.mais_frequentes()
+    return [({"funcao": funcao, "escopo": "inclusiva"}, vezes) for funcao, vezes, _ in frequentes] + \
+           [({"funcao": funcao, "escopo": "propria"}, propria) for funcao, _, propria in frequentes if propria]
+
+registro.valor("war_perfil_ligado", "Perfilador por amostragem ligado (1) ou não (0)", lambda: int(perfilador.ligado))
+registro.valor("war_perfil_amostras", "Pilhas amostradas desde o último zerar", lambda: perfilador.amostras)
+registro.valor("war_perfil_funcao_amostras", "Amostras em que a função estava na pilha (inclusiva) ou no topo (propria); 50 mais frequentes", _perfil)
+
+if os.environ.get("WAR_PERFILADOR") == "1":
+    perfilador.ligar()
@@ -0,0 +1,23 @@
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional, Set
+
+# Modelos de dados
+class Jogador(BaseModel):
+    nome: str
+    cor_exercito: Optional[str] = None
+    objetivo: Optional[str] = None
+    territorios: Set[str] = set()
+    exercitos: int = 0
+    cartas: List[str] = []
+    trocas: int = 0     # trocas de cartas já feitas (o bônus cresce com o total da partida)
+    eliminou: bool = False  # já tomou o último território de um oponente ("Eliminar um oponente")
+
+# Par (atacantes, defensores) para consulta de probabilidades em lote
+class Confronto(BaseModel):
+    atacantes: int
+    defensores: int
+
+# Uma ação de POST /rodada/lote/: nome da ação e os mesmos parâmetros da rota individual
+class AcaoDoLote(BaseModel):
+    acao: str
+    parametros: Dict[str, Any] = {}
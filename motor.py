@@ -0,0 +1,303 @@
+# motor.py
+# Motor de jogo sem HTTP: partidas completas entre políticas (bots) plugáveis, usando as fases de
+# preparação de jogo.Jogo, o TabuleiroCompacto e as probabilidades exatas de batalha.probabilidades_rolagem.
+# simular() distribui milhares de partidas num ProcessPoolExecutor, com um RNG semeado por lote,
+# e devolve taxas de vitória (por posição, política e objetivo) e a duração das partidas.
+# Uso: python -m motor --partidas 1000000 --politicas agressiva agressiva aleatoria
+import argparse
+import random
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from batalha import probabilidades_rolagem
+from jogador import Jogador
+from jogo import Jogo
+from mapa import MAPA_WAR, Mapa
+from objetivos import Acompanhamento
+from tabuleiro_compacto import JogadorCompacto, TabuleiroCompacto
+
+CORES = ["Vermelho", "Azul", "Verde", "Amarelo", "Preto", "Branco"]
+MAX_RODADAS = 200
+MAX_ATAQUES_POR_TURNO = 100
+# Mapa padrão: os territórios de Jogo, sem geografia (todos fazem fronteira entre si)
+MAPA_PADRAO = Mapa.completo(Jogo().territorios)
+MAPAS = {"padrao": MAPA_PADRAO, "war": MAPA_WAR}
+
+
+# P(defensor perde 0) e P(defensor perde no máximo 1) por (dados_ataque, dados_defesa):
+# uma única amostra uniforme decide a rolagem inteira
+def _limiares() -> dict:
+    limiares = {}
+    for ataque in range(1, 4):
+        for defesa in range(1, 3):
+            p = probabilidades_rolagem(ataque, defesa)
+            limiares[ataque, defesa] = (p[0], p[0] + p[1] if len(p) > 2 else 1.0)
+    return limiares
+
+
+LIMIARES = _limiares()
+
+
+# Tabuleiro da partida mais quem ainda está vivo e os contadores dos objetivos
+class Estado(TabuleiroCompacto):
+    __slots__ = ("vivos", "objetivos")
+
+    def __init__(self, mapa: Mapa, jogadores: list):
+        super().__init__(mapa, jogadores)
+        self.vivos = set(range(len(jogadores)))
+        self.objetivos = Acompanhamento(mapa.continentes, len(mapa))
+
+
+# Políticas: decidem reforços, ataques e o movimento do fim do turno; o motor valida as jogadas
+class Politica:
+    # Lista de (território, exércitos) somando `quantidade`
+    def reforcar(self, estado: Estado, jogador: int, quantidade: int, rng) -> list:
+        return [(rng.choice(estado.territorios_de(jogador)), quantidade)]
+
+    # Próximo ataque (origem, destino) ou None para encerrar os ataques do turno
+    def atacar(self, estado: Estado, jogador: int, rng):
+        return None
+
+    # (origem, destino, quantidade) ou None
+    def mover(self, estado: Estado, jogador: int, rng):
+        return None
+
+
+class PoliticaAleatoria(Politica):
+    def atacar(self, estado, jogador, rng):
+        ataques = estado.ataques(jogador)
+        if not ataques or rng.random() < 0.2:
+            return None
+        return rng.choice(ataques)
+
+
+# Reforça a fronteira, ataca quando tem vantagem e traz exércitos do interior para a fronteira
+class PoliticaAgressiva(Politica):
+    def __init__(self, vantagem: float = 1.0):
+        self.vantagem = vantagem
+
+    def reforcar(self, estado, jogador, quantidade, rng):
+        fronteira = estado.fronteira(jogador) or estado.territorios_de(jogador)
+        alvo = max(fronteira, key=lambda t: sum(estado.exercitos[v] for v in estado.mapa.vizinhos[t] if estado.dono[v] != jogador) - estado.exercitos[t])
+        return [(alvo, quantidade)]
+
+    def atacar(self, estado, jogador, rng):
+        melhor = None
+        for origem, destino in estado.ataques(jogador):
+            razao = (estado.exercitos[origem] - 1) / estado.exercitos[destino]
+            if razao >= self.vantagem and (melhor is None or razao > melhor[0]):
+                melhor = (razao, origem, destino)
+        return melhor and melhor[1:]
+
+    def mover(self, estado, jogador, rng):
+        fronteira = set(estado.fronteira(jogador))
+        for t in estado.territorios_de(jogador):
+            if t not in fronteira and estado.exercitos[t] > 1:
+                destinos = [v for v in estado.mapa.vizinhos[t] if v in fronteira]
+                if destinos:
+                    return t, destinos[0], estado.exercitos[t] - 1
+        return None
+
+
+POLITICAS = {"passiva": Politica, "aleatoria": PoliticaAleatoria, "agressiva": PoliticaAgressiva}
+
+
+def rolar(estado: Estado, origem: int, destino: int, rng):
+    dados_ataque = min(3, estado.exercitos[origem] - 1)
+    dados_defesa = min(2, estado.exercitos[destino])
+    zero, ate_um = LIMIARES[dados_ataque, dados_defesa]
+    sorteio = rng.random()
+    vitorias = 0 if sorteio < zero else (1 if sorteio < ate_um else 2)
+    estado.exercitos[destino] -= vitorias
+    estado.exercitos[origem] -= min(dados_ataque, dados_defesa) - vitorias
+    return dados_ataque
+
+
+def _montar(jogo: Jogo, mapa: Mapa) -> Estado:
+    estado = Estado(mapa, [JogadorCompacto(j.nome, j.cor, j.objetivo) for j in jogo.jogadores])
+    for i, jogador in enumerate(jogo.jogadores):
+        estado.objetivos.definir_objetivo(i, jogador.objetivo)
+        for nome in jogador.territorios:
+            estado.atribuir(mapa.id(nome), i, 1)
+            estado.objetivos.atribuir(mapa.id(nome), i)
+    return estado
+
+
+def _reforcar(estado: Estado, jogador: int, quantidade: int, politica: Politica, rng):
+    distribuidos = 0
+    for territorio, exercitos in politica.reforcar(estado, jogador, quantidade, rng):
+        if estado.dono[territorio] != jogador or exercitos < 0:
+            raise ValueError(f"Reforço inválido em {estado.mapa.territorios[territorio]}")
+        estado.exercitos[territorio] += exercitos
+        distribuidos += exercitos
+    if distribuidos != quantidade:
+        raise ValueError(f"Reforço deve somar {quantidade} exércitos")
+
+
+# Ataca até a política parar; devolve True se o jogador cumpriu o objetivo
+def _atacar(estado: Estado, jogador: int, politica: Politica, rng) -> bool:
+    for _ in range(MAX_ATAQUES_POR_TURNO):
+        jogada = politica.atacar(estado, jogador, rng)
+        if jogada is None:
+            return False
+        origem, destino = jogada
+        if estado.dono[origem] != jogador or estado.dono[destino] == jogador or estado.exercitos[origem] < 2 or destino not in estado.mapa.vizinhos[origem]:
+            raise ValueError("Ataque inválido")
+        dados = rolar(estado, origem, destino, rng)
+        if estado.exercitos[destino] > 0:
+            continue
+        # Conquista: ocupa com os exércitos que atacaram (deixando pelo menos 1 na origem)
+        ocupacao = min(dados, estado.exercitos[origem] - 1)
+        defensor = estado.atribuir(destino, jogador, ocupacao)
+        estado.exercitos[origem] -= ocupacao
+        estado.objetivos.atribuir(destino, jogador, defensor, conquista=True)
+        if estado.quantidade[defensor] == 0:
+            estado.vivos.discard(defensor)
+        if estado.objetivos.cumpriu(jogador):
+            return True
+    return False
+
+
+def _mover(estado: Estado, jogador: int, politica: Politica, rng):
+    jogada = politica.mover(estado, jogador, rng)
+    if jogada is None:
+        return
+    origem, destino, quantidade = jogada
+    if estado.dono[origem] != jogador or estado.dono[destino] != jogador or destino not in estado.mapa.vizinhos[origem] or not 0 < quantidade < estado.exercitos[origem]:
+        raise ValueError("Movimento inválido")
+    estado.exercitos[origem] -= quantidade
+    estado.exercitos[destino] += quantidade
+
+
+# Uma partida completa. Devolve o vencedor (índice em `politicas`, ou None se chegou a
+# max_rodadas), a ordem de jogo, os objetivos sorteados e o número de rodadas
+def jogar_partida(politicas: list, rng: random.Random, mapa: Mapa = MAPA_PADRAO, max_rodadas: int = MAX_RODADAS) -> dict:
+    jogo = Jogo(rng)
+    jogo.territorios = list(mapa.territorios)
+    for i in range(len(politicas)):
+        jogo.adicionar_jogador(Jogador(f"Jogador {i + 1}", CORES[i % len(CORES)]))
+    jogo.definir_ordem_jogadores()
+    jogo.distribuir_territorios()
+    jogo.distribuir_objetivos()
+    estado = _montar(jogo, mapa)
+    objetivos = [j.objetivo for j in estado.jogadores]
+    ordem = [jogo.jogadores.index(j) for j in jogo.ordem_jogadores]
+
+    # Exércitos iniciais: os 5 de Jogo.iniciar_rodada, distribuídos pela política
+    jogo.iniciar_rodada()
+    for i in ordem:
+        _reforcar(estado, i, jogo.jogadores[i].exercitos, politicas[i], rng)
+
+    vencedor = None
+    rodada = 0
+    while vencedor is None and rodada < max_rodadas:
+        rodada += 1
+        for i in ordem:
+            if i not in estado.vivos:
+                continue
+            _reforcar(estado, i, max(3, estado.quantidade[i] // 2), politicas[i], rng)
+            if _atacar(estado, i, politicas[i], rng) or len(estado.vivos) == 1:
+                vencedor = i
+                break
+            _mover(estado, i, politicas[i], rng)
+    return {"vencedor": vencedor, "ordem": ordem, "objetivos": objetivos, "rodadas": rodada}
+
+
+def _novo_resumo() -> dict:
+    return {
+        "partidas": 0,
+        "empates": 0,
+        "vitorias": Counter(),
+        "vitorias_por_posicao": Counter(),
+        "objetivos": Counter(),
+        "vitorias_por_objetivo": Counter(),
+        "rodadas": Counter(),
+    }
+
+
+def _acumular(resumo: dict, partida: dict):
+    resumo["partidas"] += 1
+    resumo["rodadas"][partida["rodadas"]] += 1
+    resumo["objetivos"].update(partida["objetivos"])
+    vencedor = partida["vencedor"]
+    if vencedor is None:
+        resumo["empates"] += 1
+        return
+    resumo["vitorias"][vencedor] += 1
+    resumo["vitorias_por_posicao"][partida["ordem"].index(vencedor)] += 1
+    resumo["vitorias_por_objetivo"][partida["objetivos"][vencedor]] += 1
+
+
+def _juntar(total: dict, parcial: dict):
+    for chave, valor in parcial.items():
+        total[chave] += valor
+
+
+# Executado em cada processo: só o resumo volta pelo pipe, não as partidas
+def _executar_lote(politicas: list, semente: int, quantidade: int, mapa: Mapa, max_rodadas: int) -> dict:
+    rng = random.Random(semente)
+    resumo = _novo_resumo()
+    for _ in range(quantidade):
+        _acumular(resumo, jogar_partida(politicas, rng, mapa, max_rodadas))
+    return resumo
+
+
+# Taxas a partir das contagens acumuladas
+def resumir(resumo: dict, nomes: list) -> dict:
+    partidas = resumo["partidas"]
+    rodadas = sorted(resumo["rodadas"].items())
+
+    def percentil(p):
+        limite, acumulado = p * partidas, 0
+        for valor, contagem in rodadas:
+            acumulado += contagem
+            if acumulado >= limite:
+                return valor
+        return 0
+
+    return {
+        "partidas": partidas,
+        "empates": resumo["empates"] / partidas,
+        "vitoria_por_jogador": {f"{i + 1}:{nome}": resumo["vitorias"][i] / partidas for i, nome in enumerate(nomes)},
+        "vitoria_por_posicao": {p + 1: resumo["vitorias_por_posicao"][p] / partidas for p in range(len(nomes))},
+        # Chance de vencer de quem recebeu cada objetivo: mede o equilíbrio dos objetivos
+        "vitoria_por_objetivo": {o: resumo["vitorias_por_objetivo"][o] / n for o, n in sorted(resumo["objetivos"].items())},
+        "rodadas": {
+            "media": sum(valor * contagem for valor, contagem in rodadas) / partidas,
+            "p50": percentil(0.50),
+            "p99": percentil(0.99),
+            "max": rodadas[-1][0],
+        },
+    }
+
+
+# Joga `partidas` partidas em `processos` processos (1 = no processo atual). Cada lote tem
+# semente própria derivada de `semente`, então o resultado não depende do escalonamento
+def simular(partidas: int, politicas: list, semente: int = 0, processos: int = None, lote: int = 1000,
+            mapa: Mapa = MAPA_PADRAO, max_rodadas: int = MAX_RODADAS) -> dict:
+    tarefas = [
+        (politicas, semente * 1_000_003 + indice, min(lote, partidas - inicio), mapa, max_rodadas)
+        for indice, inicio in enumerate(range(0, partidas, lote))
+    ]
+    total = _novo_resumo()
+    if processos == 1:
+        for tarefa in tarefas:
+            _juntar(total, _executar_lote(*tarefa))
+    else:
+        with ProcessPoolExecutor(processos) as executor:
+            for parcial in executor.map(_executar_lote, *zip(*tarefas)):
+                _juntar(total, parcial)
+    return resumir(total, [type(p).__name__ for p in politicas])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulação em massa de partidas entre bots")
+    parser.add_argument("--partidas", type=int, default=10_000)
+    parser.add_argument("--politicas", nargs="+", default=["agressiva", "agressiva", "aleatoria"], choices=sorted(POLITICAS))
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--processos", type=int, default=None)
+    parser.add_argument("--lote", type=int, default=1000)
+    parser.add_argument("--mapa", default="padrao", choices=sorted(MAPAS))
+    args = parser.parse_args()
+    resultado = simular(args.partidas, [POLITICAS[p]() for p in args.politicas], args.semente, args.processos, args.lote, MAPAS[args.mapa])
+    for chave, valor in resultado.items():
+        print(f"{chave}: {valor}")
@@ -0,0 +1,135 @@
+# objetivos.py
+# Objetivos do War: cada texto (Jogo.objetivos, partida.OBJETIVOS) é interpretado uma vez numa
+# Meta estruturada, e o Acompanhamento mantém contadores por jogador (territórios no total e
+# por continente, continentes completos, se já eliminou alguém), atualizados a cada troca de
+# dono. Assim verificar um objetivo depois de um ataque é O(1), sem varrer os territórios.
+# Sem continentes no tabuleiro, objetivos de continente valem como conquista total.
+# Um texto que não se reconhece (ex.: dados antigos ou editados à mão) fica sem meta, com um
+# aviso no log: o jogador nunca cumpre o objetivo, mas a partida carrega.
+import logging
+import re
+from collections import Counter
+
+logger = logging.getLogger(__name__)
+
+NUMEROS = {"um": 1, "uma": 1, "dois": 2, "duas": 2, "três": 3, "quatro": 4, "cinco": 5, "seis": 6}
+ORDINAIS = {"terceiro": 1, "quarto": 2, "quinto": 3}
+
+
+class Meta:
+    __slots__ = ("texto", "territorios", "continentes", "continentes_extras", "eliminar")
+
+    def __init__(self, texto: str, territorios: int = 0, continentes: frozenset = frozenset(), continentes_extras: int = 0, eliminar: bool = False):
+        self.texto = texto
+        self.territorios = territorios
+        self.continentes = continentes
+        self.continentes_extras = continentes_extras
+        self.eliminar = eliminar
+
+
+def _numero(palavra: str) -> int:
+    return int(palavra) if palavra.isdigit() else NUMEROS[palavra]
+
+
+# Interpreta o texto do objetivo. `continentes` são os nomes dos continentes do tabuleiro e
+# `total` o número de territórios (metas de contagem acima do total viram conquista total)
+def interpretar(texto: str, continentes=(), total: int = None) -> Meta:
+    minusculo = texto.lower()
+    contagem = re.fullmatch(r"(?:conquistar|controlar) (\w+) territórios", minusculo)
+    if contagem:
+        quantidade = _numero(contagem.group(1))
+        return Meta(texto, territorios=min(quantidade, total) if total else quantidade)
+    if re.fullmatch(r"eliminar (um|uma) (jogador|oponente|adversário)", minusculo):
+        return Meta(texto, eliminar=True)
+    if not continentes and total:
+        return Meta(texto, territorios=total)
+    quantos = re.fullmatch(r"(?:conquistar|controlar) (\w+) continentes", minusculo)
+    if quantos:
+        return Meta(texto, continentes_extras=_numero(quantos.group(1)))
+    lista = re.fullmatch(r"(?:conquistar|controlar) (.+)", texto, re.IGNORECASE)
+    if lista:
+        nomes, extras = set(), 0
+        for parte in re.split(r", | e ", lista.group(1)):
+            parte = re.sub(r"^(a|o|as|os) ", "", parte.strip())
+            ordinal = re.fullmatch(r"(?:um|uma) (\w+) continente", parte)
+            if ordinal and ordinal.group(1) in ORDINAIS:
+                extras += 1
+            elif parte in continentes:
+                nomes.add(parte)
+            else:
+                break
+        else:
+            return Meta(texto, continentes=frozenset(nomes), continentes_extras=extras)
+    raise ValueError(f"Objetivo não reconhecido: {texto}")
+
+
+class Acompanhamento:
+    # continentes: nome -> territórios (nomes ou ids, os mesmos usados em atribuir)
+    def __init__(self, continentes: dict = None, total: int = None):
+        continentes = continentes or {}
+        self.tamanho = {nome: len(membros) for nome, membros in continentes.items()}
+        self.continente_de = {t: nome for nome, membros in continentes.items() for t in membros}
+        self.total = total
+        self.metas = {}
+        self.territorios = Counter()      # jogador -> territórios
+        self.por_continente = {}          # jogador -> Counter(continente -> territórios)
+        self.completos = {}               # jogador -> continentes completos
+        self.eliminou = set()
+        self._cache = {}                  # texto -> Meta (ou None), cada texto é interpretado uma vez
+
+    def definir_objetivo(self, jogador, texto: str):
+        if texto is None:
+            self.metas.pop(jogador, None)
+            return
+        if texto not in self._cache:
+            try:
+                self._cache[texto] = interpretar(texto, self.tamanho, self.total)
+            except ValueError as erro:
+                logger.warning("%s; o jogador fica sem meta", erro)
+                self._cache[texto] = None
+        meta = self._cache[texto]
+        if meta is None:
+            self.metas.pop(jogador, None)
+        else:
+            self.metas[jogador] = meta
+
+    # Troca de dono de um território; `conquista` marca eliminação se o anterior ficou sem nenhum
+    def atribuir(self, territorio, novo, anterior=None, conquista: bool = False):
+        if anterior == novo:
+            return
+        continente = self.continente_de.get(territorio)
+        if anterior is not None:
+            self.territorios[anterior] -= 1
+            if continente is not None:
+                contagem = self.por_continente[anterior]
+                if contagem[continente] == self.tamanho[continente]:
+                    self.completos[anterior].discard(continente)
+                contagem[continente] -= 1
+            if conquista and self.territorios[anterior] == 0:
+                self.eliminou.add(novo)
+        if novo is not None:
+            self.territorios[novo] += 1
+            if continente is not None:
+                contagem = self.por_continente.setdefault(novo, Counter())
+                contagem[continente] += 1
+                if contagem[continente] == self.tamanho[continente]:
+                    self.completos.setdefault(novo, set()).add(continente)
+
+    def remover_jogador(self, jogador):
+        for registro in (self.metas, self.territorios, self.por_continente, self.completos):
+            registro.pop(jogador, None)
+        self.eliminou.discard(jogador)
+
+    def cumpriu(self, jogador) -> bool:
+        meta = self.metas.get(jogador)
+        if meta is None:
+            return False
+        if meta.eliminar:
+            return jogador in self.eliminou
+        if meta.territorios:
+            return self.territorios[jogador] >= meta.territorios
+        completos = self.completos.get(jogador, ())
+        return meta.continentes.issubset(completos) and len(completos) >= len(meta.continentes) + meta.continentes_extras
+
+    def concluidos(self) -> list:
+        return [jogador for jogador in self.metas if self.cumpriu(jogador)]
@@ -0,0 +1,312 @@
+# partida.py
+# Estado de cada partida (jogadores, tabuleiro, cores, persistência) e o registro de partidas por id.
+import os
+import re
+import threading
+import uuid
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Optional
+from cartas import Baralho
+from diario import Diario, Fluxos
+from eventos import Transmissao
+from gravador import Gravador
+from mapa import CONTINENTES, MAPA_WAR
+from modelos import Jogador
+from objetivos import Acompanhamento
+from persistencia import Persistencia, decodificar_jogador
+from persistencia_sqlite import PersistenciaSQLite
+from posse import Posse
+from registro import RegistroJogadores
+from tabuleiro import Tabuleiro
+from travas import TravasDaPartida
+from visoes import Visoes
+
+# Mapa do War (mapa.py), montado uma vez na importação: fronteiras e continentes de todas as partidas
+MAPA = MAPA_WAR
+TERRITORIOS_INICIAIS = list(MAPA.territorios)
+CORES = ["Vermelho", "Azul", "Verde", "Amarelo"]
+OBJETIVOS = ["Conquistar 24 territórios", "Eliminar um oponente", "Controlar dois continentes"]
+
+# Partida usada pelas rotas sem prefixo /jogos/{id}, persistida no dados.json original
+JOGO_PADRAO = "padrao"
+# Onde as partidas são gravadas: "json" (snapshot + log) ou "sqlite" (tabelas indexadas)
+ARMAZENAMENTOS = ("json", "sqlite")
+ID_VALIDO = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+class Partida:
+    # semente: fixa os sorteios da partida (dados, ordem, territórios, objetivos, cartas);
+    # sem ela, cada carga sorteia uma semente nova
+    def __init__(self, id: str, persistencia: Persistencia, durabilidade: str = "direta", atraso_ms: float = 5, semente: Optional[int] = None):
+        self.id = id
+        self.persistencia = persistencia
+        self.gravador = Gravador(persistencia, durabilidade, atraso_ms)
+        self.transmissao = Transmissao(id)
+        self.visoes = Visoes()
+        self.jogadores = RegistroJogadores()
+        self.tabuleiro = Tabuleiro(MAPA)
+        self.objetivos = Acompanhamento(CONTINENTES, len(MAPA))
+        self.baralho = Baralho()
+        self.territorios_iniciais = list(TERRITORIOS_INICIAIS)
+        self.cores_disponiveis = list(CORES)
+        # Travas por jogador e exclusiva (ver travas.py); partidas diferentes não se bloqueiam
+        self.travas = TravasDaPartida()
+        self._trava_cores = threading.Lock()
+        self.fluxos = Fluxos(semente)
+        self.diario = None
+        self.posse = None       # trava de dono entre processos (posse.py), tomada por Partidas
+        # Registros e eventos retidos durante uma transação (None fora dela)
+        self._lote = None
+        self._eventos = None
+
+    # Tabuleiro, objetivos, cores e baralho são montados na carga; cada Jogador (pydantic) só no
+    # primeiro acesso, a partir dos dados já decodificados aqui (a linha é lida uma vez só)
+    def carregar(self):
+        self._montar(())
+        self.jogadores.fabrica = self._construir_jogador
+        cores = set()
+        dados_salvos = self.persistencia.carregar(brutos=True)
+        for registro in dados_salvos["jogadores"]:
+            dados = decodificar_jogador(registro)
+            territorios = set(dados.get("territorios", ()))
+            self.jogadores.adicionar_dados(dados["nome"], (dados, territorios))
+            self.tabuleiro.registrar_jogador(dados["nome"], territorios)
+            self.objetivos.definir_objetivo(dados["nome"], dados.get("objetivo"))
+            self.baralho.adicionar_mao(dados["nome"], dados.get("cartas", ()), dados.get("trocas", 0))
+            if dados.get("eliminou"):
+                self.objetivos.eliminou.add(dados["nome"])
+            for territorio in territorios:
+                self.objetivos.atribuir(territorio, dados["nome"])
+            cores.add(dados.get("cor_exercito"))
+        self.cores_disponiveis = [cor for cor in CORES if cor not in cores]
+        # O total de trocas é da partida, não soma de quem ainda joga (quem saiu já trocou);
+        # partidas gravadas antes dele ficam com a soma das trocas dos jogadores
+        trocas = dados_salvos.get("partida", {}).get("trocas")
+        if trocas is not None:
+            self.baralho.trocas = trocas
+
+    # Diário de ações (diario.py) num segmento novo com a semente desta carga. Uma partida
+    # anterior ao diário começa com o estado atual no cabeçalho: essa primeira abertura é
+    # ansiosa, monta e serializa todos os jogadores (custo O(jogadores), uma vez por partida);
+    # as seguintes encontram o diário e mantêm os jogadores preguiçosos
+    def abrir_diario(self, caminho: str):
+        diario = Diario(caminho)
+        estado = None if diario.existe or not len(self.jogadores) else [j.model_dump() for j in self.jogadores]
+        diario.abrir(self.fluxos.semente, estado, {"trocas": self.baralho.trocas})
+        self.diario = diario
+
+    # O conjunto de territórios é o mesmo registrado no tabuleiro
+    @staticmethod
+    def _construir_jogador(pendente) -> Jogador:
+        dados, territorios = pendente
+        jogador = Jogador(**dados)
+        jogador.territorios = territorios
+        return jogador
+
+    def _montar(self, jogadores):
+        self.jogadores = RegistroJogadores()
+        self.tabuleiro = Tabuleiro(MAPA)
+        self.objetivos = Acompanhamento(CONTINENTES, len(MAPA))
+        self.baralho = Baralho()
+        for j in jogadores:
+            self.adicionar_jogador(j)
+
+    def adicionar_jogador(self, jogador: Jogador):
+        self.jogadores.adicionar(jogador)
+        self.tabuleiro.registrar_jogador(jogador.nome, jogador.territorios)
+        self.objetivos.definir_objetivo(jogador.nome, jogador.objetivo)
+        self.baralho.adicionar_mao(jogador.nome, jogador.cartas, jogador.trocas)
+        if jogador.eliminou:
+            self.objetivos.eliminou.add(jogador.nome)
+        for territorio in jogador.territorios:
+            self.objetivos.atribuir(territorio, jogador.nome)
+
+    def remover_jogador(self, nome: str) -> Jogador:
+        jogador = self.jogadores.remover(nome)
+        self.tabuleiro.remover_jogador(nome)
+        self.objetivos.remover_jogador(nome)
+        self.baralho.remover_mao(nome, jogador.cartas)
+        if jogador.cor_exercito:
+            self.liberar_cor(jogador.cor_exercito)
+        return jogador
+
+    # Reserva atômica de cor: entre dois jogadores pedindo a mesma cor, só um consegue
+    def reservar_cor(self, cor: str) -> bool:
+        with self._trava_cores:
+            if cor not in self.cores_disponiveis:
+                return False
+            self.cores_disponiveis.remove(cor)
+            return True
+
+    def liberar_cor(self, cor: str):
+        with self._trava_cores:
+            if cor in CORES and cor not in self.cores_disponiveis:
+                self.cores_disponiveis.append(cor)
+
+    # Troca o dono no tabuleiro e nos contadores de objetivos; devolve o dono anterior
+    def atribuir(self, territorio: str, nome: str, conquista: bool = False) -> Optional[str]:
+        anterior = self.tabuleiro.atribuir(territorio, nome)
+        self.objetivos.atribuir(territorio, nome, anterior, conquista)
+        return anterior
+
+    # As mutações passam pelo gravador, que decide se grava já ou enfileira
+    def registrar(self, op: str, **dados):
+        self.registrar_lote([dict(op=op, **dados)])
+
+    # Também invalida as visões em cache dos jogadores afetados (numa transação desfeita,
+    # a invalidação fica: custa só uma remontagem)
+    def registrar_lote(self, registros: list):
+        self.visoes.invalidar(registros)
+        if self._lote is not None:
+            self._lote.extend(registros)
+        else:
+            self.gravador.registrar_lote(registros)
+
+    # Eventos para os espectadores da partida
+    def notificar(self, tipo: str, **dados):
+        if self._eventos is not None:
+            self._eventos.append((tipo, dados))
+        elif self.transmissao.observadores:
+            self.transmissao.notificar_observadores(tipo, **dados)
+
+    # Tudo ou nada: em caso de erro o estado volta à cópia tirada no início e nada é
+    # gravado nem notificado; no sucesso, todos os registros seguem para o gravador num
+    # único lote e os eventos são enviados em ordem
+    @contextmanager
+    def transacao(self):
+        copia = ([j.model_copy(deep=True) for j in self.jogadores], list(self.cores_disponiveis), list(self.territorios_iniciais), self.baralho.copia())
+        self._lote = []
+        self._eventos = []
+        try:
+            yield
+        except BaseException:
+            self._montar(copia[0])
+            self.cores_disponiveis, self.territorios_iniciais, self.baralho = copia[1], copia[2], copia[3]
+            raise
+        finally:
+            lote, self._lote = self._lote, None
+            eventos, self._eventos = self._eventos, None
+        self.gravador.registrar_lote(lote)
+        for tipo, dados in eventos:
+            self.transmissao.notificar_observadores(tipo, **dados)
+
+    def fechar(self):
+        if self.diario is not None:
+            self.diario.fechar()
+        self.persistencia.fechar()
+        if self.posse is not None:
+            self.posse.liberar()
+
+
+class Partidas:
+    # Com "sqlite", a partida padrão fica em dados.db, importada do dados.json na primeira carga.
+    # diario: grava as ações de cada partida ao lado dos dados (<arquivo>.acoes)
+    def __init__(self, diretorio: str = "jogos", caminho_padrao: str = "dados.json", durabilidade: str = "direta", atraso_ms: float = 5, armazenamento: str = "json", diario: bool = True):
+        if armazenamento not in ARMAZENAMENTOS:
+            raise ValueError(f"Armazenamento inválido: {armazenamento}")
+        self.armazenamento = armazenamento
+        self.diretorio = diretorio
+        self.caminho_padrao = caminho_padrao
+        self.durabilidade = durabilidade
+        self.atraso_ms = atraso_ms
+        self.diario = diario
+        self._partidas = {}
+        self._carregando = {}   # id -> Future da carga em andamento
+        self._trava = threading.Lock()
+
+    def caminho(self, id: str) -> str:
+        if id == JOGO_PADRAO:
+            caminho = self.caminho_padrao
+        else:
+            caminho = os.path.join(self.diretorio, f"{id}.json")
+        return os.path.splitext(caminho)[0] + ".db" if self.armazenamento == "sqlite" else caminho
+
+    def criar(self, id: Optional[str] = None, semente: Optional[int] = None) -> Partida:
+        id = id or uuid.uuid4().hex[:12]
+        if not ID_VALIDO.match(id):
+            raise ValueError("Id de partida inválido")
+        with self._trava:
+            if id in self._partidas or id in self._carregando or self._existe_em_disco(id):
+                raise ValueError("Partida já existe")
+            os.makedirs(self.diretorio, exist_ok=True)
+            partida = self._abrir(id, semente)
+            partida.persistencia.compactar()
+            self._partidas[id] = partida
+            return partida
+
+    # Partidas salvas são carregadas do disco no primeiro acesso. A carga acontece fora da
+    # trava: uma partida grande carregando não segura as outras; quem pedir a mesma partida
+    # espera a mesma carga
+    def obter(self, id: str) -> Optional[Partida]:
+        partida = self._partidas.get(id)
+        if partida is not None or not ID_VALIDO.match(id):
+            return partida
+        with self._trava:
+            partida = self._partidas.get(id)
+            if partida is not None:
+                return partida
+            carga = self._carregando.get(id)
+            if carga is None:
+                if id != JOGO_PADRAO and not self._existe_em_disco(id):
+                    return None
+                carga = self._carregando[id] = Future()
+                responsavel = True
+            else:
+                responsavel = False
+        if not responsavel:
+            return carga.result()
+        try:
+            partida = self._abrir(id)
+        except BaseException as erro:
+            with self._trava:
+                del self._carregando[id]
+            carga.set_exception(erro)
+            raise
+        with self._trava:
+            self._partidas[id] = partida
+            del self._carregando[id]
+        carga.set_result(partida)
+        return partida
+
+    # Descarrega as filas de gravação antes de fechar (chamar de dentro do event loop)
+    async def parar(self):
+        for partida in list(self._partidas.values()):
+            await partida.gravador.parar()
+
+    def fechar(self):
+        with self._trava:
+            for partida in self._partidas.values():
+                partida.fechar()
+            self._partidas.clear()
+
+    def __len__(self) -> int:
+        return len(self._partidas)
+
+    # Ids das partidas com carga em andamento
+    def carregando(self) -> list:
+        with self._trava:
+            return list(self._carregando)
+
+    # Só abre a partida que nenhum outro processo abriu (PartidaEmOutroProcesso, de posse.py)
+    def _abrir(self, id: str, semente: Optional[int] = None) -> Partida:
+        posse = Posse(id, self.caminho(id))
+        try:
+            if self.armazenamento == "sqlite":
+                importar_de = self.caminho_padrao if id == JOGO_PADRAO else None
+                persistencia = PersistenciaSQLite(self.caminho(id), importar_de=importar_de)
+            else:
+                persistencia = Persistencia(self.caminho(id))
+            partida = Partida(id, persistencia, self.durabilidade, self.atraso_ms, semente)
+            partida.posse = posse
+            partida.carregar()
+            if self.diario:
+                partida.abrir_diario(self.caminho(id) + ".acoes")
+        except BaseException:
+            posse.liberar()
+            raise
+        return partida
+
+    def _existe_em_disco(self, id: str) -> bool:
+        caminho = self.caminho(id)
+        return any(os.path.exists(caminho + sufixo) for sufixo in ("", ".log", ".log.1"))
@@ -0,0 +1,259 @@
+# persistencia.py
+# Motor de persistência: log de mutações (append-only) + snapshot periódico.
+# Cada mutação vira uma linha "crc32 json" em <arquivo>.log; o snapshot (o próprio
+# arquivo JSON) só é reescrito quando o log passa do limite, em segundo plano.
+# O snapshot compacto tem um jogador por linha (continua sendo um documento JSON válido):
+# a carga lê o arquivo mapeado em memória linha a linha e guarda cada jogador como os
+# bytes da linha; só os jogadores tocados pelo log são decodificados. O estado da partida
+# que não é de nenhum jogador (ex.: total de trocas de cartas) vai no cabeçalho do snapshot
+# e muda pelo registro "partida".
+import mmap
+import os
+import re
+import threading
+import zlib
+from typing import List
+import metricas
+from serializacao import dumps, loads
+
+TEMPO, LOTES, REGISTROS = metricas.persistencia("json")
+BYTES = metricas.registro.contador("war_persistencia_bytes_total", "Bytes escritos no log", armazenamento="json")
+
+
+def codificar_registro(registro: dict) -> bytes:
+    corpo = dumps(registro)
+    return b"%08x %s\n" % (zlib.crc32(corpo), corpo)
+
+
+def decodificar_registro(linha: bytes):
+    # Linhas incompletas ou corrompidas (queda no meio da escrita) retornam None
+    if not linha.endswith(b"\n") or len(linha) < 10 or linha[8:9] != b" ":
+        return None
+    corpo = linha[9:-1]
+    try:
+        if int(linha[:8], 16) != zlib.crc32(corpo):
+            return None
+        return loads(corpo)
+    except ValueError:
+        return None
+
+
+CABECALHO = re.compile(rb'\{"seq":(\d+),(?:"partida":(\{.*\}),)?"jogadores":\[\n')
+NOME = re.compile(rb'\{"nome":("(?:[^"\\]|\\.)*")')
+
+
+# Dados de um jogador guardado como bytes (linha do snapshot) ou já decodificado
+def decodificar_jogador(dados):
+    return loads(dados) if isinstance(dados, bytes) else dados
+
+
+def _nome_da_linha(linha: bytes) -> str:
+    inicio = NOME.match(linha)
+    return loads(inicio.group(1)) if inicio else loads(linha)["nome"]
+
+
+def _decodificado(jogadores: dict, nome: str) -> dict:
+    dados = jogadores[nome]
+    if isinstance(dados, bytes):
+        dados = jogadores[nome] = loads(dados)
+    return dados
+
+
+# Aplica um registro do log sobre o estado {nome: dados do jogador} e o da partida
+def aplicar(jogadores: dict, registro: dict, partida: dict = None):
+    op = registro["op"]
+    if op == "partida":
+        if partida is not None:
+            partida.update(registro["campos"])
+    elif op == "novo":
+        jogadores[registro["jogador"]["nome"]] = registro["jogador"]
+    elif op == "set":
+        _decodificado(jogadores, registro["nome"]).update(registro["campos"])
+    elif op == "add":
+        _decodificado(jogadores, registro["nome"]).setdefault(registro["campo"], []).append(registro["valor"])
+    elif op == "del":
+        _decodificado(jogadores, registro["nome"])[registro["campo"]].remove(registro["valor"])
+    elif op == "rem":
+        del jogadores[registro["nome"]]
+    elif op == "ordem":
+        ordenados = {nome: jogadores.pop(nome) for nome in registro["nomes"] if nome in jogadores}
+        ordenados.update(jogadores)
+        jogadores.clear()
+        jogadores.update(ordenados)
+    else:
+        raise ValueError(f"Operação desconhecida no log: {op}")
+
+
+class Persistencia:
+    # indentar: snapshot indentado para leitura humana (o padrão é compacto)
+    def __init__(self, caminho: str, limite_log: int = 1000, sincronizar: bool = True, indentar: bool = False):
+        self.caminho = caminho
+        self.indentar = indentar
+        self.caminho_log = caminho + ".log"
+        self.caminho_compactando = caminho + ".log.1"
+        self.limite_log = limite_log
+        self.sincronizar = sincronizar
+        self._trava = threading.Lock()
+        self._seq = 0
+        self._registros_no_log = 0
+        self._log = None
+        self._compactacao = None
+
+    # Snapshot + cauda do log; descarta (e trunca) registros incompletos no fim do log.
+    # Com brutos=True, os jogadores que o log não tocou vêm como os bytes JSON da linha
+    # do snapshot (decodificar_jogador decodifica)
+    def carregar(self, brutos: bool = False) -> dict:
+        with self._trava:
+            self._aguardar_compactacao()
+            jogadores, partida, seq = self._ler_snapshot()
+            pendente = os.path.exists(self.caminho_compactando)
+            if pendente:
+                seq = self._reaplicar(self.caminho_compactando, jogadores, partida, seq)[0]
+            seq, validos, tamanho_valido = self._reaplicar(self.caminho_log, jogadores, partida, seq)
+            if os.path.exists(self.caminho_log) and os.path.getsize(self.caminho_log) > tamanho_valido:
+                with open(self.caminho_log, "r+b") as f:
+                    f.truncate(tamanho_valido)
+            self._seq = seq
+            self._registros_no_log = validos
+            if pendente:
+                # Compactação interrompida: consolida agora, antes de aceitar escritas
+                self._escrever_snapshot(jogadores, partida, seq)
+                os.remove(self.caminho_compactando)
+            if brutos:
+                return {"jogadores": list(jogadores.values()), "partida": partida}
+            return {"jogadores": [decodificar_jogador(j) for j in jogadores.values()], "partida": partida}
+
+    def registrar(self, op: str, **dados):
+        self.registrar_lote([dict(op=op, **dados)])
+
+    # Grava vários registros com uma única escrita (e um único fsync)
+    def registrar_lote(self, registros: List[dict]):
+        if not registros:
+            return
+        with self._trava, TEMPO.medir():
+            linhas = []
+            for registro in registros:
+                self._seq += 1
+                linhas.append(codificar_registro(dict(registro, s=self._seq)))
+            if self._log is None:
+                self._log = open(self.caminho_log, "ab")
+            conteudo = b"".join(linhas)
+            self._log.write(conteudo)
+            self._log.flush()
+            if self.sincronizar:
+                os.fsync(self._log.fileno())
+            LOTES.inc()
+            REGISTROS.inc(len(registros))
+            BYTES.inc(len(conteudo))
+            self._registros_no_log += len(registros)
+            if self._registros_no_log >= self.limite_log and not self._compactando():
+                self._rotacionar()
+
+    # Força a consolidação do log no snapshot e espera terminar (cria o snapshot se ainda não existir)
+    def compactar(self):
+        with self._trava:
+            self._aguardar_compactacao()
+            if self._registros_no_log:
+                self._rotacionar()
+                self._aguardar_compactacao()
+            elif not os.path.exists(self.caminho):
+                self._escrever_snapshot({}, {}, self._seq)
+
+    def fechar(self):
+        with self._trava:
+            self._aguardar_compactacao()
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+
+    def _compactando(self) -> bool:
+        if self._compactacao is not None and self._compactacao.is_alive():
+            return True
+        self._compactacao = None
+        return False
+
+    def _rotacionar(self):
+        # Se uma compactação anterior falhou, o .log.1 ainda existe: tenta de novo antes de rotacionar
+        if not os.path.exists(self.caminho_compactando):
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+            os.replace(self.caminho_log, self.caminho_compactando)
+            self._registros_no_log = 0
+        self._compactacao = threading.Thread(target=self._compactar, daemon=True)
+        self._compactacao.start()
+
+    def _aguardar_compactacao(self):
+        if self._compactacao is not None:
+            self._compactacao.join()
+            self._compactacao = None
+
+    # Roda em segundo plano: só lê arquivos, nunca o estado em memória do servidor
+    def _compactar(self):
+        jogadores, partida, seq = self._ler_snapshot()
+        seq = self._reaplicar(self.caminho_compactando, jogadores, partida, seq)[0]
+        self._escrever_snapshot(jogadores, partida, seq)
+        os.remove(self.caminho_compactando)
+
+    def _ler_snapshot(self):
+        if not os.path.exists(self.caminho) or os.path.getsize(self.caminho) == 0:
+            return {}, {}, 0
+        with open(self.caminho, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+            cabecalho = CABECALHO.fullmatch(mapa.readline())
+            if cabecalho is None:
+                # Snapshot indentado ou escrito à mão: documento inteiro
+                dados = loads(mapa[:])
+                return {j["nome"]: j for j in dados["jogadores"]}, dados.get("partida", {}), dados.get("seq", 0)
+            jogadores = {}
+            for linha in iter(mapa.readline, b""):
+                linha = linha.rstrip(b",\n")
+                if linha == b"]}":
+                    break
+                if not linha:
+                    continue
+                jogadores[_nome_da_linha(linha)] = linha
+            partida = loads(cabecalho.group(2)) if cabecalho.group(2) else {}
+            return jogadores, partida, int(cabecalho.group(1))
+
+    def _reaplicar(self, caminho: str, jogadores: dict, partida: dict, seq: int):
+        validos = 0
+        tamanho_valido = 0
+        if not os.path.exists(caminho):
+            return seq, validos, tamanho_valido
+        with open(caminho, "rb") as f:
+            for linha in f:
+                registro = decodificar_registro(linha)
+                if registro is None:
+                    break
+                tamanho_valido += len(linha)
+                validos += 1
+                if registro["s"] > seq:
+                    aplicar(jogadores, registro, partida)
+                    seq = registro["s"]
+        return seq, validos, tamanho_valido
+
+    # Escrita atômica: arquivo temporário + fsync + os.replace
+    def _escrever_snapshot(self, jogadores: dict, partida: dict, seq: int):
+        temporario = self.caminho + ".tmp"
+        with open(temporario, "wb") as f:
+            if self.indentar:
+                documento = {"seq": seq, "partida": partida} if partida else {"seq": seq}
+                documento["jogadores"] = [decodificar_jogador(j) for j in jogadores.values()]
+                f.write(dumps(documento, True))
+            else:
+                # Um jogador por linha; os que vieram do snapshot anterior são copiados sem recodificar
+                if partida:
+                    f.write(b'{"seq":%d,"partida":%s,"jogadores":[\n' % (seq, dumps(partida)))
+                else:
+                    f.write(b'{"seq":%d,"jogadores":[\n' % seq)
+                f.write(b",\n".join(j if isinstance(j, bytes) else dumps(j) for j in jogadores.values()))
+                f.write(b"\n]}\n" if jogadores else b"]}\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporario, self.caminho)
+        if hasattr(os, "O_DIRECTORY"):
+            diretorio = os.open(os.path.dirname(os.path.abspath(self.caminho)), os.O_DIRECTORY)
+            try:
+                os.fsync(diretorio)
+            finally:
+                os.close(diretorio)
@@ -0,0 +1,192 @@
+# persistencia_sqlite.py
+# Persistência em SQLite com a mesma interface de Persistencia (carregar, registrar,
+# registrar_lote, compactar, fechar). Jogadores, territórios e cartas ficam em tabelas
+# indexadas pelo dono, e cada registro do log vira só os UPDATE/INSERT/DELETE das linhas
+# que mudaram. O estado da partida que não é de nenhum jogador fica na tabela partida
+# (chave, valor em JSON). O banco roda em modo WAL e cada lote é uma transação (um único commit).
+import os
+import sqlite3
+import threading
+from typing import List
+import metricas
+from serializacao import dumps_str, loads
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS jogadores (
+    nome TEXT PRIMARY KEY,
+    posicao INTEGER NOT NULL,
+    cor_exercito TEXT,
+    objetivo TEXT,
+    exercitos INTEGER NOT NULL DEFAULT 0,
+    trocas INTEGER NOT NULL DEFAULT 0,
+    eliminou INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS territorios (
+    territorio TEXT PRIMARY KEY,
+    dono TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS territorios_dono ON territorios (dono);
+CREATE TABLE IF NOT EXISTS cartas (
+    id INTEGER PRIMARY KEY,
+    dono TEXT NOT NULL,
+    carta TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS cartas_dono ON cartas (dono);
+CREATE TABLE IF NOT EXISTS partida (
+    chave TEXT PRIMARY KEY,
+    valor TEXT NOT NULL
+);
+"""
+
+# Campos do Jogador que são colunas de jogadores; territorios e cartas têm tabela própria
+COLUNAS = ("cor_exercito", "objetivo", "exercitos", "trocas", "eliminou")
+# Colunas acrescentadas depois da primeira versão do esquema: ALTER TABLE nos bancos antigos
+NOVAS_COLUNAS = {
+    "trocas": "trocas INTEGER NOT NULL DEFAULT 0",
+    "eliminou": "eliminou INTEGER NOT NULL DEFAULT 0",
+}
+LISTAS = {"territorios": "territorios", "cartas": "cartas"}
+
+TEMPO, LOTES, REGISTROS = metricas.persistencia("sqlite")
+
+# Consultas fixas: o sqlite3 reaproveita o statement preparado de cada texto
+INSERIR_JOGADOR = "INSERT INTO jogadores (nome, posicao, cor_exercito, objetivo, exercitos, trocas, eliminou) VALUES (?, (SELECT COALESCE(MAX(posicao), -1) + 1 FROM jogadores), ?, ?, ?, ?, ?)"
+ATUALIZAR = {coluna: f"UPDATE jogadores SET {coluna} = ? WHERE nome = ?" for coluna in COLUNAS}
+INSERIR = {
+    "territorios": "INSERT OR REPLACE INTO territorios (territorio, dono) VALUES (?, ?)",
+    "cartas": "INSERT INTO cartas (carta, dono) VALUES (?, ?)",
+}
+REMOVER_UM = {
+    "territorios": "DELETE FROM territorios WHERE territorio = ? AND dono = ?",
+    "cartas": "DELETE FROM cartas WHERE id = (SELECT MIN(id) FROM cartas WHERE carta = ? AND dono = ?)",
+}
+ATUALIZAR_PARTIDA = "INSERT OR REPLACE INTO partida (chave, valor) VALUES (?, ?)"
+REMOVER_TODOS = {tabela: f"DELETE FROM {tabela} WHERE dono = ?" for tabela in LISTAS.values()}
+
+
+class PersistenciaSQLite:
+    # importar_de: arquivo JSON (snapshot + log) copiado para o banco quando ele ainda não existe
+    def __init__(self, caminho: str, sincronizar: bool = True, importar_de: str = None):
+        self.caminho = caminho
+        self.sincronizar = sincronizar
+        self.importar_de = importar_de
+        self._trava = threading.Lock()
+        self._conexao = None
+
+    # brutos: aceito pela mesma interface; as linhas do banco já vêm decodificadas
+    def carregar(self, brutos: bool = False) -> dict:
+        with self._trava:
+            novo = not os.path.exists(self.caminho)
+            self._abrir()
+            if novo and self.importar_de and any(os.path.exists(self.importar_de + sufixo) for sufixo in ("", ".log", ".log.1")):
+                from persistencia import Persistencia
+                antiga = Persistencia(self.importar_de, sincronizar=False)
+                dados = antiga.carregar()
+                antiga.fechar()
+                registros = [{"op": "novo", "jogador": j} for j in dados["jogadores"]]
+                if dados["partida"]:
+                    registros.append({"op": "partida", "campos": dados["partida"]})
+                self._aplicar_lote(registros)
+            return {"jogadores": self._ler_jogadores(), "partida": self._ler_partida()}
+
+    def registrar(self, op: str, **dados):
+        self.registrar_lote([dict(op=op, **dados)])
+
+    def registrar_lote(self, registros: List[dict]):
+        if not registros:
+            return
+        with self._trava, TEMPO.medir():
+            self._abrir()
+            self._aplicar_lote(registros)
+            LOTES.inc()
+            REGISTROS.inc(len(registros))
+
+    # Consolida o WAL no arquivo principal (cria o banco se ainda não existir)
+    def compactar(self):
+        with self._trava:
+            self._abrir()
+            self._conexao.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def fechar(self):
+        with self._trava:
+            if self._conexao is not None:
+                self._conexao.close()
+                self._conexao = None
+
+    def _abrir(self):
+        if self._conexao is not None:
+            return
+        # As escritas vêm do gravador, em outra thread; a trava serializa o acesso
+        self._conexao = sqlite3.connect(self.caminho, isolation_level=None, check_same_thread=False)
+        self._conexao.execute("PRAGMA journal_mode=WAL")
+        self._conexao.execute(f"PRAGMA synchronous={'FULL' if self.sincronizar else 'NORMAL'}")
+        self._conexao.executescript(ESQUEMA)
+        # Bancos criados antes das colunas de trocas de cartas e de eliminação
+        existentes = {coluna for _, coluna, *_ in self._conexao.execute("PRAGMA table_info(jogadores)")}
+        for coluna, definicao in NOVAS_COLUNAS.items():
+            if coluna not in existentes:
+                self._conexao.execute(f"ALTER TABLE jogadores ADD COLUMN {definicao}")
+
+    def _aplicar_lote(self, registros: List[dict]):
+        cursor = self._conexao.cursor()
+        cursor.execute("BEGIN")
+        try:
+            for registro in registros:
+                self._aplicar(cursor, registro)
+        except BaseException:
+            cursor.execute("ROLLBACK")
+            raise
+        cursor.execute("COMMIT")
+
+    def _aplicar(self, cursor: sqlite3.Cursor, registro: dict):
+        op = registro["op"]
+        if op == "partida":
+            cursor.executemany(ATUALIZAR_PARTIDA, [(chave, dumps_str(valor)) for chave, valor in registro["campos"].items()])
+        elif op == "novo":
+            j = registro["jogador"]
+            cursor.execute(INSERIR_JOGADOR, (j["nome"], j.get("cor_exercito"), j.get("objetivo"), j.get("exercitos", 0), j.get("trocas", 0), bool(j.get("eliminou"))))
+            for campo, tabela in LISTAS.items():
+                cursor.executemany(INSERIR[tabela], [(valor, j["nome"]) for valor in j.get(campo, ())])
+        elif op == "set":
+            for campo, valor in registro["campos"].items():
+                if campo in LISTAS:
+                    tabela = LISTAS[campo]
+                    cursor.execute(REMOVER_TODOS[tabela], (registro["nome"],))
+                    cursor.executemany(INSERIR[tabela], [(v, registro["nome"]) for v in valor])
+                elif campo in ATUALIZAR:
+                    cursor.execute(ATUALIZAR[campo], (valor, registro["nome"]))
+                else:
+                    raise ValueError(f"Campo desconhecido no log: {campo}")
+        elif op == "add":
+            cursor.execute(INSERIR[LISTAS[registro["campo"]]], (registro["valor"], registro["nome"]))
+        elif op == "del":
+            cursor.execute(REMOVER_UM[LISTAS[registro["campo"]]], (registro["valor"], registro["nome"]))
+        elif op == "rem":
+            for tabela in LISTAS.values():
+                cursor.execute(REMOVER_TODOS[tabela], (registro["nome"],))
+            cursor.execute("DELETE FROM jogadores WHERE nome = ?", (registro["nome"],))
+        elif op == "ordem":
+            # Mesma regra do log JSON: os nomes dados primeiro, os outros depois, na ordem atual
+            atuais = [nome for (nome,) in cursor.execute("SELECT nome FROM jogadores ORDER BY posicao")]
+            presentes = set(atuais)
+            ordem = dict.fromkeys(nome for nome in registro["nomes"] if nome in presentes)
+            ordem.update(dict.fromkeys(atuais))
+            cursor.executemany("UPDATE jogadores SET posicao = ? WHERE nome = ?", list(enumerate(ordem)))
+        else:
+            raise ValueError(f"Operação desconhecida no log: {op}")
+
+    def _ler_jogadores(self) -> list:
+        jogadores = {
+            nome: {"nome": nome, "cor_exercito": cor, "objetivo": objetivo, "territorios": [], "exercitos": exercitos, "cartas": [], "trocas": trocas, "eliminou": bool(eliminou)}
+            for nome, cor, objetivo, exercitos, trocas, eliminou in self._conexao.execute(
+                "SELECT nome, cor_exercito, objetivo, exercitos, trocas, eliminou FROM jogadores ORDER BY posicao"
+            )
+        }
+        for territorio, dono in self._conexao.execute("SELECT territorio, dono FROM territorios ORDER BY dono, territorio"):
+            jogadores[dono]["territorios"].append(territorio)
+        for carta, dono in self._conexao.execute("SELECT carta, dono FROM cartas ORDER BY id"):
+            jogadores[dono]["cartas"].append(carta)
+        return list(jogadores.values())
+
+    def _ler_partida(self) -> dict:
+        return {chave: loads(valor) for chave, valor in self._conexao.execute("SELECT chave, valor FROM partida")}
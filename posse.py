@@ -0,0 +1,43 @@
+# posse.py
+# Dono de cada partida entre processos: com vários trabalhadores (coordenador.py) no mesmo
+# diretório, só o processo que segura a trava de arquivo da partida (<dados>.dono, flock
+# exclusivo) carrega e grava nela. A trava some com o processo, mesmo se ele morrer, e
+# não depende de quem roteia as requisições acertar o dono: um processo que tentar abrir a
+# partida de outro recebe PartidaEmOutroProcesso em vez de gravar por cima dela.
+# Sem fcntl (Windows), a posse não é verificada: um processo só, como antes.
+import os
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+class PartidaEmOutroProcesso(Exception):
+    def __init__(self, id: str):
+        super().__init__(f"Partida {id} aberta por outro processo")
+
+
+class Posse:
+    def __init__(self, id: str, caminho: str):
+        self.caminho = caminho + ".dono"
+        self._arquivo = None
+        if fcntl is None:
+            return
+        arquivo = open(self.caminho, "a+")
+        try:
+            fcntl.flock(arquivo.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            arquivo.close()
+            raise PartidaEmOutroProcesso(id) from None
+        # Quem é o dono, para diagnóstico (o conteúdo não é usado na trava)
+        arquivo.seek(0)
+        arquivo.truncate()
+        arquivo.write(f"{os.getpid()}\n")
+        arquivo.flush()
+        self._arquivo = arquivo
+
+    def liberar(self):
+        arquivo, self._arquivo = self._arquivo, None
+        if arquivo is not None:
+            arquivo.close()
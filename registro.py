@@ -0,0 +1,77 @@
+# registro.py
+# Índice nome -> jogador. O dict preserva a ordem de inserção, que é a ordem dos turnos.
+# Jogadores vindos do disco podem entrar só com os dados (adicionar_dados): o objeto é
+# montado por `fabrica` no primeiro acesso.
+import random
+from typing import Callable, Iterable, List
+
+
+class RegistroJogadores:
+    def __init__(self, jogadores: Iterable = (), fabrica: Callable = None):
+        self._por_nome = {}
+        self._pendentes = {}
+        self.fabrica = fabrica
+        for jogador in jogadores:
+            self.adicionar(jogador)
+
+    def adicionar(self, jogador):
+        if jogador.nome in self._por_nome:
+            raise ValueError(f"Jogador {jogador.nome} já existe")
+        self._por_nome[jogador.nome] = jogador
+
+    def adicionar_dados(self, nome: str, dados):
+        if nome in self._por_nome:
+            raise ValueError(f"Jogador {nome} já existe")
+        self._por_nome[nome] = None
+        self._pendentes[nome] = dados
+
+    # Quantos jogadores ainda não foram montados
+    @property
+    def pendentes(self) -> int:
+        return len(self._pendentes)
+
+    def _montar(self, nome: str):
+        jogador = self._por_nome[nome] = self.fabrica(self._pendentes.pop(nome))
+        return jogador
+
+    def remover(self, nome: str):
+        jogador = self._por_nome.pop(nome)
+        if jogador is None:
+            jogador = self.fabrica(self._pendentes.pop(nome))
+        return jogador
+
+    def obter(self, nome: str):
+        jogador = self._por_nome.get(nome)
+        if jogador is None and nome in self._pendentes:
+            jogador = self._montar(nome)
+        return jogador
+
+    def ordem(self) -> List[str]:
+        return list(self._por_nome)
+
+    # Reconstrói o índice na nova ordem; nomes ausentes vão para o fim
+    def reordenar(self, nomes: Iterable[str]):
+        ordenados = {nome: self._por_nome.pop(nome) for nome in nomes if nome in self._por_nome}
+        ordenados.update(self._por_nome)
+        self._por_nome = ordenados
+
+    def embaralhar(self, rng=random) -> List[str]:
+        nomes = self.ordem()
+        rng.shuffle(nomes)
+        self.reordenar(nomes)
+        return nomes
+
+    def __contains__(self, nome) -> bool:
+        return nome in self._por_nome
+
+    def __getitem__(self, nome: str):
+        jogador = self._por_nome[nome]
+        return self._montar(nome) if jogador is None else jogador
+
+    def __iter__(self):
+        if not self._pendentes:
+            return iter(self._por_nome.values())
+        return (self._montar(nome) if jogador is None else jogador for nome, jogador in list(self._por_nome.items()))
+
+    def __len__(self) -> int:
+        return len(self._por_nome)
@@ -0,0 +1,120 @@
+# reproducao.py
+# Refaz uma partida a partir do diário de ações (diario.py), sem HTTP e sem persistência:
+# cada ação é executada de novo sobre uma Partida em memória, com os mesmos fluxos de
+# sorteio, e chega ao mesmo estado e aos mesmos dados do jogo original.
+# Uso: python -m reproducao jogos/<id>.json.acoes [--comparar jogos/<id>.json]
+import argparse
+import time
+from typing import Iterator
+import acoes
+from diario import Fluxos
+from modelos import Jogador
+from partida import CORES, TERRITORIOS_INICIAIS, Partida
+from serializacao import loads
+from travas import SemTravas
+
+
+# Mesma interface de Persistencia, sem gravar nada
+class PersistenciaNula:
+    def carregar(self, brutos: bool = False) -> dict:
+        return {"jogadores": []}
+
+    def registrar(self, op: str, **dados):
+        pass
+
+    def registrar_lote(self, registros: list):
+        pass
+
+    def compactar(self):
+        pass
+
+    def fechar(self):
+        pass
+
+
+def ler_diario(caminho: str) -> Iterator[dict]:
+    with open(caminho, "rb") as arquivo:
+        for linha in arquivo:
+            if linha.strip():
+                yield loads(linha)
+
+
+# Executa as entradas do diário numa partida nova. ao_executar(indice, entrada, resultado)
+# recebe o resultado de cada ação (ex.: os dados de um ataque contestado); ate para na
+# ação de índice ate. Uma ação que falha diferente do registrado levanta ValueError
+def reproduzir(entradas, ao_executar=None, ate: int = None) -> Partida:
+    partida = Partida("reproducao", PersistenciaNula())
+    partida.carregar()
+    partida.travas = SemTravas()   # uma thread só
+    funcoes = {}
+    indice = 0
+    for entrada in entradas:
+        if "semente" in entrada:
+            _iniciar_segmento(partida, entrada)
+            continue
+        if ate is not None and indice >= ate:
+            break
+        funcao = funcoes.get(entrada["acao"])
+        if funcao is None:
+            # Sem o invólucro das travas e do diário: a reprodução roda numa thread só
+            funcao = funcoes[entrada["acao"]] = getattr(acoes, entrada["acao"]).__wrapped__
+        try:
+            resultado = funcao(partida, **entrada["parametros"])
+        except acoes.ErroDeJogo as erro:
+            if entrada.get("erro") != str(erro):
+                raise ValueError(f"Ação {indice} ({entrada['acao']}) divergiu: {erro}") from erro
+            resultado = {"error": str(erro)}
+        else:
+            if "erro" in entrada:
+                raise ValueError(f"Ação {indice} ({entrada['acao']}) deveria falhar: {entrada['erro']}")
+        if ao_executar is not None:
+            ao_executar(indice, entrada, resultado)
+        indice += 1
+    return partida
+
+
+# Cada carga da partida abre um segmento: fluxos com a semente nova e o estado que não é
+# gravado (ordem dos territórios iniciais) de volta ao de uma carga. As eliminações estão
+# nos jogadores (Jogador.eliminou) e voltam com eles
+def _iniciar_segmento(partida: Partida, cabecalho: dict):
+    trocas = partida.baralho.trocas
+    if "estado" in cabecalho:
+        jogadores = [Jogador(**dados) for dados in cabecalho["estado"]]
+        trocas = cabecalho.get("partida", {}).get("trocas", sum(j.trocas for j in jogadores))
+    else:
+        jogadores = list(partida.jogadores)
+    partida._montar(jogadores)
+    partida.baralho.trocas = trocas
+    cores = {j.cor_exercito for j in jogadores}
+    partida.cores_disponiveis = [cor for cor in CORES if cor not in cores]
+    partida.territorios_iniciais = list(TERRITORIOS_INICIAIS)
+    partida.fluxos = Fluxos(cabecalho["semente"])
+
+
+def estado(partida: Partida) -> list:
+    return [j.model_dump() for j in partida.jogadores]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reproduz uma partida a partir do diário de ações")
+    parser.add_argument("diario")
+    parser.add_argument("--comparar", help="arquivo de dados da partida (json) para conferir o estado final")
+    parser.add_argument("--ate", type=int, help="para depois desta quantidade de ações")
+    parser.add_argument("--mostrar", action="store_true", help="imprime o resultado de cada ação")
+    args = parser.parse_args()
+
+    entradas = list(ler_diario(args.diario))
+    mostrar = (lambda i, entrada, resultado: print(i, entrada["acao"], resultado)) if args.mostrar else None
+    inicio = time.perf_counter()
+    partida = reproduzir(entradas, mostrar, args.ate)
+    duracao = time.perf_counter() - inicio
+    quantidade = sum(1 for entrada in entradas if "acao" in entrada)
+    if args.ate is not None:
+        quantidade = min(quantidade, args.ate)
+    print(f"{quantidade} ações em {duracao:.3f}s ({quantidade / duracao if duracao else 0:,.0f} ações/s)")
+    if args.comparar:
+        from persistencia import Persistencia
+        salvos = Persistencia(args.comparar, sincronizar=False)
+        igual = salvos.carregar()["jogadores"] == [dict(j, territorios=sorted(j["territorios"])) for j in estado(partida)]
+        salvos.fechar()
+        print("estado final igual ao salvo" if igual else "estado final DIFERENTE do salvo")
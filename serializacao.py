@@ -0,0 +1,76 @@
+# serializacao.py
+# Codificação JSON do projeto: usa o orjson (ou o msgspec) quando instalado e cai no json
+# da biblioteca padrão quando não. A saída é compacta e em UTF-8 (bytes); indentação só
+# quando pedida (arquivos para leitura humana). Conjuntos viram listas ordenadas.
+import json
+from fastapi.responses import JSONResponse, Response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+def _padrao(obj):
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj)
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()
+    raise TypeError(f"Tipo não serializável em JSON: {type(obj).__name__}")
+
+
+if orjson is not None:
+    MOTOR = "orjson"
+
+    def dumps(obj, indentar: bool = False) -> bytes:
+        return orjson.dumps(obj, default=_padrao, option=orjson.OPT_INDENT_2 if indentar else 0)
+
+    loads = orjson.loads
+
+elif msgspec is not None:
+    MOTOR = "msgspec"
+    _codificador = msgspec.json.Encoder(enc_hook=_padrao)
+    _decodificador = msgspec.json.Decoder()
+
+    def dumps(obj, indentar: bool = False) -> bytes:
+        dados = _codificador.encode(obj)
+        return msgspec.json.format(dados, indent=2) if indentar else dados
+
+    # Erros de leitura viram ValueError, como no json e no orjson
+    def loads(dados):
+        try:
+            return _decodificador.decode(dados)
+        except msgspec.DecodeError as erro:
+            raise ValueError(str(erro)) from erro
+
+else:
+    MOTOR = "json"
+
+    def dumps(obj, indentar: bool = False) -> bytes:
+        if indentar:
+            return json.dumps(obj, ensure_ascii=False, indent=2, default=_padrao).encode("utf-8")
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=_padrao).encode("utf-8")
+
+    # Aceita também memoryview (ex.: arquivo mapeado com mmap), como o orjson e o msgspec
+    def loads(dados):
+        return json.loads(bytes(dados) if isinstance(dados, memoryview) else dados)
+
+
+def dumps_str(obj, indentar: bool = False) -> str:
+    return dumps(obj, indentar).decode("utf-8")
+
+
+# Resposta com o corpo já codificado: o FastAPI devolve como está, sem jsonable_encoder
+def resposta(obj, status: int = 200, indentar: bool = False) -> Response:
+    return Response(content=dumps(obj, indentar), status_code=status, media_type="application/json")
+
+
+# Resposta padrão das rotas: o conteúdo já convertido pelo FastAPI é codificado por dumps
+class RespostaJSON(JSONResponse):
+    def render(self, content) -> bytes:
+        return dumps(content)
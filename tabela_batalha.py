@@ -0,0 +1,137 @@
+# tabela_batalha.py
+# Probabilidades exatas de batalha pela cadeia de Markov das rolagens: cada estado
+# (atacantes, defensores) leva aos estados seguintes com as probabilidades exatas de
+# batalha.probabilidades_rolagem. A tabela é preenchida sob demanda e pode ir para o disco.
+import os
+import threading
+import numpy as np
+from batalha import probabilidades_rolagem
+
+
+class TabelaBatalha:
+    def __init__(self, limite: int = 200, parada: int = 1):
+        self.limite = limite
+        self.parada = max(parada, 1)
+        tamanho = (limite + 1, limite + 1)
+        self._vitoria = np.zeros(tamanho)
+        self._perdas_atacante = np.zeros(tamanho)
+        self._perdas_defensor = np.zeros(tamanho)
+        # Retângulo [0, atacantes] x [0, defensores] já calculado
+        self._atacantes = -1
+        self._defensores = -1
+        self._trava = threading.Lock()
+
+    # Consulta O(1) depois que o retângulo que contém (atacantes, defensores) foi preenchido
+    def resultado(self, atacantes: int, defensores: int) -> dict:
+        self._garantir(atacantes, defensores)
+        return {
+            "atacantes": atacantes,
+            "defensores": defensores,
+            "probabilidade_vitoria": float(self._vitoria[atacantes, defensores]),
+            "perdas_esperadas_atacante": float(self._perdas_atacante[atacantes, defensores]),
+            "perdas_esperadas_defensor": float(self._perdas_defensor[atacantes, defensores]),
+        }
+
+    # Distribuição exata dos estados finais (propagação para frente, O(atacantes * defensores))
+    def distribuicao(self, atacantes: int, defensores: int) -> dict:
+        self._validar(atacantes, defensores)
+        massa = np.zeros((atacantes + 1, defensores + 1))
+        massa[atacantes, defensores] = 1.0
+        perdas_atacante = np.zeros(atacantes + 1)
+        perdas_defensor = np.zeros(defensores + 1)
+        for total in range(atacantes + defensores, -1, -1):
+            for a in range(min(atacantes, total), -1, -1):
+                d = total - a
+                if d > defensores or massa[a, d] == 0.0:
+                    continue
+                p = massa[a, d]
+                if self._terminal(a, d):
+                    perdas_atacante[atacantes - a] += p
+                    perdas_defensor[defensores - d] += p
+                    continue
+                for (proximo_a, proximo_d), q in self._transicoes(a, d):
+                    massa[proximo_a, proximo_d] += p * q
+        return {
+            "probabilidade_vitoria": float(perdas_defensor[defensores]),
+            "perdas_atacante": perdas_atacante.round(6).tolist(),
+            "perdas_defensor": perdas_defensor.round(6).tolist(),
+        }
+
+    # Grava num temporário e troca de uma vez: vários processos (coordenador.py) salvam a
+    # mesma tabela ao parar, e nenhum deixa o arquivo pela metade
+    def salvar(self, caminho: str):
+        temporario = f"{caminho}.{os.getpid()}.tmp"
+        with self._trava, open(temporario, "wb") as arquivo:
+            np.savez_compressed(
+                arquivo,
+                limite=self.limite, parada=self.parada,
+                atacantes=self._atacantes, defensores=self._defensores,
+                vitoria=self._vitoria, perdas_atacante=self._perdas_atacante, perdas_defensor=self._perdas_defensor,
+            )
+        os.replace(temporario, caminho)
+
+    # limite/parada: os da configuração atual. Com outro limite, o retângulo salvo é
+    # aproveitado (cortado ou ampliado, os valores não dependem do limite); com outra
+    # parada os valores mudam, e a tabela recomeça vazia
+    @classmethod
+    def carregar(cls, caminho: str, limite: int = None, parada: int = None) -> "TabelaBatalha":
+        with np.load(caminho) as dados:
+            limite_salvo, parada_salva = int(dados["limite"]), int(dados["parada"])
+            tabela = cls(limite_salvo if limite is None else limite, parada_salva if parada is None else parada)
+            if tabela.parada != max(parada_salva, 1):
+                return tabela
+            atacantes = min(int(dados["atacantes"]), tabela.limite)
+            defensores = min(int(dados["defensores"]), tabela.limite)
+            if tabela.limite == limite_salvo:
+                tabela._vitoria = dados["vitoria"]
+                tabela._perdas_atacante = dados["perdas_atacante"]
+                tabela._perdas_defensor = dados["perdas_defensor"]
+            elif atacantes >= 0 and defensores >= 0:
+                retangulo = (slice(atacantes + 1), slice(defensores + 1))
+                tabela._vitoria[retangulo] = dados["vitoria"][retangulo]
+                tabela._perdas_atacante[retangulo] = dados["perdas_atacante"][retangulo]
+                tabela._perdas_defensor[retangulo] = dados["perdas_defensor"][retangulo]
+            tabela._atacantes, tabela._defensores = atacantes, defensores
+        return tabela
+
+    def _validar(self, atacantes: int, defensores: int):
+        if not (0 <= atacantes <= self.limite and 0 <= defensores <= self.limite):
+            raise ValueError(f"Exércitos devem estar entre 0 e {self.limite}")
+
+    def _terminal(self, a: int, d: int) -> bool:
+        return d == 0 or a <= self.parada
+
+    def _transicoes(self, a: int, d: int):
+        dados_ataque = min(3, a - 1)
+        dados_defesa = min(2, d)
+        pares = min(dados_ataque, dados_defesa)
+        for vitorias, p in enumerate(probabilidades_rolagem(dados_ataque, dados_defesa)):
+            yield (a - (pares - vitorias), d - vitorias), p
+
+    # Expande o retângulo calculado; linhas menores são completadas antes das maiores,
+    # então todo estado seguinte (a' <= a, d' <= d) já está pronto quando é usado
+    def _garantir(self, atacantes: int, defensores: int):
+        self._validar(atacantes, defensores)
+        if atacantes <= self._atacantes and defensores <= self._defensores:
+            return
+        with self._trava:
+            novo_a = max(atacantes, self._atacantes)
+            novo_d = max(defensores, self._defensores)
+            for a in range(novo_a + 1):
+                inicio = self._defensores + 1 if a <= self._atacantes else 0
+                for d in range(inicio, novo_d + 1):
+                    self._calcular(a, d)
+            self._atacantes, self._defensores = novo_a, novo_d
+
+    def _calcular(self, a: int, d: int):
+        if self._terminal(a, d):
+            self._vitoria[a, d] = 1.0 if d == 0 else 0.0
+            return
+        vitoria = perdas_atacante = perdas_defensor = 0.0
+        for (proximo_a, proximo_d), p in self._transicoes(a, d):
+            vitoria += p * self._vitoria[proximo_a, proximo_d]
+            perdas_atacante += p * (a - proximo_a + self._perdas_atacante[proximo_a, proximo_d])
+            perdas_defensor += p * (d - proximo_d + self._perdas_defensor[proximo_a, proximo_d])
+        self._vitoria[a, d] = vitoria
+        self._perdas_atacante[a, d] = perdas_atacante
+        self._perdas_defensor[a, d] = perdas_defensor
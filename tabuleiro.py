@@ -0,0 +1,72 @@
+# tabuleiro.py
+# Índice território -> dono, mantido em sincronia com o conjunto de territórios de cada jogador.
+# O conjunto registrado é o mesmo objeto de jogador.territorios, então as duas visões nunca divergem.
+# Com um mapa, também responde fronteiras e alcance pelos territórios do próprio jogador
+# (componentes.py); territórios fora do mapa não fazem fronteira com nenhum outro.
+from typing import Optional, Set
+from componentes import Componentes
+from mapa import Mapa
+
+
+class Tabuleiro:
+    def __init__(self, mapa: Mapa = None):
+        self.mapa = mapa
+        self._dono = {}
+        self._territorios = {}
+        self._id = mapa.indice.get if mapa is not None else {}.get   # nome -> id no mapa (None fora dele)
+        self._componentes = Componentes(mapa) if mapa is not None else None
+
+    def registrar_jogador(self, nome: str, territorios: Set[str]):
+        self._territorios[nome] = territorios
+        for territorio in territorios:
+            self._dono[territorio] = nome
+            self._ganhar(nome, territorio)
+
+    def remover_jogador(self, nome: str):
+        for territorio in self._territorios.pop(nome, ()):
+            if self._dono.get(territorio) == nome:
+                del self._dono[territorio]
+        if self._componentes is not None:
+            self._componentes.remover_jogador(nome)
+
+    def dono(self, territorio: str) -> Optional[str]:
+        return self._dono.get(territorio)
+
+    def pertence(self, territorio: str, nome: str) -> bool:
+        return self._dono.get(territorio) == nome
+
+    def territorios_de(self, nome: str) -> Set[str]:
+        return self._territorios.get(nome, set())
+
+    # Dá o território a um jogador (distribuição ou conquista); retorna o dono anterior
+    def atribuir(self, territorio: str, nome: str) -> Optional[str]:
+        anterior = self._dono.get(territorio)
+        if anterior == nome:
+            return anterior
+        if anterior is not None:
+            self._territorios[anterior].discard(territorio)
+            t = self._id(territorio)
+            if t is not None:
+                self._componentes.perder(anterior, t)
+        self._dono[territorio] = nome
+        self._territorios[nome].add(territorio)
+        self._ganhar(nome, territorio)
+        return anterior
+
+    def fazem_fronteira(self, a: str, b: str) -> bool:
+        a, b = self._id(a), self._id(b)
+        return a is not None and b is not None and self.mapa.fazem_fronteira(a, b)
+
+    # Os dois territórios são do jogador e há caminho entre eles só por territórios dele
+    def alcanca(self, nome: str, origem: str, destino: str) -> bool:
+        if not (self.pertence(origem, nome) and self.pertence(destino, nome)):
+            return False
+        if origem == destino:
+            return True
+        a, b = self._id(origem), self._id(destino)
+        return a is not None and b is not None and self._componentes.conectados(a, b)
+
+    def _ganhar(self, nome: str, territorio: str):
+        t = self._id(territorio)
+        if t is not None:
+            self._componentes.ganhar(nome, t)
@@ -0,0 +1,122 @@
+# tabuleiro_compacto.py
+# Estado do tabuleiro em arrays: dono e exércitos por território (ids inteiros do Mapa) e
+# reserva/quantidade de territórios por jogador. Cópia e snapshot são cópias de memória,
+# baratas o bastante para busca; os adaptadores convertem de/para o formato JSON do Jogador.
+from array import array
+from mapa import Mapa
+
+SEM_DONO = -1
+
+
+class JogadorCompacto:
+    __slots__ = ("nome", "cor", "objetivo", "cartas")
+
+    def __init__(self, nome: str, cor: str = None, objetivo: str = None, cartas: list = None):
+        self.nome = nome
+        self.cor = cor
+        self.objetivo = objetivo
+        self.cartas = cartas if cartas is not None else []
+
+    def copia(self) -> "JogadorCompacto":
+        return JogadorCompacto(self.nome, self.cor, self.objetivo, list(self.cartas))
+
+
+class TabuleiroCompacto:
+    __slots__ = ("mapa", "jogadores", "dono", "exercitos", "reserva", "quantidade")
+
+    def __init__(self, mapa: Mapa, jogadores: list = ()):
+        self.mapa = mapa
+        self.jogadores = list(jogadores)
+        self.dono = array("b", [SEM_DONO]) * len(mapa)       # id do jogador, até 127 jogadores
+        self.exercitos = array("h", [0]) * len(mapa)
+        self.reserva = array("h", [0]) * len(self.jogadores)  # exércitos ainda não posicionados
+        self.quantidade = array("h", [0]) * len(self.jogadores)  # territórios de cada jogador
+
+    def atribuir(self, territorio: int, jogador: int, exercitos: int = None) -> int:
+        anterior = self.dono[territorio]
+        if anterior != SEM_DONO:
+            self.quantidade[anterior] -= 1
+        self.dono[territorio] = jogador
+        self.quantidade[jogador] += 1
+        if exercitos is not None:
+            self.exercitos[territorio] = exercitos
+        return anterior
+
+    def territorios_de(self, jogador: int) -> list:
+        return [t for t, dono in enumerate(self.dono) if dono == jogador]
+
+    # Territórios do jogador com pelo menos um vizinho inimigo (territórios sem dono não contam)
+    def fronteira(self, jogador: int) -> list:
+        dono = self.dono
+        return [t for t in self.territorios_de(jogador) if any(dono[v] not in (jogador, SEM_DONO) for v in self.mapa.vizinhos[t])]
+
+    # Ataques possíveis: (origem, destino) com origem própria com 2+ exércitos e destino inimigo vizinho
+    def ataques(self, jogador: int) -> list:
+        dono, exercitos, vizinhos = self.dono, self.exercitos, self.mapa.vizinhos
+        return [
+            (t, v)
+            for t in self.territorios_de(jogador) if exercitos[t] > 1
+            for v in vizinhos[t] if dono[v] not in (jogador, SEM_DONO)
+        ]
+
+    def exercitos_de(self, jogador: int) -> int:
+        return self.reserva[jogador] + sum(e for e, dono in zip(self.exercitos, self.dono) if dono == jogador)
+
+    # Cópia independente; o mapa é imutável e fica compartilhado
+    def copia(self) -> "TabuleiroCompacto":
+        copia = object.__new__(type(self))
+        copia.mapa = self.mapa
+        copia.jogadores = [j.copia() for j in self.jogadores]
+        copia.dono = self.dono[:]
+        copia.exercitos = self.exercitos[:]
+        copia.reserva = self.reserva[:]
+        copia.quantidade = self.quantidade[:]
+        return copia
+
+    # Estado numérico em bytes (sem nomes, objetivos e cartas), para desfazer jogadas na busca
+    def snapshot(self) -> bytes:
+        return b"".join(a.tobytes() for a in (self.dono, self.exercitos, self.reserva, self.quantidade))
+
+    def restaurar(self, snapshot: bytes):
+        inicio = 0
+        for a in (self.dono, self.exercitos, self.reserva, self.quantidade):
+            fim = inicio + len(a) * a.itemsize
+            a[:] = array(a.typecode, snapshot[inicio:fim])
+            inicio = fim
+
+    # Visões NumPy sem cópia dos arrays, para análises vetorizadas
+    def como_numpy(self):
+        import numpy as np
+        return np.frombuffer(self.dono, dtype=np.int8), np.frombuffer(self.exercitos, dtype=np.int16)
+
+    # Do formato JSON do Jogador (dados.json / Jogo.gerar_json). O JSON tem um único total de
+    # exércitos por jogador: cada território recebe 1 e o restante vai para a reserva
+    @classmethod
+    def de_jogadores(cls, mapa: Mapa, jogadores: list) -> "TabuleiroCompacto":
+        tabuleiro = cls(mapa, [
+            JogadorCompacto(j["nome"], j.get("cor_exercito", j.get("cor")), j.get("objetivo"), list(j.get("cartas", [])))
+            for j in jogadores
+        ])
+        for i, j in enumerate(jogadores):
+            for nome in j.get("territorios", []):
+                tabuleiro.atribuir(mapa.id(nome), i, 1)
+            tabuleiro.reserva[i] = max(0, j.get("exercitos", 0) - tabuleiro.quantidade[i])
+        return tabuleiro
+
+    # Para o formato JSON do Jogador; exercitos = posicionados + reserva
+    def para_jogadores(self) -> list:
+        territorios = [[] for _ in self.jogadores]
+        for t, dono in enumerate(self.dono):
+            if dono != SEM_DONO:
+                territorios[dono].append(self.mapa.territorios[t])
+        return [
+            {
+                "nome": j.nome,
+                "cor_exercito": j.cor,
+                "objetivo": j.objetivo,
+                "territorios": territorios[i],
+                "exercitos": self.exercitos_de(i),
+                "cartas": list(j.cartas),
+            }
+            for i, j in enumerate(self.jogadores)
+        ]
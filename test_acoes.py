@@ -0,0 +1,89 @@
+import os
+import tempfile
+import unittest
+import acoes
+from partida import Partida
+from persistencia import Persistencia
+from persistencia_sqlite import PersistenciaSQLite
+
+
+class TestLoteDeAcoes(unittest.TestCase):
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.caminho = os.path.join(self.diretorio.name, "dados.json")
+        self.partida = Partida("teste", Persistencia(self.caminho, sincronizar=False))
+        self.partida.carregar()
+        for nome in ("Edson", "Marcelo"):
+            acoes.adicionar_jogador(self.partida, nome)
+        self.territorios = acoes.distribuir_territorios(self.partida)
+
+    def tearDown(self):
+        self.partida.persistencia.fechar()
+        self.diretorio.cleanup()
+
+    def recarregar(self) -> Partida:
+        self.partida.persistencia.fechar()
+        partida = Partida("teste", Persistencia(self.caminho, sincronizar=False))
+        partida.carregar()
+        return partida
+
+    def test_lote_aplica_e_grava_tudo(self):
+        resultados = acoes.executar_lote(self.partida, [
+            ("distribuir-exercitos", {"jogador": "Edson", "exercitos": "7"}),
+            ("receber-cartas", {"jogador": "Edson"}),
+        ])
+        self.assertEqual(len(resultados), 2)
+        edson = self.recarregar().jogadores["Edson"]
+        self.assertEqual(edson.exercitos, 7)
+        self.assertEqual(len(edson.cartas), 1)
+
+    def test_falha_desfaz_o_lote_inteiro(self):
+        with self.assertRaises(acoes.AcaoInvalida) as contexto:
+            acoes.executar_lote(self.partida, [
+                ("distribuir-exercitos", {"jogador": "Edson", "exercitos": 7}),
+                ("mover-exercitos", {"jogador": "Edson", "origem": "x", "destino": "y", "quantidade": 1}),
+            ])
+        self.assertTrue(str(contexto.exception).startswith("Ação 1"))
+        self.assertEqual(self.partida.jogadores["Edson"].exercitos, 0)
+        self.assertEqual(self.recarregar().jogadores["Edson"].exercitos, 0)
+
+    def test_conquista_desfeita_mantem_tabuleiro(self):
+        territorio = self.territorios["Marcelo"][0]
+        with self.assertRaises(acoes.JogadorNaoEncontrado):
+            with self.partida.transacao():
+                self.partida.tabuleiro.atribuir(territorio, "Edson")
+                acoes.encontrar_jogador(self.partida, "Pedro")
+        self.assertEqual(self.partida.tabuleiro.dono(territorio), "Marcelo")
+        self.assertIn(territorio, self.partida.jogadores["Marcelo"].territorios)
+
+
+class TestEliminacao(unittest.TestCase):
+    def eliminar_e_recarregar(self, abrir):
+        partida = Partida("teste", abrir(), semente=1)
+        partida.carregar()
+        partida.registrar_lote([
+            {"op": "novo", "jogador": {"nome": "Ana", "objetivo": "Eliminar um oponente", "territorios": ["Peru"], "exercitos": 100}},
+            {"op": "novo", "jogador": {"nome": "Bia", "territorios": ["Brasil"], "exercitos": 1}},
+        ])
+        partida.fechar()
+        partida = Partida("teste", abrir(), semente=1)
+        partida.carregar()
+        while partida.tabuleiro.dono("Brasil") == "Bia":
+            acoes.atacar(partida, "Ana", "Peru", "Bia", "Brasil")
+        self.assertTrue(acoes.verificar_objetivo(partida, "Ana")["concluido"])
+        partida.fechar()
+        recarregada = Partida("teste", abrir())
+        recarregada.carregar()
+        self.assertTrue(acoes.verificar_objetivo(recarregada, "Ana")["concluido"])
+        self.assertTrue(recarregada.jogadores["Ana"].eliminou)
+        recarregada.fechar()
+
+    def test_eliminacao_sobrevive_a_recarga(self):
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, "dados")
+            self.eliminar_e_recarregar(lambda: Persistencia(caminho + ".json", sincronizar=False))
+            self.eliminar_e_recarregar(lambda: PersistenciaSQLite(caminho + ".db", sincronizar=False))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from fastapi.testclient import TestClient
+import main
+from batalha import simular_batalhas
+from partida import Partidas
+
+
+class TestBatalha(unittest.TestCase):
+    def test_sem_exercitos_para_atacar(self):
+        resultado = simular_batalhas(1, 3, simulacoes=1000)
+        self.assertEqual(resultado["probabilidade_vitoria"], 0.0)
+        self.assertEqual(resultado["perdas_atacante"]["media"], 0.0)
+
+    def test_um_dado_contra_um_dado(self):
+        # 2 atacantes contra 1 defensor: uma única rolagem de 1 dado contra 1 dado (15/36)
+        resultado = simular_batalhas(2, 1, simulacoes=200_000, rng=np.random.default_rng(7))
+        self.assertAlmostEqual(resultado["probabilidade_vitoria"], 15 / 36, delta=0.01)
+
+    def test_distribuicao_soma_um(self):
+        resultado = simular_batalhas(10, 8, simulacoes=50_000, rng=np.random.default_rng(1))
+        self.assertAlmostEqual(sum(resultado["perdas_defensor"]["distribuicao"]), 1.0, places=4)
+        vitorias = resultado["perdas_defensor"]["distribuicao"][8]
+        self.assertAlmostEqual(vitorias, resultado["probabilidade_vitoria"], places=4)
+
+    def test_parada_antecipada(self):
+        resultado = simular_batalhas(10, 10, simulacoes=20_000, parada=6, rng=np.random.default_rng(2))
+        self.assertLessEqual(len(resultado["perdas_atacante"]["distribuicao"]), 6)
+
+
+class TestRotaProbabilidade(unittest.TestCase):
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.original = main.partidas
+        main.partidas = Partidas(self.diretorio.name, os.path.join(self.diretorio.name, "dados.json"))
+        self.cliente = TestClient(main.app)
+        for nome, exercitos in (("Ana", 5), ("Bia", main.MAX_EXERCITOS_SIMULACAO + 1)):
+            self.cliente.post("/jogadores/adicionar/", params={"nome": nome})
+            self.cliente.post("/preparacao/distribuir-exercitos/", params={"jogador": nome, "exercitos": exercitos})
+
+    def tearDown(self):
+        main.partidas.fechar()
+        main.partidas = self.original
+        self.diretorio.cleanup()
+
+    def test_exercitos_acima_do_limite(self):
+        url = "/rodada/ataque/probabilidade/"
+        resposta = self.cliente.get(url, params={"jogador_atacante": "Ana", "jogador_defensor": "Bia", "simulacoes": 10})
+        self.assertEqual(resposta.status_code, 400)
+        resposta = self.cliente.get(url, params={"jogador_atacante": "Ana", "jogador_defensor": "Ana", "simulacoes": 10})
+        self.assertEqual(resposta.status_code, 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+import os
+import random
+import tempfile
+import unittest
+import acoes
+import cartas
+from cartas import Baralho, Mao
+from partida import Partida
+from persistencia import Persistencia
+from persistencia_sqlite import PersistenciaSQLite
+
+
+class TestMao(unittest.TestCase):
+    def test_trocas_validas(self):
+        self.assertTrue(cartas.troca_valida(cartas.contar(["Infantaria"] * 3)))
+        self.assertTrue(cartas.troca_valida(cartas.contar(["Infantaria", "Cavalaria", "Artilharia"])))
+        self.assertTrue(cartas.troca_valida(cartas.contar(["Cavalaria", "Coringa", "Artilharia"])))
+        self.assertTrue(cartas.troca_valida(cartas.contar(["Carta 1", "Infantaria", "Coringa"])))
+        self.assertFalse(cartas.troca_valida(cartas.contar(["Infantaria", "Infantaria", "Cavalaria"])))
+        self.assertFalse(cartas.troca_valida(cartas.contar(["Infantaria"] * 4)))
+        self.assertIsNone(cartas.contar(["Infantaria", "Cavalaria", "Dragão"]))
+
+    def test_tem_troca_e_melhor_troca(self):
+        self.assertFalse(Mao(["Infantaria", "Infantaria", "Cavalaria", "Cavalaria"]).tem_troca())
+        self.assertIsNone(Mao(["Coringa", "Coringa"]).melhor_troca())
+        self.assertTrue(Mao(["Infantaria", "Coringa", "Coringa"]).tem_troca())
+        # Sem coringa quando dá; e a troca que deixa outra na mão
+        self.assertEqual(Mao(["Infantaria", "Cavalaria", "Artilharia", "Coringa"]).melhor_troca(), (1, 1, 1, 0))
+        mao = Mao(["Infantaria"] * 3 + ["Cavalaria", "Cavalaria", "Artilharia", "Artilharia"])
+        self.assertEqual(mao.melhor_troca(), (1, 1, 1, 0))
+
+    def test_bonus(self):
+        self.assertEqual([cartas.bonus(i) for i in range(9)], [4, 6, 8, 10, 12, 15, 20, 25, 30])
+
+    def test_baralho_com_descarte(self):
+        baralho = Baralho()
+        baralho.adicionar_mao("Ana", ["Coringa", "Carta 2"])
+        rng = random.Random(0)
+        compradas = [baralho.comprar("Ana", rng) for _ in range(42)]
+        self.assertEqual(sorted(compradas), sorted(["Infantaria"] * 14 + ["Cavalaria"] * 13 + ["Artilharia"] * 14 + ["Coringa"]))
+        self.assertIsNone(baralho.comprar("Ana", rng))
+        baralho.descartar(["Infantaria", "Carta 2"])
+        self.assertEqual(sorted([baralho.comprar("Ana", rng), baralho.comprar("Ana", rng)]), ["Cavalaria", "Infantaria"])
+
+
+class TestTrocaDeCartas(unittest.TestCase):
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.caminho = os.path.join(self.diretorio.name, "dados.json")
+        self.partida = self.carregar()
+        for nome in ("Ana", "Bia"):
+            acoes.adicionar_jogador(self.partida, nome)
+
+    def tearDown(self):
+        self.partida.persistencia.fechar()
+        self.diretorio.cleanup()
+
+    def carregar(self) -> Partida:
+        partida = Partida("teste", Persistencia(self.caminho, sincronizar=False), semente=5)
+        partida.carregar()
+        return partida
+
+    def comprar_ate_trocar(self, nome: str):
+        while not acoes.receber_cartas(self.partida, nome)["troca_disponivel"]:
+            pass
+
+    def test_bonus_cresce_e_sobrevive_a_carga(self):
+        self.comprar_ate_trocar("Ana")
+        self.assertEqual(acoes.trocar_cartas(self.partida, "Ana", [])["exercitos"], 4)
+        self.comprar_ate_trocar("Bia")
+        self.assertEqual(acoes.trocar_cartas(self.partida, "Bia", [])["exercitos"], 6)
+        maos = {j.nome: list(j.cartas) for j in self.partida.jogadores}
+
+        self.partida.persistencia.fechar()
+        self.partida = self.carregar()
+        self.assertEqual({j.nome: j.cartas for j in self.partida.jogadores}, maos)
+        self.assertEqual(self.partida.jogadores["Bia"].exercitos, 6)
+        self.comprar_ate_trocar("Ana")
+        self.assertEqual(acoes.trocar_cartas(self.partida, "Ana", [])["exercitos"], 8)
+        self.assertEqual(self.partida.jogadores["Ana"].exercitos, 12)
+        self.assertEqual(self.partida.jogadores["Ana"].trocas, 2)
+
+    def test_contagem_de_trocas_sobrevive_a_saida_e_a_carga(self):
+        self.partida.persistencia.fechar()
+        for persistencia in (Persistencia, PersistenciaSQLite):
+            with self.subTest(persistencia=persistencia.__name__):
+                caminho = os.path.join(self.diretorio.name, f"saida-{persistencia.__name__}")
+                self.partida = Partida("teste", persistencia(caminho, sincronizar=False), semente=5)
+                self.partida.carregar()
+                for nome in ("Ana", "Bia"):
+                    acoes.adicionar_jogador(self.partida, nome)
+                self.comprar_ate_trocar("Ana")
+                acoes.trocar_cartas(self.partida, "Ana", [])
+                acoes.remover_jogador(self.partida, "Ana")
+                if persistencia is Persistencia:
+                    self.partida.persistencia.compactar()
+                self.partida.persistencia.fechar()
+
+                # A troca de quem saiu continua contando para o bônus da partida
+                self.partida = Partida("teste", persistencia(caminho, sincronizar=False), semente=5)
+                self.partida.carregar()
+                self.assertEqual(self.partida.baralho.trocas, 1)
+                self.comprar_ate_trocar("Bia")
+                self.assertEqual(acoes.trocar_cartas(self.partida, "Bia", [])["exercitos"], 6)
+                self.partida.persistencia.fechar()
+
+    def test_troca_invalida(self):
+        with self.assertRaises(acoes.AcaoInvalida):
+            acoes.trocar_cartas(self.partida, "Ana", [])
+        with self.assertRaises(acoes.AcaoInvalida):
+            acoes.trocar_cartas(self.partida, "Ana", ["Infantaria", "Cavalaria", "Artilharia"])
+        with self.assertRaises(acoes.AcaoInvalida):
+            acoes.trocar_cartas(self.partida, "Ana", ["Infantaria", "Infantaria", "Cavalaria"])
+
+    def test_troca_no_lote_e_desfeita_com_ele(self):
+        self.comprar_ate_trocar("Ana")
+        trio = self.partida.baralho.maos["Ana"].melhor_troca()
+        escolhidas = [nome for nome, quantidade in zip(cartas.NOMES, trio) for _ in range(quantidade)]
+        antes = list(self.partida.jogadores["Ana"].cartas)
+        with self.assertRaises(acoes.AcaoInvalida):
+            acoes.executar_lote(self.partida, [
+                ("troca-cartas", {"jogador": "Ana", "cartas": escolhidas}),
+                ("mover-exercitos", {"jogador": "Ana", "origem": "x", "destino": "y", "quantidade": 1}),
+            ])
+        self.assertEqual(self.partida.jogadores["Ana"].cartas, antes)
+        self.assertEqual(self.partida.baralho.trocas, 0)
+        resultados = acoes.executar_lote(self.partida, [("troca-cartas", {"jogador": "Ana", "cartas": escolhidas})])
+        self.assertEqual(resultados[0]["exercitos"], 4)
+        recarregada = self.carregar()
+        self.assertEqual(len(recarregada.jogadores["Ana"].cartas), len(antes) - 3)
+        recarregada.persistencia.fechar()
+
+    def test_cartas_circulam_pelo_descarte(self):
+        for i in range(200):
+            nome = ("Ana", "Bia")[i % 2]
+            if acoes.receber_cartas(self.partida, nome)["troca_disponivel"]:
+                acoes.trocar_cartas(self.partida, nome, [])
+        baralho = self.partida.baralho
+        nas_maos = sum(len(j.cartas) for j in self.partida.jogadores)
+        self.assertEqual(nas_maos + len(baralho.monte) + len(baralho.descarte), 44)
+        for j in self.partida.jogadores:
+            self.assertEqual(baralho.maos[j.nome].contagem, list(cartas.contar(j.cartas)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import asyncio
+import os
+import tempfile
+import unittest
+import httpx
+from fastapi import FastAPI, Request
+from coordenador import Anel, Roteador
+from partida import JOGO_PADRAO, Partidas
+from posse import PartidaEmOutroProcesso
+
+
+class TestAnel(unittest.TestCase):
+    def test_divide_e_move_pouco(self):
+        chaves = [f"jogo-{i}" for i in range(20_000)]
+        quatro = Anel([f"t{i}" for i in range(4)])
+        donos = [quatro.no(chave) for chave in chaves]
+        for no in quatro.nos:
+            self.assertAlmostEqual(donos.count(no) / len(chaves), 0.25, delta=0.05)
+        # Um quinto trabalhador só recebe partidas: ~1/5 delas muda de dono, todas para ele
+        cinco = Anel([f"t{i}" for i in range(5)])
+        movidas = [chave for chave, dono in zip(chaves, donos) if cinco.no(chave) != dono]
+        self.assertAlmostEqual(len(movidas) / len(chaves), 0.2, delta=0.05)
+        self.assertEqual({cinco.no(chave) for chave in movidas}, {"t4"})
+
+
+class TestPosse(unittest.TestCase):
+    def test_um_processo_por_partida(self):
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, "dados.json")
+            primeiro, segundo = Partidas(diretorio, caminho), Partidas(diretorio, caminho)
+            primeiro.obter(JOGO_PADRAO)
+            with self.assertRaises(PartidaEmOutroProcesso):
+                segundo.obter(JOGO_PADRAO)
+            primeiro.fechar()
+            self.assertIsNotNone(segundo.obter(JOGO_PADRAO))
+            segundo.fechar()
+
+
+# Trabalhador de mentira: responde quem atendeu e o que chegou
+def trabalhador(nome: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.api_route("/{caminho:path}", methods=["GET", "POST"])
+    async def eco(caminho: str, request: Request):
+        return {"trabalhador": nome, "caminho": "/" + caminho, "parametros": dict(request.query_params), "corpo": (await request.body()).decode()}
+    return app
+
+
+class TestRoteador(unittest.TestCase):
+    def test_encaminha_ao_dono(self):
+        urls = ["http://t0", "http://t1", "http://t2"]
+        roteador = Roteador(urls, transportes={url: httpx.ASGITransport(app=trabalhador(url)) for url in urls})
+
+        async def requisicoes():
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=roteador), base_url="http://frente") as cliente:
+                respostas = [
+                    await cliente.post("/jogos/abc/rodada/troca-cartas/", params={"jogador": "Ana"}, json=["Coringa"]),
+                    await cliente.get("/jogadores/ver/", params={"nome": "Ana", "jogo_id": "xyz"}),
+                    await cliente.get("/gerar-json/"),
+                    await cliente.post("/jogos/", params={"semente": 3}),
+                    await cliente.get("/coordenador/dono/", params={"jogo_id": "abc"}),
+                ]
+            await roteador.fechar()
+            return [resposta.json() for resposta in respostas]
+
+        troca, ver, gerar, criar, dono = asyncio.run(requisicoes())
+        self.assertEqual(troca["trabalhador"], roteador.anel.no("abc"))
+        self.assertEqual(troca["parametros"], {"jogador": "Ana"})
+        self.assertEqual(troca["corpo"], '["Coringa"]')
+        self.assertEqual(ver["trabalhador"], roteador.anel.no("xyz"))
+        self.assertEqual(gerar["trabalhador"], roteador.anel.no(JOGO_PADRAO))
+        # A criação sem id ganha um, e vai ao dono dele
+        self.assertEqual(criar["trabalhador"], roteador.anel.no(criar["parametros"]["jogo_id"]))
+        self.assertEqual(criar["parametros"]["semente"], "3")
+        self.assertEqual(dono["trabalhador"], troca["trabalhador"])
+
+
+if __name__ == '__main__':
+    unittest.main()
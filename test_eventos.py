@@ -0,0 +1,59 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+import acoes
+from eventos import Conexao, Transmissao
+from partida import Partida
+from persistencia import Persistencia
+
+
+class TestTransmissao(unittest.TestCase):
+    def test_buffer_descarta_os_mais_antigos(self):
+        async def cenario():
+            transmissao = Transmissao("teste", tamanho_buffer=2)
+            conexao = transmissao.conectar()
+            for i in range(5):
+                transmissao.notificar_observadores("rodada_iniciada", rodada=i)
+            lote = await conexao.proximos()
+            self.assertEqual([e.seq for e in lote], [4, 5])
+            self.assertEqual(conexao.descartados, 3)
+            self.assertTrue(lote[0].sse.startswith("id: 4\nevent: rodada_iniciada\n"))
+        asyncio.run(cenario())
+
+    def test_evento_de_outra_thread(self):
+        async def cenario():
+            transmissao = Transmissao("teste")
+            conexao = transmissao.conectar()
+            await asyncio.to_thread(transmissao.notificar_observadores, "carta_recebida", jogador="Edson")
+            evento = (await asyncio.wait_for(conexao.proximos(), 1))[0]
+            self.assertEqual(json.loads(evento.json)["dados"], {"jogador": "Edson"})
+        asyncio.run(cenario())
+
+    def test_lote_desfeito_nao_notifica(self):
+        async def cenario():
+            with tempfile.TemporaryDirectory() as diretorio:
+                partida = Partida("teste", Persistencia(os.path.join(diretorio, "dados.json"), sincronizar=False))
+                partida.carregar()
+                conexao = partida.transmissao.conectar()
+                acoes.adicionar_jogador(partida, "Edson")
+                with self.assertRaises(acoes.ErroDeJogo):
+                    acoes.executar_lote(partida, [("receber-cartas", {"jogador": "Edson"}), ("receber-cartas", {"jogador": "Pedro"})])
+                acoes.executar_lote(partida, [("distribuir-exercitos", {"jogador": "Edson", "exercitos": 3})])
+                tipos = [e.tipo for e in await conexao.proximos()]
+                self.assertEqual(tipos, ["jogador_adicionado", "exercitos_distribuidos"])
+                partida.fechar()
+        asyncio.run(cenario())
+
+    def test_conexao_removida(self):
+        transmissao = Transmissao("teste")
+        conexao = Conexao()
+        transmissao.adicionar_observador(conexao)
+        transmissao.remover_observador(conexao)
+        transmissao.notificar_observadores("rodada_iniciada")
+        self.assertEqual(len(conexao.fila), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,156 @@
+import asyncio
+import threading
+import unittest
+from gravador import Gravador
+
+
+# Persistência de mentira: guarda cada lote, pode falhar nas próximas `falhas` gravações
+# e pode segurar a gravação até `liberada` ser marcado
+class PersistenciaFalsa:
+    def __init__(self, falhas: int = 0):
+        self.lotes = []
+        self.falhas = falhas
+        self.liberada = threading.Event()
+        self.liberada.set()
+
+    def registrar_lote(self, registros):
+        self.liberada.wait(5)
+        if self.falhas:
+            self.falhas -= 1
+            raise OSError("disco cheio")
+        self.lotes.append(list(registros))
+
+
+def registro(i: int) -> dict:
+    return {"op": "set", "nome": "Ana", "campos": {"exercitos": i}}
+
+
+def rodar(corrotina):
+    return asyncio.run(corrotina)
+
+
+class TestGravador(unittest.TestCase):
+    def test_direta_grava_na_hora(self):
+        persistencia = PersistenciaFalsa()
+        gravador = Gravador(persistencia, "direta")
+
+        async def cenario():
+            gravador.iniciar()
+            gravador.registrar_lote([registro(1)])
+            gravador.registrar_lote([registro(2)])
+            await gravador.confirmar()
+        rodar(cenario())
+        self.assertFalse(gravador.ativo)
+        self.assertEqual(persistencia.lotes, [[registro(1)], [registro(2)]])
+
+    def test_imediata_junta_a_rajada_num_lote(self):
+        persistencia = PersistenciaFalsa()
+        gravador = Gravador(persistencia, "imediata")
+
+        async def cenario():
+            gravador.iniciar()
+            for i in range(3):
+                gravador.registrar_lote([registro(i)])
+            await gravador.confirmar()
+            await gravador.parar()
+        rodar(cenario())
+        self.assertEqual(persistencia.lotes, [[registro(0), registro(1), registro(2)]])
+        self.assertEqual(gravador.gravados, 3)
+
+    def test_confirmar_espera_o_flush(self):
+        persistencia = PersistenciaFalsa()
+        persistencia.liberada.clear()
+        gravador = Gravador(persistencia, "imediata")
+
+        async def cenario():
+            gravador.iniciar()
+            gravador.registrar_lote([registro(1)])
+            confirmacao = asyncio.ensure_future(gravador.confirmar())
+            await asyncio.sleep(0.05)
+            self.assertFalse(confirmacao.done())
+            self.assertEqual(persistencia.lotes, [])
+            persistencia.liberada.set()
+            await confirmacao
+            self.assertEqual(persistencia.lotes, [[registro(1)]])
+            await gravador.parar()
+        rodar(cenario())
+
+    def test_atrasada_responde_antes_e_grava_depois(self):
+        persistencia = PersistenciaFalsa()
+        gravador = Gravador(persistencia, "atrasada", atraso_ms=20)
+
+        async def cenario():
+            gravador.iniciar()
+            gravador.registrar_lote([registro(1)])
+            await gravador.confirmar()
+            self.assertEqual(persistencia.lotes, [])
+            gravador.registrar_lote([registro(2)])
+            await gravador.descarregar()
+            self.assertEqual(persistencia.lotes, [[registro(1), registro(2)]])
+            await gravador.parar()
+        rodar(cenario())
+
+    def test_erro_avisa_e_a_proxima_tentativa_grava(self):
+        persistencia = PersistenciaFalsa(falhas=1)
+        gravador = Gravador(persistencia, "imediata")
+
+        async def cenario():
+            gravador.iniciar()
+            gravador.registrar_lote([registro(1)])
+            with self.assertRaises(OSError):
+                await gravador.confirmar()
+            gravador.registrar_lote([registro(2)])
+            await gravador.confirmar()
+            await gravador.parar()
+        rodar(cenario())
+        # O lote que falhou é regravado antes do seguinte, sem perder nem reordenar registros
+        self.assertEqual([r for lote in persistencia.lotes for r in lote], [registro(1), registro(2)])
+        self.assertEqual(gravador.gravados, gravador.enfileirados)
+
+    def test_parar_descarrega_o_pendente(self):
+        persistencia = PersistenciaFalsa()
+        gravador = Gravador(persistencia, "atrasada", atraso_ms=10_000)
+
+        async def cenario():
+            gravador.iniciar()
+            gravador.registrar_lote([registro(1)])
+            await asyncio.wait_for(gravador.parar(), 5)   # sem esperar a janela de 10 s
+        rodar(cenario())
+        self.assertFalse(gravador.ativo)
+        self.assertEqual(persistencia.lotes, [[registro(1)]])
+
+    def test_parar_com_erro_propaga(self):
+        persistencia = PersistenciaFalsa(falhas=1)
+        gravador = Gravador(persistencia, "imediata")
+
+        async def cenario():
+            gravador.iniciar()
+            gravador.registrar_lote([registro(1)])
+            await gravador.parar()
+        with self.assertRaises(OSError):
+            rodar(cenario())
+        # Sem escritor: o que ficou pendente é gravado antes do próximo lote, direto
+        self.assertFalse(gravador.ativo)
+        gravador.registrar_lote([registro(2)])
+        self.assertEqual(persistencia.lotes, [[registro(1), registro(2)]])
+
+    def test_erro_tenta_de_novo_sem_trafego(self):
+        persistencia = PersistenciaFalsa(falhas=2)
+        gravador = Gravador(persistencia, "atrasada", atraso_ms=1)
+
+        async def cenario():
+            gravador.iniciar()
+            gravador.registrar_lote([registro(1)])
+            # Nenhuma mutação nova: as novas tentativas vêm do próprio gravador (50 ms, 100 ms)
+            for _ in range(100):
+                if persistencia.lotes:
+                    break
+                await asyncio.sleep(0.02)
+            self.assertEqual(persistencia.lotes, [[registro(1)]])
+            self.assertEqual(gravador.gravados, 1)
+            await gravador.parar()
+        rodar(cenario())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import os
+import random
+import tempfile
+import time
+import unittest
+from array import array
+from fastapi.testclient import TestClient
+import ia
+import main
+from mapa import MAPA_WAR
+from objetivos import interpretar
+from partida import Partidas
+
+
+def situacao(territorios_do_primeiro: int, objetivo: str, reforcos: int = 10):
+    # Jogador 0 com os primeiros territórios do mapa, jogador 1 com o resto, 1 exército em cada
+    dono = array("b", [0 if t < territorios_do_primeiro else 1 for t in range(len(MAPA_WAR))])
+    exercitos = array("i", [1] * len(MAPA_WAR))
+    metas = [interpretar(objetivo, MAPA_WAR.continentes, len(MAPA_WAR)), None]
+    return ia.Situacao(dono, exercitos, 0, reforcos), ia.Contexto(MAPA_WAR, metas)
+
+
+class TestBusca(unittest.TestCase):
+    def test_encontra_a_conquista_que_cumpre_o_objetivo(self):
+        raiz, contexto = situacao(23, "Conquistar 24 territórios")
+        sugestao = ia.Conselheiro(1).sugerir(raiz, contexto, 0.3, semente=1)
+        reforco, ataque = sugestao["plano"]
+        self.assertEqual(reforco[0], ia.REFORCO)
+        self.assertTrue(ia.e_ataque(ataque))
+        self.assertEqual(ataque[1], reforco[1])
+        self.assertGreater(sugestao["jogadas"][0][2], 0.9)
+
+    def test_prazo(self):
+        raiz, contexto = situacao(20, "Controlar dois continentes")
+        # Prazo já vencido: nenhum rollout, e a busca volta sem jogadas
+        sugestao = ia.Conselheiro(1).sugerir(raiz, contexto, 0, semente=2)
+        self.assertEqual(sugestao["rollouts"], 0)
+        self.assertEqual(sugestao["plano"], [])
+        self.assertEqual(ia.Arvore().buscar(raiz, contexto, time.monotonic() - 1, random.Random(0)), 0)
+        # Prazo folgado: quem para a busca é o limite de iterações
+        inicio = time.monotonic()
+        sugestao = ia.Conselheiro(1).sugerir(raiz, contexto, 60, semente=2, iteracoes=50)
+        self.assertEqual(sugestao["rollouts"], 50)
+        self.assertLess(time.monotonic() - inicio, 30)
+
+    def test_arvore_continua_entre_buscas(self):
+        raiz, contexto = situacao(20, "Eliminar um oponente")
+        conselheiro = ia.Conselheiro(1)
+        primeira = conselheiro.sugerir(raiz, contexto, 0.05, chave="reuso", semente=3)
+        segunda = conselheiro.sugerir(raiz, contexto, 0.05, chave="reuso", semente=4)
+        visitas = lambda sugestao: sum(n for _, n, _ in sugestao["jogadas"])
+        self.assertGreater(visitas(segunda), visitas(primeira) + segunda["rollouts"] // 2)
+
+    def test_copia_independente(self):
+        raiz, contexto = situacao(20, "Conquistar 24 territórios")
+        copia = raiz.copia()
+        ia.completar(copia, contexto, random.Random(0))
+        self.assertEqual(copia.fase, ia.FIM)
+        self.assertEqual(raiz.fase, ia.REFORCO)
+        self.assertEqual(list(raiz.exercitos), [1] * len(MAPA_WAR))
+
+
+class TestRotaSugerirJogada(unittest.TestCase):
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.originais = main.partidas, main.conselheiro
+        main.partidas = Partidas(self.diretorio.name, os.path.join(self.diretorio.name, "dados.json"))
+        main.conselheiro = ia.Conselheiro(1)
+        self.cliente = TestClient(main.app)
+        for nome in ("Ana", "Bia"):
+            self.cliente.post("/jogadores/adicionar/", params={"nome": nome})
+            self.cliente.post("/preparacao/objetivo/", params={"jogador": nome})
+            self.cliente.post("/preparacao/distribuir-exercitos/", params={"jogador": nome, "exercitos": 40})
+
+    def tearDown(self):
+        main.partidas.fechar()
+        main.partidas, main.conselheiro = self.originais
+        self.diretorio.cleanup()
+
+    def test_plano_com_acoes_do_lote(self):
+        self.assertEqual(self.cliente.post("/rodada/sugerir-jogada/", params={"jogador": "Ana"}).status_code, 400)
+        self.cliente.post("/preparacao/distribuir-territorios/")
+        resposta = self.cliente.post("/rodada/sugerir-jogada/", params={"jogador": "Ana", "tempo_ms": 100}).json()
+        self.assertEqual(resposta["plano"][0]["tipo"], "reforco")
+        self.assertEqual(resposta["plano"][0]["exercitos"], 40 - 21)
+        # O ataque sugerido é aceito pelo lote
+        ataque = resposta["plano"][-1]
+        self.assertEqual(ataque["tipo"], "ataque")
+        lote = self.cliente.post("/rodada/lote/", json=[{"acao": ataque["acao"], "parametros": ataque["parametros"]}])
+        self.assertEqual(lote.status_code, 200)
+        self.assertEqual(self.cliente.post("/rodada/sugerir-jogada/", params={"jogador": "Ana", "tempo_ms": 0}).status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
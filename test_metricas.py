@@ -0,0 +1,80 @@
+import os
+import re
+import tempfile
+import time
+import unittest
+from fastapi.testclient import TestClient
+import main
+import metricas
+from partida import Partidas
+
+
+def valor(texto: str, serie: str) -> float:
+    encontrado = re.search(rf"^{re.escape(serie)} (\S+)$", texto, re.M)
+    return float(encontrado.group(1)) if encontrado else 0.0
+
+
+class TestRegistro(unittest.TestCase):
+    def test_formato_prometheus(self):
+        registro = metricas.Registro()
+        registro.contador("teste_total", "Contador", tipo='a"b').inc(3)
+        histograma = registro.histograma("teste_segundos", "Tempo")
+        histograma.observar(0.0002)
+        histograma.observar(10)
+        registro.valor("teste_valor", "Gauge", lambda: [({"x": "1"}, 2)])
+        texto = registro.texto()
+        self.assertIn("# TYPE teste_total counter", texto)
+        self.assertIn('teste_total{tipo="a\\"b"} 3', texto)
+        self.assertIn('teste_segundos_bucket{le="0.0001"} 0', texto)
+        self.assertIn('teste_segundos_bucket{le="0.00025"} 1', texto)
+        self.assertIn('teste_segundos_bucket{le="+Inf"} 2', texto)
+        self.assertIn("teste_segundos_count 2", texto)
+        self.assertIn('teste_valor{x="1"} 2', texto)
+        with self.assertRaises(ValueError):
+            registro.contador("teste_segundos", "Outro tipo")
+
+
+class TestRotaMetricas(unittest.TestCase):
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.original = main.partidas
+        main.partidas = Partidas(self.diretorio.name, os.path.join(self.diretorio.name, "dados.json"))
+        self.cliente = TestClient(main.app)
+
+    def tearDown(self):
+        metricas.perfilador.desligar()
+        main.partidas.fechar()
+        main.partidas = self.original
+        self.diretorio.cleanup()
+
+    def test_rotas_e_gravacoes(self):
+        self.cliente.post("/jogos/", params={"jogo_id": "x"})
+        antes = self.cliente.get("/metrics").text
+        self.cliente.post("/jogadores/adicionar/", params={"nome": "Edson"})
+        self.cliente.post("/jogos/x/jogadores/adicionar/", params={"nome": "Edson"})
+        resposta = self.cliente.get("/metrics")
+        self.assertTrue(resposta.headers["content-type"].startswith("text/plain"))
+        depois = resposta.text
+        # As duas URLs caem na mesma série: a rota é a função que atende
+        serie = 'war_requisicao_segundos_count{metodo="POST",rota="adicionar_jogador",status="200"}'
+        self.assertEqual(valor(depois, serie) - valor(antes, serie), 2)
+        serie = 'war_persistencia_registros_total{armazenamento="json"}'
+        self.assertEqual(valor(depois, serie) - valor(antes, serie), 2)
+        self.assertGreater(valor(depois, 'war_persistencia_bytes_total{armazenamento="json"}'), 0)
+
+    def test_perfilador(self):
+        resposta = self.cliente.post("/metrics/perfilador/", params={"ligado": True, "zerar": True}).json()
+        self.assertTrue(resposta["ligado"])
+        fim = time.perf_counter() + 0.2
+        while time.perf_counter() < fim:
+            pass
+        texto = self.cliente.get("/metrics").text
+        self.assertEqual(valor(texto, "war_perfil_ligado"), 1)
+        self.assertGreater(valor(texto, "war_perfil_amostras"), 0)
+        self.assertIn('funcao="test_metricas.py:test_perfilador"', texto)
+        resposta = self.cliente.post("/metrics/perfilador/", params={"ligado": False}).json()
+        self.assertFalse(resposta["ligado"])
+
+
+if __name__ == '__main__':
+    unittest.main()
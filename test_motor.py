@@ -0,0 +1,35 @@
+import random
+import unittest
+from motor import PoliticaAgressiva, PoliticaAleatoria, jogar_partida, simular
+from mapa import MAPA_WAR
+
+
+class TestMotor(unittest.TestCase):
+    def setUp(self):
+        self.politicas = [PoliticaAgressiva(), PoliticaAleatoria(), PoliticaAleatoria()]
+
+    def test_mesma_semente_mesma_partida(self):
+        a = jogar_partida(self.politicas, random.Random(42))
+        b = jogar_partida(self.politicas, random.Random(42))
+        self.assertEqual(a, b)
+
+    def test_partida_termina_com_vencedor(self):
+        resultado = jogar_partida(self.politicas, random.Random(7))
+        self.assertIn(resultado["vencedor"], range(3))
+        self.assertEqual(sorted(resultado["ordem"]), [0, 1, 2])
+
+    def test_partida_no_mapa_war(self):
+        resultado = jogar_partida(self.politicas, random.Random(3), MAPA_WAR)
+        self.assertEqual(len(resultado["objetivos"]), 3)
+        self.assertGreater(resultado["rodadas"], 0)
+
+    def test_simular_soma_as_partidas_dos_lotes(self):
+        resultado = simular(250, self.politicas, semente=1, processos=1, lote=100)
+        self.assertEqual(resultado["partidas"], 250)
+        total = sum(resultado["vitoria_por_jogador"].values()) + resultado["empates"]
+        self.assertAlmostEqual(total, 1.0)
+        self.assertEqual(resultado, simular(250, self.politicas, semente=1, processos=1, lote=100))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import tempfile
+import unittest
+from mapa import CONTINENTES, MAPA_WAR
+from objetivos import Acompanhamento, interpretar
+from partida import Partida
+from persistencia import Persistencia
+
+
+class TestInterpretar(unittest.TestCase):
+    def test_textos_do_jogo(self):
+        meta = interpretar("Conquistar a Europa, América do Sul e um terceiro continente", CONTINENTES, 42)
+        self.assertEqual(meta.continentes, {"Europa", "América do Sul"})
+        self.assertEqual(meta.continentes_extras, 1)
+        self.assertEqual(interpretar("Conquistar 24 territórios", CONTINENTES, 6).territorios, 6)
+        self.assertTrue(interpretar("Eliminar um jogador").eliminar)
+        # Sem continentes no tabuleiro, objetivo de continente vale como conquista total
+        self.assertEqual(interpretar("Conquistar 2 continentes", (), 5).territorios, 5)
+        with self.assertRaises(ValueError):
+            interpretar("Conquistar a Atlântida", CONTINENTES, 42)
+
+
+class TestAcompanhamento(unittest.TestCase):
+    def setUp(self):
+        self.objetivos = Acompanhamento(MAPA_WAR.continentes, len(MAPA_WAR))
+        self.oceania = MAPA_WAR.continentes["Oceania"]
+
+    def test_continente_completo_e_perdido(self):
+        self.objetivos.definir_objetivo("A", "Conquistar 1 continentes")
+        for t in self.oceania[:-1]:
+            self.objetivos.atribuir(t, "A")
+        self.objetivos.atribuir(self.oceania[-1], "B")
+        self.assertFalse(self.objetivos.cumpriu("A"))
+        self.objetivos.atribuir(self.oceania[-1], "A", "B", conquista=True)
+        self.assertTrue(self.objetivos.cumpriu("A"))
+        self.objetivos.atribuir(self.oceania[0], "B", "A", conquista=True)
+        self.assertFalse(self.objetivos.cumpriu("A"))
+        self.assertEqual(self.objetivos.concluidos(), [])
+
+    def test_eliminacao(self):
+        self.objetivos.definir_objetivo("A", "Eliminar um jogador")
+        self.objetivos.atribuir(0, "A")
+        self.objetivos.atribuir(1, "B")
+        self.assertFalse(self.objetivos.cumpriu("A"))
+        self.objetivos.atribuir(1, "A", "B", conquista=True)
+        self.assertTrue(self.objetivos.cumpriu("A"))
+
+    def test_texto_interpretado_uma_vez(self):
+        self.objetivos.definir_objetivo("A", "Conquistar 18 territórios")
+        self.objetivos.definir_objetivo("B", "Conquistar 18 territórios")
+        self.assertIs(self.objetivos.metas["A"], self.objetivos.metas["B"])
+
+    def test_texto_desconhecido_fica_sem_meta(self):
+        self.objetivos.definir_objetivo("A", "Conquistar 18 territórios")
+        with self.assertLogs("objetivos", "WARNING"):
+            self.objetivos.definir_objetivo("A", "Dominar o mundo")
+        self.assertNotIn("A", self.objetivos.metas)
+        self.objetivos.atribuir(0, "A")
+        self.assertFalse(self.objetivos.cumpriu("A"))
+
+
+class TestCargaDaPartida(unittest.TestCase):
+    def test_objetivo_desconhecido_nao_impede_a_carga(self):
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, "dados.json")
+            persistencia = Persistencia(caminho, sincronizar=False)
+            persistencia.registrar("novo", jogador={"nome": "Ana", "objetivo": "Dominar o mundo", "territorios": ["Brasil"]})
+            persistencia.fechar()
+            partida = Partida("teste", Persistencia(caminho, sincronizar=False))
+            with self.assertLogs("objetivos", "WARNING"):
+                partida.carregar()
+            self.assertEqual(partida.jogadores["Ana"].objetivo, "Dominar o mundo")
+            self.assertEqual(partida.objetivos.concluidos(), [])
+            partida.persistencia.fechar()
+
+
+
+# O app do PadrãoObserverMarcelo roda sozinho, da própria pasta, e leva uma cópia deste
+# módulo: as duas têm de continuar iguais
+class TestCopiaDoObserver(unittest.TestCase):
+    def test_copia_identica(self):
+        raiz = os.path.dirname(os.path.abspath(__file__))
+        with open(os.path.join(raiz, "objetivos.py"), "rb") as original, open(os.path.join(raiz, "PadrãoObserverMarcelo", "objetivos.py"), "rb") as copia:
+            self.assertEqual(copia.read(), original.read(), "PadrãoObserverMarcelo/objetivos.py divergiu de objetivos.py")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import os
+import tempfile
+import unittest
+from fastapi.testclient import TestClient
+import main
+from partida import JOGO_PADRAO, Partidas
+
+
+def nomes(resposta) -> list:
+    return [jogador["nome"] for jogador in resposta.json()["jogadores"]]
+
+
+class TestPartidas(unittest.TestCase):
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.partidas = Partidas(os.path.join(self.diretorio.name, "jogos"), os.path.join(self.diretorio.name, "dados.json"))
+
+    def tearDown(self):
+        self.partidas.fechar()
+        self.diretorio.cleanup()
+
+    def test_criar_e_obter(self):
+        partida = self.partidas.criar("abc")
+        self.assertIs(self.partidas.obter("abc"), partida)
+        self.assertTrue(os.path.exists(os.path.join(self.diretorio.name, "jogos", "abc.json")))
+        self.assertEqual(len(self.partidas.criar().id), 12)
+
+    def test_id_repetido_ou_invalido(self):
+        self.partidas.criar("abc")
+        for id in ("abc", "../fora", "com espaço", "x" * 65):
+            with self.assertRaises(ValueError):
+                self.partidas.criar(id)
+
+    def test_desconhecida(self):
+        self.assertIsNone(self.partidas.obter("nao-existe"))
+        self.assertIsNone(self.partidas.obter("../dados"))
+        # A padrão sempre existe, mesmo sem nada no disco
+        self.assertIsNotNone(self.partidas.obter(JOGO_PADRAO))
+
+
+class TestRotasPorPartida(unittest.TestCase):
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.original = main.partidas
+        main.partidas = self.novas_partidas()
+        self.cliente = TestClient(main.app)
+
+    def tearDown(self):
+        main.partidas.fechar()
+        main.partidas = self.original
+        self.diretorio.cleanup()
+
+    def novas_partidas(self) -> Partidas:
+        return Partidas(os.path.join(self.diretorio.name, "jogos"), os.path.join(self.diretorio.name, "dados.json"))
+
+    def criar(self, jogo_id: str):
+        resposta = self.cliente.post("/jogos/", params={"jogo_id": jogo_id})
+        self.assertEqual(resposta.status_code, 200)
+        self.assertEqual(resposta.json()["jogo_id"], jogo_id)
+
+    def test_partidas_isoladas(self):
+        self.criar("a")
+        self.criar("b")
+        self.cliente.post("/jogos/a/jogadores/adicionar/", params={"nome": "Ana"})
+        self.cliente.post("/jogos/b/jogadores/adicionar/", params={"nome": "Bia"})
+        self.assertEqual(nomes(self.cliente.get("/jogos/a/gerar-json/")), ["Ana"])
+        self.assertEqual(nomes(self.cliente.get("/jogos/b/gerar-json/")), ["Bia"])
+        self.assertEqual(self.cliente.get("/jogos/b/jogadores/ver/", params={"nome": "Ana"}).status_code, 404)
+        # As rotas sem prefixo são da partida padrão, que não viu nenhum dos dois
+        self.assertEqual(nomes(self.cliente.get("/gerar-json/")), [])
+
+    def test_criacao_repetida_ou_invalida(self):
+        self.criar("a")
+        self.assertEqual(self.cliente.post("/jogos/", params={"jogo_id": "a"}).status_code, 400)
+        self.assertEqual(self.cliente.post("/jogos/", params={"jogo_id": "a.b"}).status_code, 400)
+        resposta = self.cliente.post("/jogos/")
+        self.assertEqual(resposta.status_code, 200)
+        self.assertIsNotNone(main.partidas.obter(resposta.json()["jogo_id"]))
+
+    def test_recarrega_depois_de_reiniciar(self):
+        self.criar("a")
+        self.cliente.post("/jogos/a/jogadores/adicionar/", params={"nome": "Ana"})
+        self.cliente.post("/jogos/a/preparacao/distribuir-exercitos/", params={"jogador": "Ana", "exercitos": 7})
+        self.assertTrue(os.path.exists(os.path.join(self.diretorio.name, "jogos", "a.json")))
+        main.partidas.fechar()
+        main.partidas = self.novas_partidas()
+        resposta = self.cliente.get("/jogos/a/jogadores/ver/", params={"nome": "Ana"})
+        self.assertEqual(resposta.status_code, 200)
+        self.assertEqual(resposta.json()["exercitos"], 7)
+
+    def test_partida_desconhecida(self):
+        self.assertEqual(self.cliente.get("/jogos/nao-existe/gerar-json/").status_code, 404)
+        self.assertEqual(self.cliente.post("/jogos/nao-existe/jogadores/adicionar/", params={"nome": "Ana"}).status_code, 404)
+        self.assertEqual(self.cliente.get("/gerar-json/", params={"jogo_id": "nao-existe"}).status_code, 404)
+        confrontos = [{"atacantes": 3, "defensores": 2}]
+        self.assertEqual(self.cliente.post("/jogos/nao-existe/rodada/ataque/probabilidades/", json=confrontos).status_code, 404)
+        self.criar("a")
+        self.assertEqual(self.cliente.post("/jogos/a/rodada/ataque/probabilidades/", json=confrontos).status_code, 200)
+        self.assertFalse(os.path.exists(os.path.join(self.diretorio.name, "jogos", "nao-existe.json")))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,173 @@
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+from persistencia import Persistencia
+from persistencia_sqlite import PersistenciaSQLite
+
+
+class TestPersistencia(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.caminho = os.path.join(self.dir.name, "dados.json")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def abrir(self, limite_log=1000):
+        persistencia = Persistencia(self.caminho, limite_log=limite_log, sincronizar=False)
+        persistencia.carregar()
+        return persistencia
+
+    def popular(self, persistencia):
+        persistencia.registrar("novo", jogador={"nome": "Edson", "territorios": [], "exercitos": 0, "cartas": []})
+        persistencia.registrar("novo", jogador={"nome": "Marcelo", "territorios": [], "exercitos": 0, "cartas": []})
+        persistencia.registrar("set", nome="Edson", campos={"exercitos": 7})
+        persistencia.registrar("add", nome="Marcelo", campo="territorios", valor="Território 1")
+        persistencia.registrar("ordem", nomes=["Marcelo", "Edson"])
+
+    def test_reaplica_log_apos_reabrir(self):
+        persistencia = self.abrir()
+        self.popular(persistencia)
+        persistencia.fechar()
+        jogadores = self.abrir().carregar()["jogadores"]
+        self.assertEqual([j["nome"] for j in jogadores], ["Marcelo", "Edson"])
+        self.assertEqual(jogadores[1]["exercitos"], 7)
+        self.assertEqual(jogadores[0]["territorios"], ["Território 1"])
+
+    def test_ignora_registro_incompleto(self):
+        persistencia = self.abrir()
+        self.popular(persistencia)
+        persistencia.fechar()
+        with open(self.caminho + ".log", "ab") as f:
+            f.write(b'0000abcd {"op":"set","nome":"Edson"')  # queda no meio da escrita
+        persistencia = self.abrir()
+        persistencia.registrar("set", nome="Edson", campos={"exercitos": 9})
+        persistencia.fechar()
+        jogadores = self.abrir().carregar()["jogadores"]
+        self.assertEqual(jogadores[1]["exercitos"], 9)
+
+    def test_compactacao_gera_snapshot(self):
+        persistencia = self.abrir(limite_log=3)
+        self.popular(persistencia)
+        persistencia.compactar()
+        persistencia.registrar("set", nome="Marcelo", campos={"exercitos": 3})
+        persistencia.fechar()
+        with open(self.caminho, encoding="utf-8") as f:
+            snapshot = json.load(f)
+        self.assertEqual(snapshot["seq"], 5)
+        self.assertFalse(os.path.exists(self.caminho + ".log.1"))
+        jogadores = self.abrir().carregar()["jogadores"]
+        self.assertEqual([(j["nome"], j["exercitos"]) for j in jogadores], [("Marcelo", 3), ("Edson", 7)])
+
+    def test_snapshot_um_jogador_por_linha(self):
+        persistencia = self.abrir()
+        self.popular(persistencia)
+        persistencia.compactar()
+        persistencia.registrar("set", nome="Marcelo", campos={"exercitos": 3})
+        persistencia.fechar()
+        with open(self.caminho, "rb") as f:
+            linhas = f.read().splitlines()
+        self.assertEqual(linhas[0], b'{"seq":5,"jogadores":[')
+        self.assertEqual(len(linhas), 4)
+        # Só o jogador tocado pelo log é decodificado
+        jogadores = self.abrir().carregar(brutos=True)["jogadores"]
+        self.assertEqual(jogadores[0]["exercitos"], 3)
+        self.assertIsInstance(jogadores[1], bytes)
+        self.assertEqual(json.loads(jogadores[1])["exercitos"], 7)
+
+    def test_compactacao_interrompida(self):
+        persistencia = self.abrir()
+        self.popular(persistencia)
+        persistencia.fechar()
+        os.replace(self.caminho + ".log", self.caminho + ".log.1")
+        jogadores = self.abrir().carregar()["jogadores"]
+        self.assertEqual(len(jogadores), 2)
+        self.assertFalse(os.path.exists(self.caminho + ".log.1"))
+
+    def test_carrega_snapshot_legado(self):
+        with open(self.caminho, "w") as f:
+            json.dump({"jogadores": [{"nome": "Pedro", "exercitos": 5}]}, f, indent=4)
+        jogadores = self.abrir().carregar()["jogadores"]
+        self.assertEqual(jogadores, [{"nome": "Pedro", "exercitos": 5}])
+
+
+
+class TestPersistenciaSQLite(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.caminho = os.path.join(self.dir.name, "dados.json")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    popular = TestPersistencia.popular
+
+    def abrir(self, importar_de=None):
+        persistencia = PersistenciaSQLite(self.caminho + ".db", sincronizar=False, importar_de=importar_de)
+        persistencia.carregar()
+        return persistencia
+
+    def test_mesmo_estado_que_o_log_json(self):
+        registros = [
+            {"op": "novo", "jogador": {"nome": "Pedro", "cor_exercito": "Azul", "territorios": ["Brasil"], "exercitos": 2, "cartas": ["Carta 1"]}},
+            {"op": "add", "nome": "Edson", "campo": "cartas", "valor": "Carta 2"},
+            {"op": "add", "nome": "Edson", "campo": "cartas", "valor": "Carta 2"},
+            {"op": "del", "nome": "Edson", "campo": "cartas", "valor": "Carta 2"},
+            {"op": "set", "nome": "Pedro", "campos": {"territorios": ["Peru", "Argentina"], "objetivo": "Eliminar um jogador"}},
+            {"op": "set", "nome": "Edson", "campos": {"territorios": ["Brasil"], "trocas": 2, "eliminou": True}},
+            {"op": "rem", "nome": "Marcelo"},
+            {"op": "ordem", "nomes": ["Pedro", "Ninguém"]},
+        ]
+        estados = []
+        for persistencia in (Persistencia(self.caminho, sincronizar=False), PersistenciaSQLite(self.caminho + ".db", sincronizar=False)):
+            persistencia.carregar()
+            self.popular(persistencia)
+            persistencia.registrar_lote(registros)
+            persistencia.fechar()
+            persistencia.carregar()
+            estados.append([dict(j, territorios=sorted(j["territorios"])) for j in persistencia.carregar()["jogadores"]])
+            persistencia.fechar()
+        estados[0] = [dict({"cor_exercito": None, "objetivo": None, "trocas": 0, "eliminou": False}, **j) for j in estados[0]]
+        self.assertEqual(estados[1], estados[0])
+
+    def test_lote_com_erro_nao_grava_nada(self):
+        persistencia = self.abrir()
+        self.popular(persistencia)
+        with self.assertRaises(ValueError):
+            persistencia.registrar_lote([{"op": "set", "nome": "Edson", "campos": {"exercitos": 1}}, {"op": "???"}])
+        self.assertEqual(persistencia.carregar()["jogadores"][1]["exercitos"], 7)
+        persistencia.fechar()
+
+    def test_importa_o_json_na_primeira_carga(self):
+        persistencia = Persistencia(self.caminho, sincronizar=False)
+        persistencia.carregar()
+        self.popular(persistencia)
+        persistencia.fechar()
+        jogadores = self.abrir(importar_de=self.caminho).carregar()["jogadores"]
+        self.assertEqual([(j["nome"], j["exercitos"]) for j in jogadores], [("Marcelo", 0), ("Edson", 7)])
+
+    def test_reaplica_apos_reabrir(self):
+        persistencia = self.abrir()
+        self.popular(persistencia)
+        persistencia.fechar()
+        jogadores = self.abrir().carregar()["jogadores"]
+        self.assertEqual([j["nome"] for j in jogadores], ["Marcelo", "Edson"])
+        self.assertEqual(jogadores[0]["territorios"], ["Território 1"])
+
+    def test_banco_antigo_ganha_as_colunas_novas(self):
+        conexao = sqlite3.connect(self.caminho + ".db")
+        conexao.execute("CREATE TABLE jogadores (nome TEXT PRIMARY KEY, posicao INTEGER NOT NULL, cor_exercito TEXT, objetivo TEXT, exercitos INTEGER NOT NULL DEFAULT 0)")
+        conexao.execute("INSERT INTO jogadores (nome, posicao) VALUES ('Edson', 0)")
+        conexao.commit()
+        conexao.close()
+        persistencia = self.abrir()
+        persistencia.registrar("set", nome="Edson", campos={"trocas": 1, "eliminou": True})
+        jogador = persistencia.carregar()["jogadores"][0]
+        self.assertEqual((jogador["trocas"], jogador["eliminou"]), (1, True))
+        persistencia.fechar()
+
+
+if __name__ == '__main__':
+    unittest.main()
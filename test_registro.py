@@ -0,0 +1,46 @@
+import random
+import unittest
+from jogador import Jogador
+from registro import RegistroJogadores
+
+
+class TestRegistroJogadores(unittest.TestCase):
+    def setUp(self):
+        self.registro = RegistroJogadores([Jogador("Edson", "Vermelho"), Jogador("Marcelo", "Azul"), Jogador("Pedro", "Verde")])
+
+    def test_obter(self):
+        self.assertEqual(self.registro.obter("Marcelo").cor, "Azul")
+        self.assertIsNone(self.registro.obter("Waldemar"))
+        self.assertIn("Pedro", self.registro)
+
+    def test_rejeita_duplicado(self):
+        with self.assertRaises(ValueError):
+            self.registro.adicionar(Jogador("Edson", "Amarelo"))
+
+    def test_embaralhar_mantem_indice(self):
+        ordem = self.registro.embaralhar(random.Random(3))
+        self.assertEqual(self.registro.ordem(), ordem)
+        self.assertEqual([j.nome for j in self.registro], ordem)
+        for nome in ordem:
+            self.assertEqual(self.registro.obter(nome).nome, nome)
+
+    def test_remover(self):
+        self.registro.remover("Marcelo")
+        self.assertEqual(self.registro.ordem(), ["Edson", "Pedro"])
+        self.assertIsNone(self.registro.obter("Marcelo"))
+        self.assertEqual(len(self.registro), 2)
+
+    def test_monta_no_primeiro_acesso(self):
+        montados = []
+        registro = RegistroJogadores(fabrica=lambda cor: montados.append(cor) or Jogador("?", cor))
+        registro.adicionar_dados("Edson", "Vermelho")
+        registro.adicionar_dados("Marcelo", "Azul")
+        self.assertEqual(registro.pendentes, 2)
+        self.assertEqual(registro.obter("Marcelo").cor, "Azul")
+        self.assertEqual(montados, ["Azul"])
+        self.assertEqual([j.cor for j in registro], ["Vermelho", "Azul"])
+        self.assertEqual(registro.pendentes, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
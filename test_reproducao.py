@@ -0,0 +1,116 @@
+import os
+import tempfile
+import unittest
+import acoes
+from partida import Partida, Partidas
+from persistencia import Persistencia
+from reproducao import estado, ler_diario, reproduzir
+
+
+def jogar(partida: Partida) -> list:
+    resultados = []
+    for nome in ("Ana", "Bia", "Caio"):
+        acoes.adicionar_jogador(partida, nome)
+        acoes.distribuir_exercitos(partida, nome, 30)
+        acoes.receber_objetivo(partida, nome)
+    resultados.append(acoes.definir_ordem(partida))
+    territorios = acoes.distribuir_territorios(partida)
+    resultados.append(territorios)
+    # Ataques da Ana em cada fronteira dela com a Bia
+    fronteiras = [(a, b) for a in territorios["Ana"] for b in territorios["Bia"] if partida.tabuleiro.fazem_fronteira(a, b)]
+    for origem, destino in fronteiras * 3:
+        try:
+            resultados.append(acoes.atacar(partida, "Ana", origem, "Bia", destino))
+        except acoes.AcaoInvalida:
+            pass
+    resultados.append(acoes.receber_cartas(partida, "Caio"))
+    return resultados
+
+
+class TestReproducao(unittest.TestCase):
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.partidas = Partidas(diretorio=self.diretorio.name, caminho_padrao=os.path.join(self.diretorio.name, "dados.json"))
+
+    def tearDown(self):
+        self.partidas.fechar()
+        self.diretorio.cleanup()
+
+    def test_mesma_semente_mesmos_sorteios(self):
+        primeira = jogar(self.partidas.criar("a", semente=42))
+        segunda = jogar(self.partidas.criar("b", semente=42))
+        terceira = jogar(self.partidas.criar("c", semente=43))
+        self.assertEqual(primeira, segunda)
+        self.assertNotEqual(primeira, terceira)
+
+    def test_diario_refaz_a_partida(self):
+        partida = self.partidas.criar("a", semente=7)
+        resultados = jogar(partida)
+        # Lote desfeito: consumiu sorteios, então entra no diário com o erro
+        with self.assertRaises(acoes.AcaoInvalida):
+            acoes.executar_lote(partida, [
+                ("receber-cartas", {"jogador": "Ana"}),
+                ("mover-exercitos", {"jogador": "Ana", "origem": "x", "destino": "y", "quantidade": 1}),
+            ])
+        acoes.receber_cartas(partida, "Ana")
+        acoes.verificar_objetivo(partida, "Ana")   # leitura: fora do diário
+
+        # Nova carga: segmento novo com outra semente
+        self.partidas.fechar()
+        partida = self.partidas.obter("a")
+        acoes.iniciar_rodada(partida)
+        acoes.distribuir_territorios(partida)
+        acoes.receber_cartas(partida, "Bia")
+        final = estado(partida)
+        self.partidas.fechar()
+
+        entradas = list(ler_diario(self.partidas.caminho("a") + ".acoes"))
+        self.assertEqual(sum(1 for e in entradas if "semente" in e), 2)
+        self.assertNotIn("verificar_objetivo", [e.get("acao") for e in entradas])
+        reproduzidos = []
+        reproduzida = reproduzir(entradas, lambda indice, entrada, resultado: reproduzidos.append(resultado))
+        self.assertEqual(estado(reproduzida), final)
+        # Os mesmos dados em cada ataque do jogo original
+        ataques = [r for r in reproduzidos if isinstance(r, dict) and "resultados_dados" in r]
+        self.assertEqual(ataques, [r for r in resultados if isinstance(r, dict) and "resultados_dados" in r])
+
+    def test_partida_anterior_ao_diario(self):
+        caminho = os.path.join(self.diretorio.name, "antiga.json")
+        antiga = Partida("antiga", Persistencia(caminho, sincronizar=False))
+        antiga.carregar()
+        for nome in ("Ana", "Bia"):
+            acoes.adicionar_jogador(antiga, nome)
+        acoes.escolher_cor(antiga, "Ana", "Azul")
+        antiga.fechar()
+
+        partida = Partida("antiga", Persistencia(caminho, sincronizar=False), semente=3)
+        partida.carregar()
+        partida.abrir_diario(caminho + ".acoes")
+        acoes.escolher_cor(partida, "Bia", "Verde")
+        acoes.distribuir_territorios(partida)
+        final = estado(partida)
+        partida.fechar()
+        self.assertEqual(estado(reproduzir(ler_diario(caminho + ".acoes"))), final)
+
+    def test_eliminacao_continua_no_segmento_seguinte(self):
+        caminho = os.path.join(self.diretorio.name, "duelo.json")
+        antiga = Partida("duelo", Persistencia(caminho, sincronizar=False))
+        antiga.carregar()
+        antiga.registrar_lote([
+            {"op": "novo", "jogador": {"nome": "Ana", "objetivo": "Eliminar um oponente", "territorios": ["Peru"], "exercitos": 100}},
+            {"op": "novo", "jogador": {"nome": "Bia", "territorios": ["Brasil"], "exercitos": 1}},
+        ])
+        antiga.fechar()
+        for semente in (5, 6):
+            partida = Partida("duelo", Persistencia(caminho, sincronizar=False), semente=semente)
+            partida.carregar()
+            partida.abrir_diario(caminho + ".acoes")
+            while partida.tabuleiro.dono("Brasil") == "Bia":
+                acoes.atacar(partida, "Ana", "Peru", "Bia", "Brasil")
+            partida.fechar()
+        reproduzida = reproduzir(ler_diario(caminho + ".acoes"))
+        self.assertTrue(acoes.verificar_objetivo(reproduzida, "Ana")["concluido"])
+
+
+if __name__ == '__main__':
+    unittest.main()
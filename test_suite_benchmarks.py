@@ -0,0 +1,26 @@
+import unittest
+from benchmarks.suite import comparar, fronteira, partida_em_memoria
+
+
+class TestSuiteBenchmarks(unittest.TestCase):
+    def test_comparar(self):
+        base = {"metricas": {"micro/atacar_us": 10.0, "api/bot_1_partidas/req_por_s": 1000.0, "so_na_base_us": 1.0}}
+        atual = {"metricas": {"micro/atacar_us": 13.0, "api/bot_1_partidas/req_por_s": 900.0, "nova_us": 5.0}}
+        linhas = {linha["metrica"]: linha for linha in comparar(atual, base, limite=0.25)}
+        self.assertEqual(set(linhas), {"micro/atacar_us", "api/bot_1_partidas/req_por_s"})
+        # Tempo: 30% mais lento passa do limite
+        self.assertAlmostEqual(linhas["micro/atacar_us"]["piora"], 0.3)
+        self.assertTrue(linhas["micro/atacar_us"]["regrediu"])
+        # Vazão: menos requisições por segundo é pior, mas ~11% fica dentro do limite
+        self.assertAlmostEqual(linhas["api/bot_1_partidas/req_por_s"]["piora"], 1000 / 900 - 1)
+        self.assertFalse(linhas["api/bot_1_partidas/req_por_s"]["regrediu"])
+
+    def test_fronteira(self):
+        partida = partida_em_memoria(3)
+        ataque = fronteira(partida)
+        self.assertNotEqual(ataque["jogador_atacante"], ataque["jogador_defensor"])
+        self.assertTrue(partida.tabuleiro.fazem_fronteira(ataque["territorio_atacante"], ataque["territorio_defensor"]))
+
+
+if __name__ == '__main__':
+    unittest.main()
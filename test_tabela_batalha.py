@@ -0,0 +1,60 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from batalha import simular_batalhas
+from tabela_batalha import TabelaBatalha
+
+
+class TestTabelaBatalha(unittest.TestCase):
+    def setUp(self):
+        self.tabela = TabelaBatalha(limite=30)
+
+    def test_um_dado_contra_um_dado(self):
+        self.assertAlmostEqual(self.tabela.resultado(2, 1)["probabilidade_vitoria"], 15 / 36)
+        self.assertEqual(self.tabela.resultado(1, 5)["probabilidade_vitoria"], 0.0)
+        self.assertEqual(self.tabela.resultado(5, 0)["probabilidade_vitoria"], 1.0)
+
+    def test_confere_com_monte_carlo(self):
+        exato = self.tabela.resultado(10, 8)
+        simulado = simular_batalhas(10, 8, simulacoes=200_000, rng=np.random.default_rng(5))
+        self.assertAlmostEqual(exato["probabilidade_vitoria"], simulado["probabilidade_vitoria"], delta=0.01)
+        self.assertAlmostEqual(exato["perdas_esperadas_atacante"], simulado["perdas_atacante"]["media"], delta=0.05)
+
+    def test_distribuicao_confere_com_tabela(self):
+        distribuicao = self.tabela.distribuicao(12, 7)
+        resultado = self.tabela.resultado(12, 7)
+        self.assertAlmostEqual(distribuicao["probabilidade_vitoria"], resultado["probabilidade_vitoria"], places=6)
+        self.assertAlmostEqual(sum(distribuicao["perdas_atacante"]), 1.0, places=5)
+
+    def test_crescimento_preguicoso_e_disco(self):
+        self.tabela.resultado(5, 5)
+        esperado = TabelaBatalha(limite=30).resultado(20, 3)
+        self.assertAlmostEqual(self.tabela.resultado(20, 3)["probabilidade_vitoria"], esperado["probabilidade_vitoria"])
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, "tabela.npz")
+            self.tabela.salvar(caminho)
+            carregada = TabelaBatalha.carregar(caminho)
+        self.assertEqual(carregada.resultado(20, 3), self.tabela.resultado(20, 3))
+        with self.assertRaises(ValueError):
+            carregada.resultado(31, 1)
+
+    def test_carregar_com_outra_configuracao(self):
+        self.tabela.resultado(20, 5)
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, "tabela.npz")
+            self.tabela.salvar(caminho)
+            maior = TabelaBatalha.carregar(caminho, limite=50)
+            menor = TabelaBatalha.carregar(caminho, limite=10)
+            outra_parada = TabelaBatalha.carregar(caminho, limite=30, parada=2)
+        self.assertEqual(maior.limite, 50)
+        self.assertEqual(maior.resultado(20, 5), self.tabela.resultado(20, 5))
+        self.assertEqual(maior.resultado(45, 40), TabelaBatalha(limite=50).resultado(45, 40))
+        self.assertEqual(menor.resultado(10, 5), self.tabela.resultado(10, 5))
+        with self.assertRaises(ValueError):
+            menor.resultado(20, 5)
+        self.assertEqual(outra_parada.resultado(20, 5), TabelaBatalha(limite=30, parada=2).resultado(20, 5))
+
+
+if __name__ == '__main__':
+    unittest.main()
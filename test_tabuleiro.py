@@ -0,0 +1,90 @@
+import random
+import unittest
+from mapa import MAPA_WAR
+from tabuleiro import Tabuleiro
+
+
+class TestTabuleiro(unittest.TestCase):
+    def setUp(self):
+        self.territorios_edson = {"Brasil", "Argentina"}
+        self.territorios_marcelo = {"México"}
+        self.tabuleiro = Tabuleiro()
+        self.tabuleiro.registrar_jogador("Edson", self.territorios_edson)
+        self.tabuleiro.registrar_jogador("Marcelo", self.territorios_marcelo)
+
+    def test_dono(self):
+        self.assertEqual(self.tabuleiro.dono("Brasil"), "Edson")
+        self.assertTrue(self.tabuleiro.pertence("México", "Marcelo"))
+        self.assertIsNone(self.tabuleiro.dono("Japão"))
+
+    def test_conquista_sincroniza_conjuntos(self):
+        anterior = self.tabuleiro.atribuir("Brasil", "Marcelo")
+        self.assertEqual(anterior, "Edson")
+        self.assertEqual(self.territorios_edson, {"Argentina"})
+        self.assertEqual(self.territorios_marcelo, {"México", "Brasil"})
+        self.assertEqual(self.tabuleiro.dono("Brasil"), "Marcelo")
+
+    def test_remover_jogador(self):
+        self.tabuleiro.remover_jogador("Edson")
+        self.assertIsNone(self.tabuleiro.dono("Argentina"))
+        self.assertEqual(self.tabuleiro.territorios_de("Edson"), set())
+
+
+class TestTabuleiroComMapa(unittest.TestCase):
+    def setUp(self):
+        self.tabuleiro = Tabuleiro(MAPA_WAR)
+        self.tabuleiro.registrar_jogador("Edson", {"Brasil", "Argentina", "Peru", "México"})
+        self.tabuleiro.registrar_jogador("Marcelo", {"Venezuela", "Argélia"})
+
+    def test_fronteiras(self):
+        self.assertTrue(self.tabuleiro.fazem_fronteira("Brasil", "Argélia"))
+        self.assertFalse(self.tabuleiro.fazem_fronteira("Brasil", "México"))
+        self.assertFalse(self.tabuleiro.fazem_fronteira("Brasil", "Território1"))
+
+    def test_alcance_pelos_proprios_territorios(self):
+        self.assertTrue(self.tabuleiro.alcanca("Edson", "Argentina", "Peru"))
+        # México só chega à América do Sul pela Venezuela, que é do Marcelo
+        self.assertFalse(self.tabuleiro.alcanca("Edson", "Brasil", "México"))
+        self.tabuleiro.atribuir("Venezuela", "Edson")
+        self.assertTrue(self.tabuleiro.alcanca("Edson", "Argentina", "México"))
+        self.assertFalse(self.tabuleiro.alcanca("Marcelo", "Argélia", "Venezuela"))
+
+    def test_perda_parte_o_componente(self):
+        self.tabuleiro.atribuir("Venezuela", "Edson")
+        self.tabuleiro.atribuir("Peru", "Marcelo")
+        self.tabuleiro.atribuir("Brasil", "Marcelo")
+        self.assertFalse(self.tabuleiro.alcanca("Edson", "Argentina", "Venezuela"))
+        self.assertTrue(self.tabuleiro.alcanca("Edson", "Venezuela", "México"))
+        self.tabuleiro.remover_jogador("Edson")
+        self.assertFalse(self.tabuleiro.alcanca("Edson", "Venezuela", "México"))
+
+    # Componentes mantidos a cada troca de dono conferidos com uma busca em largura
+    def test_confere_com_busca(self):
+        rng = random.Random(5)
+        jogadores = ["A", "B", "C"]
+        for nome in jogadores:
+            self.tabuleiro.registrar_jogador(nome, set())
+        for _ in range(2000):
+            self.tabuleiro.atribuir(rng.choice(MAPA_WAR.territorios), rng.choice(jogadores))
+            origem, destino = rng.sample(MAPA_WAR.territorios, 2)
+            dono = self.tabuleiro.dono(origem)
+            if dono is None:
+                continue
+            self.assertEqual(self.tabuleiro.alcanca(dono, origem, destino), self.buscar(dono, origem, destino))
+
+    def buscar(self, dono: str, origem: str, destino: str) -> bool:
+        if self.tabuleiro.dono(destino) != dono:
+            return False
+        vistos, fila = {origem}, [origem]
+        while fila:
+            atual = fila.pop()
+            for v in MAPA_WAR.vizinhos[MAPA_WAR.id(atual)]:
+                nome = MAPA_WAR.territorios[v]
+                if nome not in vistos and self.tabuleiro.dono(nome) == dono:
+                    vistos.add(nome)
+                    fila.append(nome)
+        return destino in vistos
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+from mapa import MAPA_WAR, Mapa
+from tabuleiro_compacto import SEM_DONO, TabuleiroCompacto
+
+
+class TestMapa(unittest.TestCase):
+    def test_mapa_war(self):
+        self.assertEqual(len(MAPA_WAR), 42)
+        self.assertEqual(len(MAPA_WAR.continentes), 6)
+        self.assertTrue(all(c is not None for c in MAPA_WAR.continente_de))
+
+    def test_csr_simetrico(self):
+        for t in range(len(MAPA_WAR)):
+            adjacentes = tuple(MAPA_WAR.adjacentes[MAPA_WAR.inicio[t]:MAPA_WAR.inicio[t + 1]])
+            self.assertEqual(adjacentes, MAPA_WAR.vizinhos[t])
+            for v in adjacentes:
+                self.assertTrue(MAPA_WAR.fazem_fronteira(v, t))
+        self.assertTrue(MAPA_WAR.fazem_fronteira(MAPA_WAR.id("Brasil"), MAPA_WAR.id("Argélia")))
+        self.assertFalse(MAPA_WAR.fazem_fronteira(MAPA_WAR.id("Brasil"), MAPA_WAR.id("Japão")))
+
+
+class TestTabuleiroCompacto(unittest.TestCase):
+    def setUp(self):
+        self.jogadores = [
+            {"nome": "Edson", "cor_exercito": "Azul", "objetivo": None, "territorios": ["Peru", "Brasil"], "exercitos": 10, "cartas": ["Carta 1"]},
+            {"nome": "Marcelo", "cor_exercito": None, "objetivo": "Eliminar um jogador", "territorios": ["Argélia"], "exercitos": 1, "cartas": []},
+        ]
+        self.tabuleiro = TabuleiroCompacto.de_jogadores(MAPA_WAR, self.jogadores)
+
+    def test_adaptadores_ida_e_volta(self):
+        self.assertEqual(self.tabuleiro.para_jogadores(), self.jogadores)
+        self.assertEqual(self.tabuleiro.reserva[0], 8)
+
+    def test_ataques_pelas_fronteiras(self):
+        self.assertEqual(self.tabuleiro.ataques(0), [])
+        self.tabuleiro.exercitos[MAPA_WAR.id("Brasil")] = 3
+        self.assertEqual(self.tabuleiro.ataques(0), [(MAPA_WAR.id("Brasil"), MAPA_WAR.id("Argélia"))])
+
+    def test_copia_independente(self):
+        copia = self.tabuleiro.copia()
+        brasil = MAPA_WAR.id("Brasil")
+        copia.atribuir(brasil, 1, 3)
+        copia.jogadores[0].cartas.append("Carta 2")
+        self.assertEqual(self.tabuleiro.dono[brasil], 0)
+        self.assertEqual(self.tabuleiro.quantidade[0], 2)
+        self.assertEqual(self.tabuleiro.jogadores[0].cartas, ["Carta 1"])
+        self.assertEqual(copia.quantidade[1], 2)
+
+    def test_snapshot_restaurar(self):
+        snapshot = self.tabuleiro.snapshot()
+        self.tabuleiro.atribuir(MAPA_WAR.id("Japão"), 1, 5)
+        self.tabuleiro.reserva[0] = 0
+        self.tabuleiro.restaurar(snapshot)
+        self.assertEqual(self.tabuleiro.dono[MAPA_WAR.id("Japão")], SEM_DONO)
+        self.assertEqual(self.tabuleiro.reserva[0], 8)
+        self.assertEqual(self.tabuleiro.quantidade[1], 1)
+
+    def test_territorio_desconhecido(self):
+        with self.assertRaises(ValueError):
+            TabuleiroCompacto.de_jogadores(Mapa.completo(["A", "B"]), self.jogadores)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import os
+import random
+import sys
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+import acoes
+from partida import MAPA, Partida
+from persistencia import Persistencia
+
+JOGADORES = ["Ana", "Bia", "Caio", "Davi", "Edson", "Flor"]
+
+
+class TestConcorrencia(unittest.TestCase):
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.caminho = os.path.join(self.diretorio.name, "dados.json")
+        self.partida = Partida("teste", Persistencia(self.caminho, sincronizar=False))
+        self.partida.carregar()
+        for nome in JOGADORES:
+            acoes.adicionar_jogador(self.partida, nome)
+            acoes.distribuir_exercitos(self.partida, nome, 300)
+        acoes.distribuir_territorios(self.partida)
+        self.intervalo = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)  # mais trocas de thread, mais chance de corrida
+
+    def tearDown(self):
+        sys.setswitchinterval(self.intervalo)
+        self.partida.fechar()
+        self.diretorio.cleanup()
+
+    def test_ataques_concorrentes_conservam_exercitos(self):
+        total_inicial = sum(j.exercitos for j in self.partida.jogadores)
+        perdas = []
+        rodadas = []
+
+        def jogada(semente: int):
+            rng = random.Random(semente)
+            if semente % 500 == 0:
+                rodadas.append(acoes.iniciar_rodada(self.partida))
+                return
+            # Um território qualquer e um vizinho dele; o dono de cada um é lido sem trava
+            origem = rng.choice(MAPA.territorios)
+            destino = MAPA.territorios[rng.choice(MAPA.vizinhos[MAPA.id(origem)])]
+            atacante, defensor = self.partida.tabuleiro.dono(origem), self.partida.tabuleiro.dono(destino)
+            if atacante == defensor:
+                return
+            try:
+                resultado = acoes.atacar(self.partida, atacante, origem, defensor, destino)
+            except acoes.AcaoInvalida:
+                return  # território mudou de dono entre a escolha e o ataque
+            batalha = resultado["resultado_batalha"]
+            perdas.append(batalha["atacante"]["perdas"] + batalha["defensor"]["perdas"])
+
+        with ThreadPoolExecutor(max_workers=32) as executor:
+            list(executor.map(jogada, range(1, 4001)))
+
+        total = sum(j.exercitos for j in self.partida.jogadores)
+        self.assertGreater(len(perdas), 500)
+        self.assertEqual(total + sum(perdas), total_inicial + 5 * len(JOGADORES) * len(rodadas))
+        # Cada território com um único dono, igual no tabuleiro e no jogador
+        for jogador in self.partida.jogadores:
+            for territorio in jogador.territorios:
+                self.assertEqual(self.partida.tabuleiro.dono(territorio), jogador.nome)
+        # O log gravado chega ao mesmo estado
+        self.partida.persistencia.fechar()
+        recarregada = Partida("teste", Persistencia(self.caminho, sincronizar=False))
+        recarregada.carregar()
+        self.assertEqual({j.nome: j.exercitos for j in recarregada.jogadores}, {j.nome: j.exercitos for j in self.partida.jogadores})
+        recarregada.fechar()
+
+    def test_cor_disputada_vai_para_um_so(self):
+        barreira = threading.Barrier(len(JOGADORES))
+
+        def escolher(nome: str):
+            barreira.wait()
+            try:
+                acoes.escolher_cor(self.partida, nome, "Azul")
+                return nome
+            except acoes.AcaoInvalida:
+                return None
+
+        with ThreadPoolExecutor(max_workers=len(JOGADORES)) as executor:
+            vencedores = [nome for nome in executor.map(escolher, JOGADORES) if nome]
+        self.assertEqual(len(vencedores), 1)
+        self.assertEqual([j.nome for j in self.partida.jogadores if j.cor_exercito == "Azul"], vencedores)
+        self.assertNotIn("Azul", self.partida.cores_disponiveis)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import os
+import tempfile
+import unittest
+from fastapi.testclient import TestClient
+import acoes
+import main
+from partida import JOGO_PADRAO, Partida, Partidas
+from persistencia import Persistencia
+from visoes import PARTIDA, chave_jogador
+
+
+class TestVisoes(unittest.TestCase):
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.partida = Partida("teste", Persistencia(os.path.join(self.diretorio.name, "dados.json"), sincronizar=False))
+        self.partida.carregar()
+        for nome in ("Edson", "Marcelo"):
+            acoes.adicionar_jogador(self.partida, nome)
+
+    def tearDown(self):
+        self.partida.fechar()
+        self.diretorio.cleanup()
+
+    def test_mutacao_invalida_so_o_jogador_afetado(self):
+        visoes = self.partida.visoes
+        edson, marcelo = visoes.etag(chave_jogador("Edson")), visoes.etag(chave_jogador("Marcelo"))
+        partida = visoes.etag(PARTIDA)
+        acoes.escolher_cor(self.partida, "Edson", "Azul")
+        self.assertNotEqual(visoes.etag(chave_jogador("Edson")), edson)
+        self.assertEqual(visoes.etag(chave_jogador("Marcelo")), marcelo)
+        self.assertNotEqual(visoes.etag(PARTIDA), partida)
+
+    def test_cache_remonta_so_depois_da_mutacao(self):
+        visoes = self.partida.visoes
+        montagens = []
+        montar = lambda: montagens.append(1) or b"{}"
+        visoes.obter(chave_jogador("Edson"), montar)
+        visoes.obter(chave_jogador("Edson"), montar)
+        acoes.receber_cartas(self.partida, "Edson")
+        visoes.obter(chave_jogador("Edson"), montar)
+        self.assertEqual(len(montagens), 2)
+        self.assertEqual((visoes.acertos, visoes.falhas), (1, 2))
+
+
+class TestRotasComETag(unittest.TestCase):
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.original = main.partidas
+        main.partidas = Partidas(self.diretorio.name, os.path.join(self.diretorio.name, "dados.json"))
+        self.cliente = TestClient(main.app)
+        self.cliente.post("/jogadores/adicionar/", params={"nome": "Edson"})
+
+    def tearDown(self):
+        main.partidas.fechar()
+        main.partidas = self.original
+        self.diretorio.cleanup()
+
+    def test_304_enquanto_nada_muda(self):
+        resposta = self.cliente.get("/jogadores/ver/", params={"nome": "Edson"})
+        etag = resposta.headers["etag"]
+        repetida = self.cliente.get("/jogadores/ver/", params={"nome": "Edson"}, headers={"If-None-Match": etag})
+        self.assertEqual(repetida.status_code, 304)
+        self.cliente.post("/rodada/receber-cartas/", params={"jogador": "Edson"})
+        depois = self.cliente.get("/jogadores/ver/", params={"nome": "Edson"}, headers={"If-None-Match": etag})
+        self.assertEqual(depois.status_code, 200)
+        self.assertEqual(len(depois.json()["cartas"]), 1)
+        self.assertEqual(self.cliente.get("/gerar-json/").json()["jogadores"][0]["nome"], "Edson")
+
+
+    def test_leituras_nao_ligam_o_gravador(self):
+        main.partidas.fechar()
+        main.partidas = Partidas(self.diretorio.name, os.path.join(self.diretorio.name, "dados.json"), durabilidade="imediata")
+        resposta = self.cliente.get("/jogadores/ver/", params={"nome": "Edson"})
+        self.assertEqual(resposta.status_code, 200)
+        repetida = self.cliente.get("/jogadores/ver/", params={"nome": "Edson"}, headers={"If-None-Match": resposta.headers["etag"]})
+        self.assertEqual(repetida.status_code, 304)
+        self.assertEqual(self.cliente.get("/gerar-json/").status_code, 200)
+        self.assertEqual(self.cliente.get("/objetivo/verificar/", params={"jogador": "Edson"}).status_code, 200)
+        self.assertFalse(main.partidas.obter(JOGO_PADRAO).gravador.ativo)
+
+if __name__ == '__main__':
+    unittest.main()
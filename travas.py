@@ -0,0 +1,90 @@
+# travas.py
+# Travas de uma partida para as rotas síncronas (que rodam no threadpool do FastAPI).
+# Ações de um ou dois jogadores (ataque, cor, cartas, exércitos) seguram a trava de cada
+# jogador envolvido, sempre em ordem de nome, e rodam em paralelo com as de outros
+# jogadores. Ações que mexem na partida inteira (ordem, distribuição, lote, entrada e
+# saída de jogadores) seguram a trava exclusiva, que espera as ações em andamento e
+# bloqueia as novas. Dentro da exclusiva, ou de outra trava de jogador da mesma thread,
+# as travas de jogador não fazem nada.
+import threading
+from contextlib import contextmanager, nullcontext
+
+
+class TravasDaPartida:
+    def __init__(self):
+        self._condicao = threading.Condition()
+        self._compartilhadas = 0      # ações de jogador em andamento
+        self._exclusiva = None        # thread que segura a exclusiva
+        self._esperando_exclusiva = 0
+        self._por_jogador = {}
+        self._dentro = threading.local()
+
+    # Trava compartilhada + a trava de cada jogador, em ordem (sem deadlock entre A->B e B->A)
+    @contextmanager
+    def jogadores(self, *nomes: str):
+        if self._exclusiva == threading.get_ident() or getattr(self._dentro, "ativo", False):
+            yield
+            return
+        travas = [self._trava_de(nome) for nome in sorted(set(nomes))]
+        self._entrar_compartilhada()
+        self._dentro.ativo = True
+        try:
+            for trava in travas:
+                trava.acquire()
+            try:
+                yield
+            finally:
+                for trava in reversed(travas):
+                    trava.release()
+        finally:
+            self._dentro.ativo = False
+            self._sair_compartilhada()
+
+    @contextmanager
+    def exclusiva(self):
+        if self._exclusiva == threading.get_ident():
+            yield
+            return
+        with self._condicao:
+            self._esperando_exclusiva += 1
+            # Quem espera a exclusiva tem prioridade sobre novas ações de jogador
+            while self._exclusiva is not None or self._compartilhadas:
+                self._condicao.wait()
+            self._esperando_exclusiva -= 1
+            self._exclusiva = threading.get_ident()
+        try:
+            yield
+        finally:
+            with self._condicao:
+                self._exclusiva = None
+                self._condicao.notify_all()
+
+    def _trava_de(self, nome: str) -> threading.Lock:
+        trava = self._por_jogador.get(nome)
+        if trava is None:
+            with self._condicao:
+                trava = self._por_jogador.setdefault(nome, threading.Lock())
+        return trava
+
+    def _entrar_compartilhada(self):
+        with self._condicao:
+            while self._exclusiva is not None or self._esperando_exclusiva:
+                self._condicao.wait()
+            self._compartilhadas += 1
+
+    def _sair_compartilhada(self):
+        with self._condicao:
+            self._compartilhadas -= 1
+            if not self._compartilhadas:
+                self._condicao.notify_all()
+
+
+# Mesma interface, sem travar: para quem usa a partida numa thread só (reproducao.py)
+class SemTravas:
+    _nada = nullcontext()
+
+    def jogadores(self, *nomes: str):
+        return self._nada
+
+    def exclusiva(self):
+        return self._nada
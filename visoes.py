@@ -0,0 +1,76 @@
+# visoes.py
+# Cache das visões de leitura da partida (um jogador, a partida inteira) já serializadas.
+# Toda mutação passa por Partida.registrar_lote, que chama invalidar(): sobe a versão da
+# partida e a dos jogadores citados nos registros, então só as visões afetadas deixam de valer.
+# A versão (com a época, que muda a cada carga da partida) é também o ETag das respostas.
+import threading
+import uuid
+
+PARTIDA = ("partida",)
+
+
+def chave_jogador(nome: str) -> tuple:
+    return ("jogador", nome)
+
+
+class Visoes:
+    def __init__(self):
+        self.epoca = uuid.uuid4().hex[:8]
+        self.versao = 0
+        self.ativo = True
+        self.acertos = 0
+        self.falhas = 0
+        self.nao_modificados = 0
+        self._versao_de = {}   # nome -> versão da última mutação do jogador
+        self._cache = {}       # chave -> (versão, corpo)
+        self._trava = threading.Lock()   # ações de jogadores diferentes invalidam em paralelo
+
+    def invalidar(self, registros: list):
+        with self._trava:
+            self.versao += 1
+            for registro in registros:
+                nome = registro["jogador"]["nome"] if registro["op"] == "novo" else registro.get("nome")
+                if nome is not None:
+                    self._versao_de[nome] = self.versao
+                    if registro["op"] == "rem":
+                        self._cache.pop(chave_jogador(nome), None)
+
+    def versao_de(self, chave: tuple) -> int:
+        return self.versao if chave == PARTIDA else self._versao_de.get(chave[1], 0)
+
+    def etag(self, chave: tuple) -> str:
+        return f'"{self.epoca}-{self.versao_de(chave)}"'
+
+    # If-None-Match com o ETag atual (ou *): a resposta pode ser 304
+    def nao_modificada(self, chave: tuple, if_none_match: str) -> bool:
+        if not if_none_match:
+            return False
+        etag = self.etag(chave)
+        etiquetas = {e.strip().removeprefix("W/") for e in if_none_match.split(",")}
+        if etag in etiquetas or "*" in etiquetas:
+            self.nao_modificados += 1
+            return True
+        return False
+
+    # Corpo da visão na versão atual; montar() só é chamado quando a entrada mudou
+    def obter(self, chave: tuple, montar) -> bytes:
+        versao = self.versao_de(chave)
+        entrada = self._cache.get(chave)
+        if self.ativo and entrada is not None and entrada[0] == versao:
+            self.acertos += 1
+            return entrada[1]
+        self.falhas += 1
+        corpo = montar()
+        if self.ativo:
+            self._cache[chave] = (versao, corpo)
+        return corpo
+
+    def estatisticas(self) -> dict:
+        leituras = self.acertos + self.falhas + self.nao_modificados
+        return {
+            "acertos": self.acertos,
+            "falhas": self.falhas,
+            "nao_modificados": self.nao_modificados,
+            "taxa_de_acerto": (self.acertos + self.nao_modificados) / leituras if leituras else 0.0,
+            "entradas": len(self._cache),
+        }